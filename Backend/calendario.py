@@ -0,0 +1,111 @@
+import calendar
+from datetime import date
+from functools import lru_cache
+
+# =================================================================
+# Archivo: calendario.py
+# Propósito: Índice de fechas límite (fecha_aprobacion, n) sin encadenar
+#            `sumar_un_mes` mes a mes
+# =================================================================
+
+# Encadenar `sumar_un_mes` recorta el día al último día de cada mes corto y ya no
+# lo recupera (31/01 -> 29/02 -> 29/03). Por eso el día del mes n es el mínimo
+# entre el día original y la longitud de los meses 1..n. En 24 meses seguidos
+# siempre hay un febrero de 28 días, así que basta mirar los primeros 24.
+#
+# La versión escalar no usa NumPy, así que main.py la puede importar sin pagar
+# su carga; solo el índice vectorizado lo importa al usarse.
+HORIZONTE_RECORTE = 24
+
+
+@lru_cache(maxsize=65536)
+def fecha_limite(fecha_aprobacion: date, n: int) -> date:
+    """Equivale a aplicar `sumar_un_mes` `n` veces a `fecha_aprobacion`, con caché.
+
+    El día del mes n sale del día del mes n - 1 (ya en la caché si se recorre el
+    plazo en orden), y desde el mes 24 es el mismo, así que un fallo de la caché
+    cuesta a lo sumo una consulta al calendario.
+    """
+    if n < 0:
+        raise ValueError("n no puede ser negativo.")
+    if n == 0:
+        return fecha_aprobacion
+
+    año, mes = divmod(fecha_aprobacion.year * 12 + fecha_aprobacion.month - 1 + n, 12)
+    if n > HORIZONTE_RECORTE:
+        dia = fecha_limite(fecha_aprobacion, HORIZONTE_RECORTE).day
+    else:
+        dia = min(fecha_limite(fecha_aprobacion, n - 1).day, calendar.monthrange(año, mes + 1)[1])
+    return date(año, mes + 1, dia)
+
+
+class CalendarioVencimientos:
+    """
+    Índice vectorizado de fechas límite.
+
+    Guarda, para cada mes, la longitud mínima de los siguientes 1..24 meses, de
+    modo que `fechas_limite(fechas, n)` se resuelve con búsquedas en la tabla en
+    lugar de llamar a `sumar_un_mes` por crédito y por mes. La tabla crece sola
+    cuando llegan fechas fuera del rango ya calculado.
+    """
+
+    def __init__(self):
+        import numpy as np
+
+        self._primer_mes = 0
+        self._minimos = np.empty((0, HORIZONTE_RECORTE + 1), dtype=np.int64)
+
+    def _asegurar_rango(self, desde: int, hasta: int) -> None:
+        """Garantiza que la tabla cubra los meses [desde, hasta] (meses desde 1970-01)."""
+        import numpy as np
+
+        actual_hasta = self._primer_mes + self._minimos.shape[0] - 1
+        if self._minimos.shape[0] and self._primer_mes <= desde and hasta <= actual_hasta:
+            return
+        if self._minimos.shape[0]:
+            desde, hasta = min(desde, self._primer_mes), max(hasta, actual_hasta)
+
+        meses = np.arange(desde, hasta + HORIZONTE_RECORTE + 2)
+        inicio = meses.astype('datetime64[M]').astype('datetime64[D]')
+        dias_mes = ((meses + 1).astype('datetime64[M]').astype('datetime64[D]') - inicio).astype(np.int64)
+
+        filas = hasta - desde + 1
+        minimos = np.empty((filas, HORIZONTE_RECORTE + 1), dtype=np.int64)
+        minimos[:, 0] = 31
+        for k in range(1, HORIZONTE_RECORTE + 1):
+            minimos[:, k] = np.minimum(minimos[:, k - 1], dias_mes[k:k + filas])
+
+        self._primer_mes, self._minimos = desde, minimos
+
+    def fechas_limite(self, fechas_aprobacion, n):
+        """Versión vectorizada de `fecha_limite`; devuelve un arreglo `datetime64[D]`."""
+        import numpy as np
+
+        fechas = np.asarray(fechas_aprobacion, dtype='datetime64[D]')
+        n = np.asarray(n, dtype=np.int64)
+        if np.any(n < 0):
+            raise ValueError("n no puede ser negativo.")
+        fechas, n = np.broadcast_arrays(fechas, n)
+        if fechas.size == 0:
+            return fechas.copy()
+
+        mes_inicial = fechas.astype('datetime64[M]')
+        indice = mes_inicial.astype(np.int64)
+        dia = (fechas - mes_inicial.astype('datetime64[D]')).astype(np.int64) + 1
+
+        self._asegurar_rango(int(indice.min()), int(indice.max()))
+        minimo = self._minimos[indice - self._primer_mes, np.minimum(n, HORIZONTE_RECORTE)]
+        dia = np.minimum(dia, minimo)
+
+        return (indice + n).astype('datetime64[M]').astype('datetime64[D]') + (dia - 1)
+
+
+_CALENDARIO = None
+
+
+def fechas_limite_lote(fechas_aprobacion, n):
+    """Fechas límite del mes `n` para cada fecha de aprobación, usando el índice compartido."""
+    global _CALENDARIO
+    if _CALENDARIO is None:
+        _CALENDARIO = CalendarioVencimientos()
+    return _CALENDARIO.fechas_limite(fechas_aprobacion, n)
@@ -0,0 +1,148 @@
+import numpy as np
+
+from cuota_lote import calcular_cuota_fija_lote
+
+# =================================================================
+# Archivo: cuota_inversa.py
+# Propósito: Inversas de `calcular_cuota_fija`: capital máximo, plazo y tasa implícita
+# =================================================================
+
+# Todas las funciones aceptan escalares o arreglos (con broadcasting) y devuelven
+# lo mismo que reciben: un float para entradas escalares, un arreglo si no. La
+# tasa es mensual y en porcentaje, como en `calcular_cuota_fija`.
+
+MAX_ITERACIONES = 100
+TOLERANCIA = 1e-13
+HOLGURA_CUOTA = 1e-12
+
+
+def _devolver(resultado: np.ndarray, *entradas):
+    return float(resultado) if all(np.ndim(e) == 0 for e in entradas) else resultado
+
+
+def _uno_menos_descuento(r: np.ndarray, meses: np.ndarray) -> np.ndarray:
+    """1 - (1 + r)^-meses, sin cancelación cuando r es pequeña."""
+    return -np.expm1(-meses * np.log1p(r))
+
+
+# ==================== CAPITAL MÁXIMO (FORMA CERRADA) ====================
+
+def capital_maximo(cuota, tasa, meses):
+    """Mayor capital cuya cuota fija a `tasa` y `meses` es `cuota`.
+
+    Es la inversa exacta de la fórmula: capital = cuota * (1 - (1 + r)^-n) / r,
+    o cuota * n con tasa 0. Con meses <= 0 no hay capital que corresponda (NaN).
+    """
+    cuota_arr = np.asarray(cuota, dtype=np.float64)
+    r = np.asarray(tasa, dtype=np.float64) / 100
+    n = np.asarray(meses, dtype=np.float64)
+    cuota_arr, r, n = np.broadcast_arrays(cuota_arr, r, n)
+
+    with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+        capital = cuota_arr * _uno_menos_descuento(r, n) / r
+        capital = np.where(r == 0, cuota_arr * n, capital)
+        capital = np.where(cuota_arr <= 0, 0.0, capital)
+        capital = np.where((n <= 0) | (r <= -1), np.nan, capital)
+    return _devolver(capital, cuota, tasa, meses)
+
+
+# ==================== PLAZO NECESARIO (FORMA CERRADA + AJUSTE) ====================
+
+def plazo_necesario(capital, tasa, cuota):
+    """Menor número de meses cuya cuota fija no supera `cuota`.
+
+    Usa n = -ln(1 - r * capital / cuota) / ln(1 + r) y redondea hacia arriba;
+    luego corrige un mes arriba o abajo comparando con la cuota vectorizada,
+    para que el resultado coincida con `calcular_cuota_fija`. Si la cuota no
+    alcanza ni para los intereses, no hay plazo posible (inf).
+    """
+    capital_arr = np.asarray(capital, dtype=np.float64)
+    tasa_arr = np.asarray(tasa, dtype=np.float64)
+    cuota_arr = np.asarray(cuota, dtype=np.float64)
+    capital_arr, tasa_arr, cuota_arr = np.broadcast_arrays(capital_arr, tasa_arr, cuota_arr)
+    r = tasa_arr / 100
+
+    with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+        proporcion = r * capital_arr / cuota_arr
+        continuo = -np.log1p(-proporcion) / np.log1p(r)
+        continuo = np.where(r == 0, capital_arr / cuota_arr, continuo)
+        posible = (cuota_arr > 0) & (proporcion < 1) & (r > -1) & np.isfinite(continuo)
+
+        # La versión vectorizada difiere de la escalar en unos ulps (la potencia de
+        # numpy no redondea igual): con esta holgura una cuota exacta devuelve su plazo
+        limite = cuota_arr * (1 + HOLGURA_CUOTA)
+        meses = np.where(posible, np.maximum(np.ceil(continuo - 1e-9), 1), 1).astype(np.int64)
+        meses = np.where(posible & (calcular_cuota_fija_lote(capital_arr, tasa_arr, meses) > limite),
+                         meses + 1, meses)
+        anterior = np.maximum(meses - 1, 1)
+        meses = np.where(posible & (meses > 1) & (calcular_cuota_fija_lote(capital_arr, tasa_arr, anterior) <= limite),
+                         anterior, meses)
+
+        resultado = np.where(posible, meses.astype(np.float64), np.inf)
+        resultado = np.where(capital_arr <= 0, 1.0, resultado)
+    return _devolver(resultado, capital, tasa, cuota)
+
+
+# ==================== TASA IMPLÍCITA (NEWTON CON RESGUARDO) ====================
+
+def _cuota_y_derivada(capital, r, meses):
+    """Cuota fija para la tasa decimal `r` y su derivada respecto de `r`."""
+    pequena = np.abs(r) < 1e-8
+    r_segura = np.where(pequena, 1e-8, r)
+    uno_menos = _uno_menos_descuento(r_segura, meses)
+    descuento = 1 - uno_menos
+    cuota = capital * r_segura / uno_menos
+    derivada = capital * (uno_menos - r_segura * meses * descuento / (1 + r_segura)) / uno_menos ** 2
+
+    # Cerca de r = 0: desarrollo de Taylor de primer orden
+    cuota = np.where(pequena, capital / meses * (1 + r * (meses + 1) / 2), cuota)
+    derivada = np.where(pequena, capital * (meses + 1) / (2 * meses), derivada)
+    return cuota, derivada
+
+
+def tasa_implicita(capital, cuota, meses):
+    """Tasa mensual (%) con la que `calcular_cuota_fija(capital, tasa, meses)` da `cuota`.
+
+    La cuota crece de forma monótona con la tasa, así que la raíz está
+    acotada: entre -100 % y cuota / capital. Se itera con Newton y, si un paso
+    sale del intervalo, se usa bisección; el intervalo se achica en cada paso.
+    Sin solución (cuota o capital <= 0, meses <= 0) devuelve NaN.
+    """
+    capital_arr = np.asarray(capital, dtype=np.float64)
+    cuota_arr = np.asarray(cuota, dtype=np.float64)
+    meses_arr = np.asarray(meses, dtype=np.float64)
+    capital_arr, cuota_arr, meses_arr = np.broadcast_arrays(capital_arr, cuota_arr, meses_arr)
+    valida = (capital_arr > 0) & (cuota_arr > 0) & (meses_arr > 0)
+
+    # Con datos inválidos se resuelve un problema cualquiera y luego se descarta
+    capital_arr = np.where(valida, capital_arr, 1.0)
+    cuota_arr = np.where(valida, cuota_arr, 1.0)
+    meses_arr = np.where(valida, meses_arr, 1.0)
+
+    with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+        bajo = np.full(capital_arr.shape, -1 + 1e-12)
+        alto = cuota_arr / capital_arr
+        # Punto de partida: aproximación de la tasa a partir del recargo total
+        r = 2 * (cuota_arr * meses_arr / capital_arr - 1) / (meses_arr + 1)
+        r = np.clip(r, bajo, alto)
+
+        for _ in range(MAX_ITERACIONES):
+            valor, derivada = _cuota_y_derivada(capital_arr, r, meses_arr)
+            error = valor - cuota_arr
+            bajo = np.where(error < 0, r, bajo)
+            alto = np.where(error > 0, r, alto)
+
+            listo = (np.abs(error) <= TOLERANCIA * cuota_arr) | (alto - bajo <= 1e-15 * np.maximum(1, np.abs(r)))
+            if listo.all():
+                break
+
+            newton = r - error / derivada
+            fuera = ~np.isfinite(newton) | (newton <= bajo) | (newton >= alto)
+            r = np.where(listo, r, np.where(fuera, (bajo + alto) / 2, newton))
+
+    # Sin interés la cuota es capital / meses; se devuelve 0 exacto, porque con
+    # tasas de ~1e-16 la fórmula de `calcular_cuota_fija` pierde toda la precisión
+    sin_interes = np.abs(cuota_arr * meses_arr - capital_arr) <= TOLERANCIA * capital_arr
+    r = np.where(sin_interes, 0.0, r)
+    tasa = np.where(valida, r * 100, np.nan)
+    return _devolver(tasa, capital, cuota, meses)
@@ -0,0 +1,166 @@
+from datetime import date
+from typing import Any, Dict, Iterator, List, Optional
+
+from main import generar_tabla_amortizacion
+
+# =========================================
+#   ESCENARIOS "QUÉ PASA SI" INCREMENTALES
+# =========================================
+
+MAX_MESES = 1200
+
+
+class TablaIncremental:
+    """Tabla de amortización que guarda cada mes y recalcula solo desde el mes cambiado.
+
+    Cada fila ya calculada es un punto de control (saldo y fecha límite al cierre
+    del mes). Un cambio en el mes k (pago fijo, pago extra o nueva tasa) descarta
+    las filas k..n; al leer la tabla se retoma `generar_tabla_amortizacion`
+    desde el saldo del mes k-1 con el plazo restante, que reproduce exactamente
+    los mismos números que recalcular desde el mes 1.
+
+    Los meses sin cambios pagan la cuota esperada; `fijar_pago(mes, None)`
+    marca un incumplimiento.
+    """
+
+    def __init__(self, capital: float, tasa: float, plazo: int, fecha_aprobacion: date,
+                 max_meses: int = MAX_MESES):
+        self.capital = capital
+        self.plazo = plazo
+        self.fecha_aprobacion = fecha_aprobacion
+        self.max_meses = max_meses
+        self._tasas: Dict[int, float] = {1: tasa}
+        self._pagos: Dict[int, Optional[float]] = {}
+        self._extras: Dict[int, float] = {}
+        self._filas: List[Dict[str, Any]] = []
+        self._pagado: List[float] = []    # acumulados por mes, para el resumen
+        self._interes: List[float] = []
+        self._completa = False
+        self.meses_recalculados = 0
+
+    # ==================== CAMBIOS ====================
+
+    def _invalidar(self, mes: int) -> None:
+        corte = max(mes, 1) - 1
+        del self._filas[corte:], self._pagado[corte:], self._interes[corte:]
+        self._completa = False
+
+    def fijar_pago(self, mes: int, monto: Optional[float]) -> 'TablaIncremental':
+        """El pago del mes pasa a ser `monto` (None = incumplimiento)."""
+        self._pagos[mes] = monto
+        self._invalidar(mes)
+        return self
+
+    def agregar_pago_extra(self, mes: int, monto: float) -> 'TablaIncremental':
+        """Además de la cuota esperada, el mes `mes` se abonan `monto` pesos."""
+        self._extras[mes] = self._extras.get(mes, 0.0) + monto
+        self._invalidar(mes)
+        return self
+
+    def cambiar_tasa(self, desde_mes: int, tasa: float) -> 'TablaIncremental':
+        """Desde `desde_mes` en adelante se aplica `tasa` (% mensual)."""
+        self._tasas[max(desde_mes, 1)] = tasa
+        self._invalidar(desde_mes)
+        return self
+
+    def quitar_cambios(self, mes: int) -> 'TablaIncremental':
+        """Deshace pagos fijos, extras y cambio de tasa del mes `mes` (la tasa inicial se conserva)."""
+        self._pagos.pop(mes, None)
+        self._extras.pop(mes, None)
+        if mes > 1:
+            self._tasas.pop(mes, None)
+        self._invalidar(mes)
+        return self
+
+    def copia(self) -> 'TablaIncremental':
+        """Escenario nuevo que comparte los meses ya calculados (las filas no se modifican)."""
+        otra = TablaIncremental.__new__(TablaIncremental)
+        otra.__dict__.update(self.__dict__)
+        for atributo in ('_tasas', '_pagos', '_extras', '_filas', '_pagado', '_interes'):
+            setattr(otra, atributo, getattr(self, atributo).copy())
+        otra.meses_recalculados = 0
+        return otra
+
+    def tasa_en(self, mes: int) -> float:
+        return self._tasas[max(m for m in self._tasas if m <= mes)]
+
+    # ==================== RECÁLCULO ====================
+
+    def _recalcular(self) -> None:
+        if self._completa:
+            return
+
+        pagos, extras = self._pagos, self._extras
+        filas = self._filas
+        while len(filas) < self.max_meses:
+            desplazamiento = len(filas)
+            if filas:
+                saldo, fecha = filas[-1]['saldo'], filas[-1]['fecha_limite']
+                pagado, interes = self._pagado[-1], self._interes[-1]
+            else:
+                saldo, fecha, pagado, interes = self.capital, self.fecha_aprobacion, 0.0, 0.0
+            siguiente_cambio = min((m for m in self._tasas if m > desplazamiento + 1), default=self.max_meses + 1)
+            ultimo_mes = min(self.max_meses, siguiente_cambio - 1)
+
+            def pagar(mes, saldo, cuota_esperada, fecha_limite, es_plazo_extra):
+                mes += desplazamiento
+                if mes in pagos:
+                    return pagos[mes]
+                return cuota_esperada + extras.get(mes, 0.0)
+
+            # Retomar con el plazo restante da la misma cuota y el mismo es_plazo_extra
+            tramo = generar_tabla_amortizacion(saldo, self.tasa_en(desplazamiento + 1),
+                                               self.plazo - desplazamiento, fecha, pagar)
+            corte = False
+            for fila in tramo:
+                fila['mes'] += desplazamiento
+                pagado += fila['pago'] or 0.0
+                interes += fila['interes']
+                filas.append(fila)
+                self._pagado.append(pagado)
+                self._interes.append(interes)
+                if fila['mes'] >= ultimo_mes:
+                    corte = True
+                    break
+            self.meses_recalculados += len(filas) - desplazamiento
+            if not corte:
+                break  # saldo en cero
+        self._completa = True
+
+    # ==================== LECTURA ====================
+
+    def __len__(self) -> int:
+        self._recalcular()
+        return len(self._filas)
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        self._recalcular()
+        return iter(list(self._filas))
+
+    def fila(self, mes: int) -> Dict[str, Any]:
+        """Fila del mes `mes` (desde 1), con las claves de `generar_tabla_amortizacion`."""
+        self._recalcular()
+        if not 1 <= mes <= len(self._filas):
+            raise IndexError(f"La tabla tiene {len(self._filas)} meses")
+        return self._filas[mes - 1]
+
+    def saldo(self, mes: int) -> float:
+        """Saldo al cierre del mes `mes` (0 = capital inicial)."""
+        self._recalcular()
+        if mes <= 0 or not self._filas:
+            return self.capital
+        return self._filas[min(mes, len(self._filas)) - 1]['saldo']
+
+    def resumen(self) -> Dict[str, Any]:
+        """Meses, fecha de liquidación, total pagado, total de intereses y saldo final."""
+        self._recalcular()
+        if not self._filas:
+            return {'meses': 0, 'fecha_liquidacion': None, 'total_pagado': 0.0, 'total_interes': 0.0,
+                    'saldo_final': self.capital}
+        return {
+            'meses': len(self._filas),
+            'fecha_liquidacion': self._filas[-1]['fecha_limite'],
+            'total_pagado': self._pagado[-1],
+            'total_interes': self._interes[-1],
+            'saldo_final': self._filas[-1]['saldo'],
+        }
@@ -0,0 +1,190 @@
+import argparse
+import sqlite3
+from datetime import date
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from calendario import fecha_limite
+from main import aplicar_pago_mensual, calcular_cuota_fija
+
+# =========================================
+#   ESTADO PERSISTENTE DE PRÉSTAMOS (SQLITE)
+# =========================================
+
+ESQUEMA = """
+CREATE TABLE IF NOT EXISTS prestamos (
+    prestamo_id       INTEGER PRIMARY KEY,
+    capital           REAL NOT NULL,
+    tasa              REAL NOT NULL,
+    plazo             INTEGER NOT NULL,
+    fecha_aprobacion  TEXT NOT NULL,
+    saldo             REAL NOT NULL,
+    mes_actual        INTEGER NOT NULL,
+    fecha_limite      TEXT NOT NULL     -- vencimiento del siguiente mes por cerrar
+);
+CREATE INDEX IF NOT EXISTS prestamos_pendientes ON prestamos (fecha_limite) WHERE saldo > 0;
+
+CREATE TABLE IF NOT EXISTS pagos (
+    prestamo_id  INTEGER NOT NULL,
+    mes          INTEGER NOT NULL,
+    monto        REAL,                 -- NULL = incumplimiento explícito
+    PRIMARY KEY (prestamo_id, mes)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS movimientos (
+    prestamo_id     INTEGER NOT NULL,
+    mes             INTEGER NOT NULL,
+    fecha_limite    TEXT NOT NULL,
+    cuota_esperada  REAL NOT NULL,
+    es_plazo_extra  INTEGER NOT NULL,
+    pago            REAL,
+    interes         REAL NOT NULL,
+    amortizacion    REAL NOT NULL,
+    saldo           REAL NOT NULL,
+    PRIMARY KEY (prestamo_id, mes)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS movimientos_por_fecha ON movimientos (fecha_limite);
+"""
+
+CAMPOS_MOVIMIENTO = ('mes', 'fecha_limite', 'cuota_esperada', 'es_plazo_extra', 'pago', 'interes', 'amortizacion', 'saldo')
+
+
+class AlmacenPrestamos:
+    """Guarda saldo, mes y próxima fecha límite de cada préstamo entre sesiones.
+
+    El cierre de mes solo lee los préstamos con un vencimiento pendiente (índice
+    por fecha límite) y continúa desde el estado guardado, en vez de repetir el
+    historial completo. Cada cierre produce las mismas filas que
+    `generar_tabla_amortizacion`, con los pagos registrados como `obtener_pago`
+    (sin pago registrado = incumplimiento).
+    """
+
+    def __init__(self, ruta: str = "prestamos.db"):
+        self.conexion = sqlite3.connect(ruta)
+        # WAL: los lectores no bloquean al cierre de mes y los commits son más baratos
+        self.conexion.execute("PRAGMA journal_mode=WAL")
+        self.conexion.execute("PRAGMA synchronous=NORMAL")
+        self.conexion.executescript(ESQUEMA)
+
+    def cerrar(self) -> None:
+        self.conexion.close()
+
+    def __enter__(self) -> 'AlmacenPrestamos':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.cerrar()
+
+    # ==================== ESCRITURA EN LOTE ====================
+
+    def agregar_prestamos(self, prestamos: Iterable[Tuple[int, float, float, int, date]]) -> int:
+        """Da de alta préstamos (prestamo_id, capital, tasa, plazo, fecha_aprobacion) en una transacción."""
+        filas = ((pid, capital, tasa, plazo, aprobacion.isoformat(), capital, 0, fecha_limite(aprobacion, 1).isoformat())
+                 for pid, capital, tasa, plazo, aprobacion in prestamos)
+        with self.conexion:
+            cursor = self.conexion.executemany("INSERT INTO prestamos VALUES (?, ?, ?, ?, ?, ?, ?, ?)", filas)
+        return cursor.rowcount
+
+    def registrar_pagos(self, pagos: Iterable[Tuple[int, int, Optional[float]]]) -> int:
+        """Registra pagos (prestamo_id, mes, monto) en una transacción.
+
+        Un pago vuelto a registrar para el mismo mes reemplaza al anterior. Los
+        meses ya cerrados no se reabren: su pago se ignora.
+        """
+        with self.conexion:
+            cursor = self.conexion.executemany("INSERT OR REPLACE INTO pagos VALUES (?, ?, ?)", pagos)
+        return cursor.rowcount
+
+    # ==================== CIERRE DE MES ====================
+
+    def cerrar_mes(self, hasta: date) -> Dict[str, int]:
+        """Cierra todos los meses con fecha límite <= `hasta` que sigan pendientes.
+
+        Devuelve cuántos préstamos y meses se procesaron.
+        """
+        corte = hasta.isoformat()
+        pendientes = self.conexion.execute(
+            "SELECT prestamo_id, tasa, plazo, saldo, mes_actual, fecha_limite, fecha_aprobacion FROM prestamos "
+            "WHERE saldo > 0 AND fecha_limite <= ?", (corte,)).fetchall()
+
+        # Solo los pagos de los meses que este cierre puede alcanzar: a lo sumo uno
+        # por cada mes calendario entre la fecha límite guardada y el corte.
+        pagos: Dict[Tuple[int, int], Optional[float]] = {}
+        for pid, mes, monto in self.conexion.execute(
+                "SELECT p.prestamo_id, p.mes, p.monto FROM prestamos AS l JOIN pagos AS p USING (prestamo_id) "
+                "WHERE l.saldo > 0 AND l.fecha_limite <= :corte AND p.mes > l.mes_actual "
+                "AND p.mes <= l.mes_actual + 1 + (:anio - CAST(substr(l.fecha_limite, 1, 4) AS INTEGER)) * 12 "
+                "+ :mes - CAST(substr(l.fecha_limite, 6, 2) AS INTEGER)",
+                {'corte': corte, 'anio': hasta.year, 'mes': hasta.month}):
+            pagos[pid, mes] = monto
+
+        movimientos: List[Tuple] = []
+        estados: List[Tuple] = []
+        for pid, tasa, plazo, saldo, mes, fecha_texto, aprobacion_texto in pendientes:
+            fecha = date.fromisoformat(fecha_texto)
+            aprobacion = date.fromisoformat(aprobacion_texto)
+            while saldo > 0 and fecha <= hasta:
+                mes += 1
+                # Mismo recálculo que generar_tabla_amortizacion
+                es_plazo_extra = mes > plazo
+                cuota_esperada = calcular_cuota_fija(saldo, tasa, 1 if es_plazo_extra else plazo - mes + 1)
+                pago = pagos.get((pid, mes))
+                if pago is not None and pago < 0:
+                    pago = 0.0
+
+                saldo_anterior = saldo
+                saldo, interes = aplicar_pago_mensual(saldo, tasa, pago)
+                movimientos.append((pid, mes, fecha.isoformat(), cuota_esperada, es_plazo_extra, pago,
+                                    interes, saldo_anterior - saldo, saldo))
+                # Préstamos aprobados el mismo día comparten las fechas en la caché del calendario
+                fecha = fecha_limite(aprobacion, mes + 1)
+            estados.append((saldo, mes, fecha.isoformat(), pid))
+
+        with self.conexion:
+            self.conexion.executemany("INSERT INTO movimientos VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", movimientos)
+            self.conexion.executemany(
+                "UPDATE prestamos SET saldo = ?, mes_actual = ?, fecha_limite = ? WHERE prestamo_id = ?", estados)
+
+        return {'prestamos': len(estados), 'meses': len(movimientos)}
+
+    # ==================== CONSULTAS ====================
+
+    def estado(self, prestamo_id: int) -> Optional[Dict[str, Any]]:
+        fila = self.conexion.execute(
+            "SELECT prestamo_id, capital, tasa, plazo, fecha_aprobacion, saldo, mes_actual, fecha_limite "
+            "FROM prestamos WHERE prestamo_id = ?", (prestamo_id,)).fetchone()
+        if fila is None:
+            return None
+        claves = ('prestamo_id', 'capital', 'tasa', 'plazo', 'fecha_aprobacion', 'saldo', 'mes_actual', 'fecha_limite')
+        estado = dict(zip(claves, fila))
+        estado['fecha_aprobacion'] = date.fromisoformat(estado['fecha_aprobacion'])
+        estado['fecha_limite'] = date.fromisoformat(estado['fecha_limite'])
+        return estado
+
+    def movimientos(self, prestamo_id: int) -> List[Dict[str, Any]]:
+        """Filas ya cerradas del préstamo, con las mismas claves que `generar_tabla_amortizacion`."""
+        filas = []
+        for fila in self.conexion.execute(
+                f"SELECT {', '.join(CAMPOS_MOVIMIENTO)} FROM movimientos WHERE prestamo_id = ? ORDER BY mes",
+                (prestamo_id,)):
+            movimiento = dict(zip(CAMPOS_MOVIMIENTO, fila))
+            movimiento['fecha_limite'] = date.fromisoformat(movimiento['fecha_limite'])
+            movimiento['es_plazo_extra'] = bool(movimiento['es_plazo_extra'])
+            filas.append(movimiento)
+        return filas
+
+    def vencimientos(self, desde: date, hasta: date) -> List[Tuple[int, date]]:
+        """Préstamos con saldo cuya próxima fecha límite cae en [desde, hasta]."""
+        return [(pid, date.fromisoformat(f)) for pid, f in self.conexion.execute(
+            "SELECT prestamo_id, fecha_limite FROM prestamos WHERE saldo > 0 AND fecha_limite BETWEEN ? AND ? "
+            "ORDER BY fecha_limite", (desde.isoformat(), hasta.isoformat()))]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Cierra los meses vencidos de los préstamos guardados.")
+    parser.add_argument("base", help="archivo SQLite")
+    parser.add_argument("--hasta", default=date.today().isoformat(), help="fecha de corte YYYY-MM-DD (hoy por defecto)")
+    args = parser.parse_args()
+
+    with AlmacenPrestamos(args.base) as almacen:
+        resumen = almacen.cerrar_mes(date.fromisoformat(args.hasta))
+    print(f"{resumen['prestamos']} préstamos, {resumen['meses']} meses cerrados hasta {args.hasta}")
@@ -0,0 +1,269 @@
+import argparse
+import cProfile
+import functools
+import importlib
+import inspect
+import json
+import pstats
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+from types import ModuleType
+from typing import Any, Callable, Dict, List, Optional
+
+# =========================================
+#   INSTRUMENTACIÓN DE LOS CAMINOS CALIENTES
+# =========================================
+
+# Etapa de cada función instrumentable, por módulo. Las funciones se envuelven
+# solo mientras la instrumentación está activa: apagada, el código es el original
+# y no paga nada. Como los módulos llaman a sus funciones a través de sus
+# globales, las llamadas internas (por ejemplo, generar_tabla_amortizacion ->
+# sumar_un_mes) también se miden. La espera de `input()` dentro del pago que
+# pide `main` cuenta como 'entrada', no como tiempo propio de la simulación.
+ETAPAS = {
+    'main': {
+        'sumar_un_mes': 'fechas',
+        'fecha_limite': 'fechas',
+        'generar_fechas_limite': 'fechas',
+        'calcular_cuota_fija': 'cuota',
+        'aplicar_pago_mensual': 'pago',
+        'generar_tabla_amortizacion': 'simulacion',
+        '_pedir_pago': 'entrada',
+        'exportar_tabla_csv': 'salida',
+    },
+    'main_mejorado': {
+        'calcular_meses_de_mora': 'fechas',
+        'parse_fecha': 'fechas',
+        'calcular_interes': 'decimal',
+        '_pasos_de_mora': 'simulacion',
+        'calcular_capital_final': 'simulacion',
+        'actualizar_capital_por_meses': 'simulacion',
+        'formato_moneda': 'salida',
+    },
+}
+
+
+class Estadistica:
+    """Contador y histograma de tiempos (cubetas por potencias de 2, en ns) de una función."""
+
+    __slots__ = ('llamadas', 'total_ns', 'propio_ns', 'min_ns', 'max_ns', 'cubetas')
+
+    def __init__(self):
+        self.llamadas = 0
+        self.total_ns = 0
+        self.propio_ns = 0
+        self.min_ns = None
+        self.max_ns = 0
+        self.cubetas: Dict[int, int] = {}
+
+    def registrar(self, duracion: int, propio: int) -> None:
+        self.llamadas += 1
+        self.total_ns += duracion
+        self.propio_ns += propio
+        if self.min_ns is None or duracion < self.min_ns:
+            self.min_ns = duracion
+        if duracion > self.max_ns:
+            self.max_ns = duracion
+        cubeta = duracion.bit_length()
+        self.cubetas[cubeta] = self.cubetas.get(cubeta, 0) + 1
+
+    def acumular(self, duracion: int, propio: int) -> None:
+        """Suma tiempo sin contar una llamada (el paso final de un generador, que no produce nada)."""
+        self.total_ns += duracion
+        self.propio_ns += propio
+
+    def a_dict(self) -> Dict[str, Any]:
+        return {
+            'llamadas': self.llamadas,
+            'total_s': self.total_ns / 1e9,
+            'propio_s': self.propio_ns / 1e9,
+            'min_us': (self.min_ns or 0) / 1e3,
+            'max_us': self.max_ns / 1e3,
+            'media_us': self.total_ns / self.llamadas / 1e3 if self.llamadas else 0.0,
+            # Cada clave es el límite superior de la cubeta, en microsegundos
+            'histograma_us': {f"{(1 << b) / 1e3:g}": n for b, n in sorted(self.cubetas.items())},
+        }
+
+
+class Instrumentacion:
+    """Mide llamadas y tiempos por función y por etapa mientras está activa.
+
+    El tiempo "propio" descuenta las llamadas instrumentadas anidadas, así que
+    la suma por etapa dice dónde se va el tiempo (fechas, cuota, Decimal,
+    salida...). Los generadores se miden por paso: cada valor producido es
+    una llamada. Pensado para un solo hilo.
+
+    `perfil` puede ser None, 'cprofile' o 'tracemalloc' para capturar además
+    un perfil completo o las asignaciones de memoria.
+
+        with Instrumentacion([main], perfil='cprofile') as inst:
+            ...
+        print(json.dumps(inst.resumen()))
+    """
+
+    def __init__(self, modulos: List[ModuleType], perfil: Optional[str] = None, top: int = 20):
+        if perfil not in (None, 'cprofile', 'tracemalloc'):
+            raise ValueError(f"Perfil desconocido: {perfil}")
+        self.modulos = modulos
+        self.perfil = perfil
+        self.top = top
+        self.estadisticas: Dict[str, Estadistica] = {}
+        self.etapas: Dict[str, str] = {}
+        self._originales: List[tuple] = []
+        self._pila: List[int] = []
+        self._perfilador: Optional[cProfile.Profile] = None
+        self._captura = None
+        self._inicio = self._duracion = 0.0
+
+    # ==================== ENVOLTURAS ====================
+
+    def _envolver(self, nombre: str, funcion: Callable) -> Callable:
+        estadistica = self.estadisticas.setdefault(nombre, Estadistica())
+        pila = self._pila
+        reloj = time.perf_counter_ns
+
+        if inspect.isgeneratorfunction(funcion):
+            @functools.wraps(funcion)
+            def generador(*args, **kwargs):
+                # Cada reanudación (next, send o throw) es un paso medido; close se reenvía
+                iterador = funcion(*args, **kwargs)
+                reanudar, argumento = iterador.send, None
+                while True:
+                    inicio = reloj()
+                    pila.append(0)
+                    produjo = False
+                    try:
+                        valor = reanudar(argumento)
+                        produjo = True
+                    except StopIteration as fin:
+                        return fin.value
+                    finally:
+                        duracion = reloj() - inicio
+                        hijos = pila.pop()
+                        if pila:
+                            pila[-1] += duracion
+                        if produjo:
+                            estadistica.registrar(duracion, duracion - hijos)
+                        else:
+                            estadistica.acumular(duracion, duracion - hijos)
+                    try:
+                        argumento = yield valor
+                        reanudar = iterador.send
+                    except GeneratorExit:
+                        iterador.close()
+                        raise
+                    except BaseException as error:
+                        reanudar, argumento = iterador.throw, error
+            return generador
+
+        @functools.wraps(funcion)
+        def envoltura(*args, **kwargs):
+            inicio = reloj()
+            pila.append(0)
+            try:
+                return funcion(*args, **kwargs)
+            finally:
+                duracion = reloj() - inicio
+                hijos = pila.pop()
+                if pila:
+                    pila[-1] += duracion
+                estadistica.registrar(duracion, duracion - hijos)
+        return envoltura
+
+    def activar(self) -> 'Instrumentacion':
+        for modulo in self.modulos:
+            for nombre_funcion, etapa in ETAPAS.get(modulo.__name__, {}).items():
+                funcion = getattr(modulo, nombre_funcion, None)
+                if funcion is None:
+                    continue
+                nombre = f"{modulo.__name__}.{nombre_funcion}"
+                self.etapas[nombre] = etapa
+                self._originales.append((modulo, nombre_funcion, funcion))
+                setattr(modulo, nombre_funcion, self._envolver(nombre, funcion))
+
+        if self.perfil == 'cprofile':
+            self._perfilador = cProfile.Profile()
+            self._perfilador.enable()
+        elif self.perfil == 'tracemalloc':
+            tracemalloc.start()
+        self._inicio = time.perf_counter()
+        return self
+
+    def desactivar(self) -> None:
+        self._duracion += time.perf_counter() - self._inicio
+        if self._perfilador is not None:
+            self._perfilador.disable()
+        elif self.perfil == 'tracemalloc' and tracemalloc.is_tracing():
+            actual, pico = tracemalloc.get_traced_memory()
+            self._captura = (tracemalloc.take_snapshot(), actual, pico)
+            tracemalloc.stop()
+
+        for modulo, nombre_funcion, funcion in reversed(self._originales):
+            setattr(modulo, nombre_funcion, funcion)
+        self._originales.clear()
+
+    def __enter__(self) -> 'Instrumentacion':
+        return self.activar()
+
+    def __exit__(self, *exc) -> None:
+        self.desactivar()
+
+    # ==================== RESUMEN ====================
+
+    def resumen(self) -> Dict[str, Any]:
+        """Resumen serializable a JSON: funciones, etapas y el perfil si se pidió."""
+        funciones = {nombre: est.a_dict() for nombre, est in self.estadisticas.items() if est.llamadas}
+        etapas: Dict[str, Dict[str, float]] = {}
+        for nombre, datos in funciones.items():
+            etapa = etapas.setdefault(self.etapas[nombre], {'llamadas': 0, 'propio_s': 0.0})
+            etapa['llamadas'] += datos['llamadas']
+            etapa['propio_s'] += datos['propio_s']
+
+        resumen: Dict[str, Any] = {'duracion_s': self._duracion, 'etapas': etapas, 'funciones': funciones}
+        if self._perfilador is not None:
+            estadisticas = pstats.Stats(self._perfilador)
+            filas = sorted(estadisticas.stats.items(), key=lambda item: item[1][2], reverse=True)[:self.top]
+            resumen['cprofile'] = [
+                {'funcion': f"{archivo}:{linea}({nombre})", 'llamadas': nc, 'propio_s': tt, 'acumulado_s': ct}
+                for (archivo, linea, nombre), (cc, nc, tt, ct, _) in filas
+            ]
+        if self._captura is not None:
+            captura, actual, pico = self._captura
+            resumen['tracemalloc'] = {
+                'actual_bytes': actual,
+                'pico_bytes': pico,
+                'lineas': [{'linea': str(s.traceback[0]), 'bytes': s.size, 'bloques': s.count}
+                           for s in captura.statistics('lineno')[:self.top]],
+            }
+        return resumen
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Ejecuta un punto de entrada con instrumentación y emite un resumen JSON al terminar.")
+    parser.add_argument("entrada", nargs="?", default="main:main",
+                        help="modulo:funcion a ejecutar (main:main o main_mejorado:run_cli)")
+    parser.add_argument("--perfil", choices=("cprofile", "tracemalloc"), default=None)
+    parser.add_argument("--salida", help="archivo JSON del resumen (por defecto, stderr)")
+    args = parser.parse_args()
+
+    raiz = Path(__file__).resolve().parent.parent
+    sys.path.insert(0, str(raiz / "Extras"))
+    sys.path.insert(0, str(raiz / "Backend"))
+
+    nombre_modulo, _, nombre_funcion = args.entrada.partition(":")
+    modulos = [importlib.import_module(m) for m in ETAPAS]
+    entrada = getattr(importlib.import_module(nombre_modulo), nombre_funcion or "main")
+
+    instrumentacion = Instrumentacion(modulos, args.perfil)
+    with instrumentacion:
+        entrada()
+
+    texto = json.dumps(instrumentacion.resumen(), indent=2, ensure_ascii=False)
+    if args.salida:
+        with open(args.salida, "w", encoding="utf-8") as archivo:
+            archivo.write(texto + "\n")
+    else:
+        print(texto, file=sys.stderr)
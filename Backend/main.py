@@ -1,7 +1,11 @@
-from datetime import datetime, timedelta
-from typing import Dict, Any
+from datetime import date, datetime, timedelta
+from typing import Dict, Any, Callable, Iterable, Iterator, Optional, TextIO, Tuple
+from functools import lru_cache
+import csv
 import math
 
+from calendario import fecha_limite
+
 # =================================================================
 # Archivo: calculadora_simulacion_terminal.py
 # Propósito: Lógica de cálculo de crédito con manejo de mora por interés
@@ -9,30 +13,61 @@ import math
 
 # ==================== FUNCIONES DE CÁLCULO ====================
 
-def calcular_cuota_fija(capital: float, tasa: float, meses: int) -> float:
+TAMANO_CACHE_FACTORES = 4096
+
+
+def _factor_anualidad(tasa: float, meses: int) -> Optional[float]:
     """
-    Cálculo de cuota fija (Sistema Francés), con manejo de tasa 0%.
+    Factor del Sistema Francés: cuota = capital * factor.
+    Devuelve None si el denominador es 0 (la cuota es el capital completo).
     """
     tasa_decimal = tasa / 100
-    
-    if meses <= 0 or capital <= 0:
-        return 0
-
-    if tasa_decimal == 0:
-        return capital / meses
-
     try:
         numerador = tasa_decimal * (1 + tasa_decimal)**meses
         denominador = (1 + tasa_decimal)**meses - 1
         if denominador == 0:
-             return capital
-             
-        cuota = capital * (numerador / denominador)
-        return max(cuota, 0)
+             return None
+        return numerador / denominador
     except OverflowError:
         return float('inf')
 
 
+_factor_cacheado = lru_cache(maxsize=TAMANO_CACHE_FACTORES)(_factor_anualidad)
+
+
+def configurar_cache_factores(tamano: Optional[int]) -> None:
+    """Cambia el tamaño máximo de la caché de factores (None = sin límite) y la vacía."""
+    global _factor_cacheado
+    _factor_cacheado = lru_cache(maxsize=tamano)(_factor_anualidad)
+
+
+def estadisticas_cache_factores():
+    """Aciertos, fallos, tamaño máximo y tamaño actual de la caché de factores."""
+    return _factor_cacheado.cache_info()
+
+
+def calcular_cuota_fija(capital: float, tasa: float, meses: int) -> float:
+    """
+    Cálculo de cuota fija (Sistema Francés), con manejo de tasa 0%.
+    El factor de cada (tasa, meses) se guarda en una caché LRU, así que
+    repetir una combinación cuesta una búsqueda y una multiplicación.
+    """
+    if meses <= 0 or capital <= 0:
+        return 0
+
+    if tasa / 100 == 0:
+        return capital / meses
+
+    factor = _factor_cacheado(tasa, meses)
+    if factor is None:
+        return capital
+    if factor == float('inf'):
+        return factor
+
+    cuota = capital * factor
+    return max(cuota, 0)
+
+
 def sumar_un_mes(fecha: datetime.date) -> datetime.date:
     """Devuelve la misma fecha del siguiente mes, corrigiendo días inexistentes."""
     mes = fecha.month + 1
@@ -48,8 +83,131 @@ def sumar_un_mes(fecha: datetime.date) -> datetime.date:
         next_month_start = (fecha.replace(day=1, month=mes, year=año) + timedelta(days=32)).replace(day=1)
         return next_month_start - timedelta(days=1)
 
+
+def aplicar_pago_mensual(saldo: float, tasa: float, pago: Optional[float]) -> Tuple[float, float]:
+    """
+    Aplica las reglas de un mes y devuelve (nuevo_saldo, interes_periodo).
+
+    `pago` None significa incumplimiento total (se suma solo el interés).
+    Un pago menor al interés capitaliza la diferencia y uno mayor o igual amortiza.
+    """
+    interes_periodo = saldo * (tasa / 100)
+
+    if pago is None:
+        saldo += interes_periodo
+    elif pago < interes_periodo:
+        saldo += interes_periodo - pago
+    else:
+        saldo -= pago - interes_periodo
+
+    if saldo < 0:
+        saldo = 0
+    return saldo, interes_periodo
+
+
+# ==================== TABLA DE AMORTIZACIÓN (STREAMING) ====================
+
+def generar_fechas_limite(fecha_aprobacion: date, meses: int) -> Iterator[date]:
+    """Genera las fechas límite de los primeros `meses` meses sin construir una lista."""
+    for n in range(1, meses + 1):
+        yield fecha_limite(fecha_aprobacion, n)
+
+
+def _pagar_cuota_esperada(mes: int, saldo: float, cuota_esperada: float, fecha_limite: date, es_plazo_extra: bool) -> Optional[float]:
+    return cuota_esperada
+
+
+def generar_tabla_amortizacion(capital: float, tasa: float, meses_plazo_original: int, fecha_aprobacion: date,
+                               obtener_pago: Callable[..., Optional[float]] = _pagar_cuota_esperada) -> Iterator[Dict[str, Any]]:
+    """
+    Genera la simulación mes a mes, una fila a la vez, hasta que el saldo llega a cero.
+
+    `obtener_pago(mes, saldo, cuota_esperada, fecha_limite, es_plazo_extra)` decide
+    el pago de cada mes (None = incumplimiento); por defecto se paga la cuota esperada.
+    La memoria usada es constante, así que la tabla se puede volcar directamente a un
+    CSV o a un socket. Si nunca se paga, el generador no termina.
+    """
+    saldo = capital
+    mes_actual = 0
+
+    while saldo > 0:
+        mes_actual += 1
+        # Índice de calendario con caché: tablas repetidas del mismo crédito no recalculan fechas
+        fecha_limite_actual = fecha_limite(fecha_aprobacion, mes_actual)
+
+        # El número de meses restantes para el recálculo debe basarse en el plazo original
+        if mes_actual <= meses_plazo_original:
+            meses_restantes_para_cuota = meses_plazo_original - mes_actual + 1
+            es_plazo_extra = False
+        else:
+            # Si ya pasamos el plazo original, usamos 1 mes para forzar la liquidación
+            meses_restantes_para_cuota = 1
+            es_plazo_extra = True
+
+        cuota_esperada = calcular_cuota_fija(saldo, tasa, meses_restantes_para_cuota)
+        pago = obtener_pago(mes_actual, saldo, cuota_esperada, fecha_limite_actual, es_plazo_extra)
+        if pago is not None and pago < 0:
+            pago = 0.0
+
+        saldo_anterior = saldo
+        saldo, interes_periodo = aplicar_pago_mensual(saldo, tasa, pago)
+
+        yield {
+            'mes': mes_actual,
+            'fecha_limite': fecha_limite_actual,
+            'cuota_esperada': cuota_esperada,
+            'es_plazo_extra': es_plazo_extra,
+            'pago': pago,
+            'interes': interes_periodo,
+            'amortizacion': saldo_anterior - saldo,
+            'saldo': saldo,
+        }
+
+
+def exportar_tabla_csv(filas: Iterable[Dict[str, Any]], destino: TextIO) -> int:
+    """Escribe las filas en formato CSV a medida que se generan. Devuelve cuántas escribió."""
+    escritor = None
+    total = 0
+    for fila in filas:
+        if escritor is None:
+            escritor = csv.DictWriter(destino, fieldnames=list(fila))
+            escritor.writeheader()
+        escritor.writerow(fila)
+        total += 1
+    return total
+
+
 # ==================== LÓGICA PRINCIPAL DE SIMULACIÓN ====================
 
+def _pedir_pago(mes: int, saldo: float, cuota_esperada: float, fecha_limite: date, es_plazo_extra: bool,
+                meses_plazo_original: int) -> Optional[float]:
+    """Muestra el estado del mes y pregunta por consola el pago realizado."""
+    print(f"--- MES {mes} --- (Plazo Original: {meses_plazo_original} meses)")
+    print(f"Saldo actual: ${saldo:,.2f}")
+
+    if es_plazo_extra:
+         print(f"*** ¡PLAZO ORIGINAL VENCIDO! ***")
+         print(f"Cuota esperada (para liquidar en 1 mes): ${cuota_esperada:,.2f}")
+    else:
+         print(f"Cuota esperada: ${cuota_esperada:,.2f}")
+
+    print(f"Fecha límite de pago: {fecha_limite}")
+
+    # 1. CONFIRMACIÓN DE PAGO
+    pago_confirmado_str = input(f"¿Se realizó algún pago en el mes {mes}? (s/n): ").lower()
+    if pago_confirmado_str not in ('s', 'si'):
+        return None
+
+    try:
+        pago = float(input(f"¿Cuánto pagó el usuario? "))
+    except ValueError:
+        print("Monto de pago inválido. Asumiendo pago de $0.")
+        pago = 0.0
+
+    print("-" * 35)
+    return pago
+
+
 def main():
     print("=== CALCULADORA DE CRÉDITO (Continuación hasta Saldo Cero) ===\n")
 
@@ -71,110 +229,47 @@ def main():
     # La cuota original se calcula con el plazo inicial
     cuota_original = calcular_cuota_fija(capital_inicial, interes, meses_plazo_original)
     saldo = capital_inicial
-    
-    # Pre-calcular las primeras fechas límite para la tabla inicial
-    fechas_limite = []
-    fecha_limite = fecha_aprobacion
-    for _ in range(meses_plazo_original):
-        fecha_limite = sumar_un_mes(fecha_limite)
-        fechas_limite.append(fecha_limite)
 
     # ================= TABLA INICIAL ==================
     print("\n===== TABLA INICIAL DE CUOTAS =====")
-    for i, fecha in enumerate(fechas_limite):
+    for i, fecha in enumerate(generar_fechas_limite(fecha_aprobacion, meses_plazo_original)):
         print(f"Mes {i+1} | Cuota inicial: ${cuota_original:,.2f} | Fecha límite: {fecha}")
 
     # ============= PROCESO MENSUAL DE PAGOS (BUCLE INDEFINIDO) ==============
     print("\n===== REGISTRO DE PAGOS Y SIMULACIÓN =====\n")
-    
-    # Inicializar contadores para el bucle WHILE
-    mes_actual = 0
-    fecha_limite_actual = fecha_aprobacion
-    
-    # El bucle continúa mientras haya saldo pendiente
-    while saldo > 0:
-        
-        mes_actual += 1
-        fecha_limite_actual = sumar_un_mes(fecha_limite_actual)
-        
-        # El número de meses restantes para el recálculo debe basarse en el plazo original
-        if mes_actual <= meses_plazo_original:
-            meses_restantes_para_cuota = meses_plazo_original - mes_actual + 1
-            es_plazo_extra = False
-        else:
-            # Si ya pasamos el plazo original, usamos 1 mes para forzar la liquidación
-            meses_restantes_para_cuota = 1 
-            es_plazo_extra = True
 
-        cuota_esperada = calcular_cuota_fija(saldo, interes, meses_restantes_para_cuota)
-        pago = 0.0
+    def pedir_pago(*estado_mes):
+        return _pedir_pago(*estado_mes, meses_plazo_original)
 
-        print(f"--- MES {mes_actual} --- (Plazo Original: {meses_plazo_original} meses)")
-        print(f"Saldo actual: ${saldo:,.2f}")
-        
-        if es_plazo_extra:
-             print(f"*** ¡PLAZO ORIGINAL VENCIDO! ***")
-             print(f"Cuota esperada (para liquidar en 1 mes): ${cuota_esperada:,.2f}")
-        else:
-             print(f"Cuota esperada: ${cuota_esperada:,.2f}")
-             
-        print(f"Fecha límite de pago: {fecha_limite_actual}")
-
-        # 1. CONFIRMACIÓN DE PAGO
-        pago_confirmado_str = input(f"¿Se realizó algún pago en el mes {mes_actual}? (s/n): ").lower()
-        hubo_pago = (pago_confirmado_str == 's' or pago_confirmado_str == 'si')
-
-        # 2. CALCULAR INTERÉS PERIÓDICO (Necesario para ambos casos: Mora o Pago)
-        interes_periodo = saldo * (interes / 100)
-        
-        # 3. GESTIÓN DE INCUMPLIMIENTO/PAGO
-        if not hubo_pago:
+    mes_actual = 0
+    for fila in generar_tabla_amortizacion(capital_inicial, interes, meses_plazo_original, fecha_aprobacion, pedir_pago):
+        mes_actual = fila['mes']
+        saldo = fila['saldo']
+        interes_periodo = fila['interes']
+        pago = fila['pago']
+
+        # 2. GESTIÓN DE INCUMPLIMIENTO/PAGO
+        if pago is None:
             # === INCUMPLIMIENTO TOTAL (APLICAR SOLO INTERÉS) ===
             print("\n¡INCUMPLIMIENTO TOTAL! No se realizó el pago este mes.")
-            
-            # LÓGICA DE PENALIDAD: SUMAR SOLO EL INTERÉS GENERADO AL SALDO
-            saldo += interes_periodo
-            
             print(f"Se aplicó un cargo de ${interes_periodo:,.2f} al saldo (Solo Interés de la Mora).")
-            print(f"La cuota esperada de ${cuota_esperada:,.2f} NO fue cargada al capital.")
-            
+            print(f"La cuota esperada de ${fila['cuota_esperada']:,.2f} NO fue cargada al capital.")
+
+        elif pago < interes_periodo:
+            # Pago < Interés: Capitalización. El saldo SUBE.
+            capitalizacion = interes_periodo - pago
+            print(f"\nPago < Interés (${interes_periodo:,.2f}). El capital aumentó (Capitalización): ${capitalizacion:,.2f}.")
+
         else:
-            # === PAGO REALIZADO ===
-            try:
-                pago = float(input(f"¿Cuánto pagó el usuario? "))
-            except ValueError:
-                print("Monto de pago inválido. Asumiendo pago de $0.")
-                pago = 0.0
-                
-            if pago < 0:
-                pago = 0.0
-            
-            print("-" * 35)
-
-            # 4. AMORTIZACIÓN REAL Y GESTIÓN DE SALDO (Solo si hubo pago)
-            
-            if pago < interes_periodo:
-                # Pago < Interés: Capitalización. El saldo SUBE.
-                capitalizacion = interes_periodo - pago
-                saldo += capitalizacion
-                print(f"\nPago < Interés (${interes_periodo:,.2f}). El capital aumentó (Capitalización): ${capitalizacion:,.2f}.")
-            
-            else:
-                # Pago >= Interés: Amortización. El saldo BAJA.
-                amortizacion = pago - interes_periodo
-                saldo -= amortizacion
-                
-                print(f"\nInterés cubierto: ${interes_periodo:,.2f} | Amortización a capital: ${amortizacion:,.2f}")
-                
-                # Chequeo de pago extra
-                if pago > cuota_esperada:
-                    extra = pago - cuota_esperada
-                    print(f"¡Pago EXTRA de capital por ${extra:,.2f}!")
-
-        # 5. Ajuste final del saldo
-        if saldo < 0:
-            saldo = 0
-            
+            # Pago >= Interés: Amortización. El saldo BAJA.
+            amortizacion = pago - interes_periodo
+            print(f"\nInterés cubierto: ${interes_periodo:,.2f} | Amortización a capital: ${amortizacion:,.2f}")
+
+            # Chequeo de pago extra
+            if pago > fila['cuota_esperada']:
+                extra = pago - fila['cuota_esperada']
+                print(f"¡Pago EXTRA de capital por ${extra:,.2f}!")
+
         print(f"\n*** Saldo después del procesamiento: ${saldo:,.2f} ***\n")
 
     # ============= FIN DEL PROCESO =============
@@ -0,0 +1,143 @@
+import argparse
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from replay_pagos import TAMANO_BLOQUE, posiciones_en_cartera, replay_posiciones
+
+# =================================================================
+# Archivo: portafolio_paralelo.py
+# Propósito: Repartir la simulación de una cartera entre varios procesos
+# =================================================================
+
+# Descriptor de un arreglo en memoria compartida: (nombre, dtype, forma)
+Descriptor = Tuple[str, str, Tuple[int, ...]]
+
+# ==================== MEMORIA COMPARTIDA ====================
+
+def _crear_compartido(arreglo: np.ndarray, bloques: List[shared_memory.SharedMemory]) -> Descriptor:
+    """Copia `arreglo` a un bloque de memoria compartida nuevo y devuelve su descriptor."""
+    shm = shared_memory.SharedMemory(create=True, size=max(arreglo.nbytes, 1))
+    bloques.append(shm)
+    np.ndarray(arreglo.shape, dtype=arreglo.dtype, buffer=shm.buf)[...] = arreglo
+    return shm.name, arreglo.dtype.str, arreglo.shape
+
+
+def _abrir_compartidos(descriptores: Dict[str, Descriptor]):
+    """Adjunta los bloques descritos y devuelve (bloques, vistas numpy)."""
+    bloques, vistas = [], {}
+    for clave, (nombre, dtype, forma) in descriptores.items():
+        shm = shared_memory.SharedMemory(name=nombre)
+        bloques.append(shm)
+        vistas[clave] = np.ndarray(forma, dtype=np.dtype(dtype), buffer=shm.buf)
+    return bloques, vistas
+
+# ==================== TRABAJO POR FRAGMENTO ====================
+
+def _procesar_fragmento(entrada: Dict[str, Descriptor], salida: Dict[str, Descriptor],
+                        inicio: int, fin: int, tamano_bloque: int) -> None:
+    """Procesa los créditos [inicio, fin) y escribe el resultado directamente en `salida`."""
+    bloques, vistas = _abrir_compartidos({**entrada, **salida})
+    try:
+        a, b = np.searchsorted(vistas['pos'], [inicio, fin])
+        resultado = replay_posiciones(
+            vistas['capital'][inicio:fin], vistas['tasa'][inicio:fin], vistas['plazo'][inicio:fin],
+            vistas['hasta_mes'][inicio:fin],
+            vistas['pos'][a:b] - inicio, vistas['mes'][a:b], vistas['monto'][a:b],
+            tamano_bloque,
+        )
+        for clave, valores in resultado.items():
+            vistas[clave][inicio:fin] = valores
+        del vistas
+    finally:
+        for shm in bloques:
+            shm.close()
+
+
+def fragmentos(n: int, cantidad: int) -> List[Tuple[int, int]]:
+    """Reparte `n` créditos en `cantidad` rangos contiguos; depende solo de (n, cantidad)."""
+    limites = [n * k // cantidad for k in range(cantidad + 1)]
+    return [(a, b) for a, b in zip(limites, limites[1:]) if a < b]
+
+
+def simular_cartera_paralelo(prestamo_id, capital, tasa, plazo, pago_prestamo_id, pago_mes, pago_monto,
+                             hasta_mes=None, procesos: Optional[int] = None, num_fragmentos: Optional[int] = None,
+                             tamano_bloque: int = TAMANO_BLOQUE) -> Dict[str, np.ndarray]:
+    """
+    Igual que `replay_libro_pagos`, pero repartiendo la cartera entre procesos.
+
+    La cartera se divide en `num_fragmentos` rangos contiguos (por defecto uno
+    por proceso). Entradas y salidas viajan por memoria compartida, no por
+    pickle, y cada fragmento escribe en su propio rango, así que el resultado
+    es idéntico byte a byte al de la ejecución serial.
+    """
+    prestamo_id = np.asarray(prestamo_id, dtype=np.int64)
+    pago_prestamo_id = np.asarray(pago_prestamo_id, dtype=np.int64)
+    pago_mes = np.asarray(pago_mes, dtype=np.int64)
+    pago_monto = np.asarray(pago_monto, dtype=np.float64)
+
+    n = prestamo_id.shape[0]
+    if hasta_mes is None:
+        hasta_mes = int(pago_mes.max()) if pago_mes.size else 0
+    procesos = procesos or os.cpu_count() or 1
+    num_fragmentos = num_fragmentos or procesos
+
+    pos = posiciones_en_cartera(prestamo_id, pago_prestamo_id)
+    orden_pagos = np.argsort(pos, kind='stable')
+
+    bloques: List[shared_memory.SharedMemory] = []
+    try:
+        entrada = {
+            'capital': _crear_compartido(np.asarray(capital, dtype=np.float64), bloques),
+            'tasa': _crear_compartido(np.asarray(tasa, dtype=np.float64), bloques),
+            'plazo': _crear_compartido(np.asarray(plazo, dtype=np.int64), bloques),
+            'hasta_mes': _crear_compartido(np.broadcast_to(np.asarray(hasta_mes, dtype=np.int64), (n,)), bloques),
+            'pos': _crear_compartido(pos[orden_pagos], bloques),
+            'mes': _crear_compartido(pago_mes[orden_pagos], bloques),
+            'monto': _crear_compartido(pago_monto[orden_pagos], bloques),
+        }
+        salida = {
+            'saldo': _crear_compartido(np.zeros(n, dtype=np.float64), bloques),
+            'meses': _crear_compartido(np.zeros(n, dtype=np.int64), bloques),
+            'liquidado': _crear_compartido(np.zeros(n, dtype=bool), bloques),
+            'cuota_siguiente': _crear_compartido(np.zeros(n, dtype=np.float64), bloques),
+        }
+
+        with ProcessPoolExecutor(max_workers=procesos) as ejecutor:
+            tareas = [ejecutor.submit(_procesar_fragmento, entrada, salida, a, b, tamano_bloque)
+                      for a, b in fragmentos(n, num_fragmentos)]
+            for tarea in tareas:
+                tarea.result()
+
+        abiertos, vistas = _abrir_compartidos(salida)
+        resultado = {'prestamo_id': prestamo_id, **{clave: vista.copy() for clave, vista in vistas.items()}}
+        del vistas
+        for shm in abiertos:
+            shm.close()
+        return resultado
+    finally:
+        for shm in bloques:
+            shm.close()
+            shm.unlink()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Simula una cartera en paralelo a partir de un libro de pagos.")
+    parser.add_argument("cartera", help="npz con prestamo_id, capital, tasa, plazo")
+    parser.add_argument("pagos", help="npz con prestamo_id, mes, monto (NaN = sin pago)")
+    parser.add_argument("salida", help="npz de salida")
+    parser.add_argument("--hasta-mes", type=int, default=None)
+    parser.add_argument("--procesos", type=int, default=None)
+    parser.add_argument("--fragmentos", type=int, default=None)
+    args = parser.parse_args()
+
+    with np.load(args.cartera) as cartera, np.load(args.pagos) as pagos:
+        resultado = simular_cartera_paralelo(
+            cartera['prestamo_id'], cartera['capital'], cartera['tasa'], cartera['plazo'],
+            pagos['prestamo_id'], pagos['mes'], pagos['monto'],
+            hasta_mes=args.hasta_mes, procesos=args.procesos, num_fragmentos=args.fragmentos,
+        )
+    np.savez(args.salida, **resultado)
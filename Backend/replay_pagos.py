@@ -0,0 +1,169 @@
+import argparse
+from typing import Dict, Optional
+
+import numpy as np
+
+from cuota_lote import calcular_cuota_fija_lote
+
+# =================================================================
+# Archivo: replay_pagos.py
+# Propósito: Reproducir un libro de pagos registrado sobre muchos créditos
+#            con las mismas reglas de mora/capitalización de main.py
+# =================================================================
+
+TAMANO_BLOQUE = 250_000
+
+# ==================== FUNCIONES DE CÁLCULO ====================
+
+def _aplicar_mes_lote(saldo: np.ndarray, tasa_decimal: np.ndarray, pago: np.ndarray, hubo_pago: np.ndarray) -> np.ndarray:
+    """Versión vectorizada de `aplicar_pago_mensual` para un mes de muchos créditos."""
+    interes_periodo = saldo * tasa_decimal
+    pago = np.where(pago < 0, 0.0, pago)
+
+    nuevo_saldo = np.where(
+        ~hubo_pago,
+        saldo + interes_periodo,                                   # Incumplimiento total
+        np.where(pago < interes_periodo,
+                 saldo + (interes_periodo - pago),                 # Capitalización
+                 saldo - (pago - interes_periodo)),                # Amortización
+    )
+    return np.where(nuevo_saldo < 0, 0.0, nuevo_saldo)
+
+
+def _replay_bloque(capital, tasa, plazo, hasta_mes, pos_pago, mes_pago, monto_pago) -> Dict[str, np.ndarray]:
+    """Procesa un bloque de créditos; `pos_pago` indexa dentro del bloque."""
+    n = capital.shape[0]
+    saldo = capital.copy()
+    tasa_decimal = tasa / 100
+    meses = np.zeros(n, dtype=np.int64)
+
+    # Los pagos se recorren por mes: cada mes es una rebanada contigua del libro ordenado.
+    orden = np.argsort(mes_pago, kind='stable')
+    pos_pago, mes_pago, monto_pago = pos_pago[orden], mes_pago[orden], monto_pago[orden]
+    registrado = ~np.isnan(monto_pago)
+
+    ultimo_mes = int(hasta_mes.max()) if n else 0
+    for mes in range(1, ultimo_mes + 1):
+        activo = (saldo > 0) & (mes <= hasta_mes)
+        if not activo.any():
+            break
+
+        ini, fin = np.searchsorted(mes_pago, [mes, mes + 1])
+        pos_mes = pos_pago[ini:fin][registrado[ini:fin]]
+        pago = np.bincount(pos_mes, weights=monto_pago[ini:fin][registrado[ini:fin]], minlength=n)
+        hubo_pago = np.bincount(pos_mes, minlength=n) > 0
+
+        saldo = np.where(activo, _aplicar_mes_lote(saldo, tasa_decimal, pago, hubo_pago), saldo)
+        meses[activo] = mes
+
+    # Cuota que se pediría el mes siguiente; pasado el plazo original se liquida en 1 mes.
+    restantes = np.maximum(plazo - meses, 1)
+    cuota_siguiente = np.where(saldo > 0, calcular_cuota_fija_lote(saldo, tasa, restantes), 0.0)
+
+    return {
+        'saldo': saldo,
+        'meses': meses,
+        'liquidado': saldo <= 0,
+        'cuota_siguiente': cuota_siguiente,
+    }
+
+
+def replay_libro_pagos(prestamo_id, capital, tasa, plazo, pago_prestamo_id, pago_mes, pago_monto,
+                       hasta_mes=None, tamano_bloque: int = TAMANO_BLOQUE) -> Dict[str, np.ndarray]:
+    """
+    Reproduce un libro de pagos (prestamo_id, mes, monto) sobre una cartera.
+
+    `pago_monto` NaN (o un mes sin registro) es un incumplimiento total; varios
+    registros del mismo mes se suman. Cada crédito avanza desde el mes 1 hasta
+    `hasta_mes` (escalar o por crédito; por defecto el último mes del libro) o
+    hasta quedar liquidado. Los créditos se procesan en bloques de
+    `tamano_bloque` con arreglos de estado vectorizados.
+
+    Devuelve columnas alineadas con `prestamo_id`: saldo, meses (último mes
+    procesado), liquidado y cuota_siguiente.
+    """
+    prestamo_id = np.asarray(prestamo_id, dtype=np.int64)
+    capital = np.asarray(capital, dtype=np.float64)
+    tasa = np.asarray(tasa, dtype=np.float64)
+    plazo = np.asarray(plazo, dtype=np.int64)
+    pago_prestamo_id = np.asarray(pago_prestamo_id, dtype=np.int64)
+    pago_mes = np.asarray(pago_mes, dtype=np.int64)
+    pago_monto = np.asarray(pago_monto, dtype=np.float64)
+
+    n = prestamo_id.shape[0]
+    if hasta_mes is None:
+        hasta_mes = int(pago_mes.max()) if pago_mes.size else 0
+    hasta_mes = np.broadcast_to(np.asarray(hasta_mes, dtype=np.int64), (n,))
+
+    # Agrupar los pagos por posición del crédito en la cartera.
+    pos = posiciones_en_cartera(prestamo_id, pago_prestamo_id)
+    orden_pagos = np.argsort(pos, kind='stable')
+
+    resultado = replay_posiciones(capital, tasa, plazo, hasta_mes,
+                                  pos[orden_pagos], pago_mes[orden_pagos], pago_monto[orden_pagos], tamano_bloque)
+    return {'prestamo_id': prestamo_id, **resultado}
+
+
+def posiciones_en_cartera(prestamo_id: np.ndarray, pago_prestamo_id: np.ndarray) -> np.ndarray:
+    """Posición dentro de la cartera del crédito de cada registro del libro de pagos."""
+    n = prestamo_id.shape[0]
+    orden_ids = np.argsort(prestamo_id, kind='stable')
+    ids_ordenados = prestamo_id[orden_ids]
+    if not pago_prestamo_id.size:
+        return np.empty(0, dtype=np.int64)
+
+    idx = np.minimum(np.searchsorted(ids_ordenados, pago_prestamo_id), max(n - 1, 0))
+    if n == 0 or np.any(ids_ordenados[idx] != pago_prestamo_id):
+        raise ValueError("El libro de pagos contiene créditos que no están en la cartera.")
+    return orden_ids[idx]
+
+
+def replay_posiciones(capital, tasa, plazo, hasta_mes, pos, pago_mes, pago_monto,
+                      tamano_bloque: int = TAMANO_BLOQUE) -> Dict[str, np.ndarray]:
+    """
+    Núcleo de `replay_libro_pagos` para un libro ya ordenado por `pos`
+    (posición del crédito dentro de `capital`/`tasa`/`plazo`/`hasta_mes`).
+    """
+    n = capital.shape[0]
+    resultado = {
+        'saldo': np.empty(n, dtype=np.float64),
+        'meses': np.empty(n, dtype=np.int64),
+        'liquidado': np.empty(n, dtype=bool),
+        'cuota_siguiente': np.empty(n, dtype=np.float64),
+    }
+    for inicio in range(0, n, tamano_bloque):
+        fin = min(inicio + tamano_bloque, n)
+        a, b = np.searchsorted(pos, [inicio, fin])
+        bloque = _replay_bloque(capital[inicio:fin], tasa[inicio:fin], plazo[inicio:fin], hasta_mes[inicio:fin],
+                                pos[a:b] - inicio, pago_mes[a:b], pago_monto[a:b])
+        for clave, valores in bloque.items():
+            resultado[clave][inicio:fin] = valores
+
+    return resultado
+
+# ==================== ENTRADA/SALIDA COLUMNAR ====================
+
+def replay_archivos(ruta_cartera: str, ruta_pagos: str, ruta_salida: str, hasta_mes: Optional[int] = None,
+                    tamano_bloque: int = TAMANO_BLOQUE) -> None:
+    """
+    Lee la cartera (prestamo_id, capital, tasa, plazo) y el libro de pagos
+    (prestamo_id, mes, monto) desde archivos `.npz` y guarda el resultado en otro `.npz`.
+    """
+    with np.load(ruta_cartera) as cartera, np.load(ruta_pagos) as pagos:
+        resultado = replay_libro_pagos(
+            cartera['prestamo_id'], cartera['capital'], cartera['tasa'], cartera['plazo'],
+            pagos['prestamo_id'], pagos['mes'], pagos['monto'],
+            hasta_mes=hasta_mes, tamano_bloque=tamano_bloque,
+        )
+    np.savez(ruta_salida, **resultado)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Reproduce un libro de pagos sobre una cartera de créditos.")
+    parser.add_argument("cartera", help="npz con prestamo_id, capital, tasa, plazo")
+    parser.add_argument("pagos", help="npz con prestamo_id, mes, monto (NaN = sin pago)")
+    parser.add_argument("salida", help="npz de salida")
+    parser.add_argument("--hasta-mes", type=int, default=None)
+    parser.add_argument("--tamano-bloque", type=int, default=TAMANO_BLOQUE)
+    args = parser.parse_args()
+    replay_archivos(args.cartera, args.pagos, args.salida, args.hasta_mes, args.tamano_bloque)
@@ -0,0 +1,318 @@
+import argparse
+import asyncio
+import itertools
+import json
+import math
+import sys
+from datetime import date
+from decimal import Decimal, InvalidOperation
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Tuple
+from urllib.parse import parse_qsl, urlsplit
+
+from main import calcular_cuota_fija, generar_tabla_amortizacion
+
+# La lógica de mora en Decimal vive en Extras/
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "Extras"))
+
+from main_mejorado import _to_decimal, actualizar_capital_por_meses, calcular_meses_de_mora, parse_fecha
+
+# =========================================
+#   SERVICIO HTTP DE COTIZACIONES (ASYNCIO)
+# =========================================
+
+MAX_CABECERA = 16 * 1024
+MAX_CUERPO = 4 * 1024 * 1024
+MAX_LOTE = 10_000
+MAX_MESES = 1200
+TIEMPO_INACTIVO = 15.0
+
+ESTADOS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+           413: "Payload Too Large", 500: "Internal Server Error"}
+
+
+class ErrorHTTP(Exception):
+    def __init__(self, estado: int, mensaje: str):
+        super().__init__(mensaje)
+        self.estado = estado
+
+
+# ==================== LECTURA DE PARÁMETROS ====================
+
+def _numero(parametros: Dict[str, Any], clave: str) -> float:
+    if clave not in parametros:
+        raise ErrorHTTP(400, f"Falta el parámetro '{clave}'.")
+    valor = parametros[clave]
+    try:
+        if isinstance(valor, str):
+            valor = valor.replace(',', '.')
+        valor = float(valor)
+    except (TypeError, ValueError):
+        raise ErrorHTTP(400, f"'{clave}' debe ser numérico.")
+    # nan e inf no tienen sentido como montos y no se pueden escribir en JSON
+    if not math.isfinite(valor):
+        raise ErrorHTTP(400, f"'{clave}' debe ser un número finito.")
+    return valor
+
+
+def _entero(parametros: Dict[str, Any], clave: str, minimo: int = 1) -> int:
+    valor = _numero(parametros, clave)
+    if not math.isfinite(valor) or valor != int(valor) or not minimo <= valor <= MAX_MESES:
+        raise ErrorHTTP(400, f"'{clave}' debe ser un entero entre {minimo} y {MAX_MESES}.")
+    return int(valor)
+
+
+def _verdadero(parametros: Dict[str, Any], clave: str) -> bool:
+    valor = parametros.get(clave, False)
+    if isinstance(valor, str):
+        return valor.lower() in ('1', 'true', 'si', 'sí')
+    return bool(valor)
+
+
+def _cuota_json(cuota: float) -> Optional[float]:
+    # JSON no admite infinitos: una cuota no representable se devuelve como null
+    return cuota if math.isfinite(cuota) else None
+
+
+def _leer_cotizacion(parametros: Dict[str, Any]) -> Tuple[float, float, int]:
+    capital = _numero(parametros, 'capital')
+    tasa = _numero(parametros, 'tasa')
+    meses = _entero(parametros, 'meses')
+    if capital <= 0:
+        raise ErrorHTTP(400, "El capital debe ser mayor a cero.")
+    return capital, tasa, meses
+
+
+# ==================== ENDPOINTS ====================
+
+def cotizar(parametros: Dict[str, Any]) -> Dict[str, Any]:
+    """Cuota fija de un crédito: capital, tasa (% mensual), meses."""
+    capital, tasa, meses = _leer_cotizacion(parametros)
+    return {'cuota': _cuota_json(calcular_cuota_fija(capital, tasa, meses))}
+
+
+def cotizar_lote(parametros: Dict[str, Any]) -> Dict[str, Any]:
+    """Varias cotizaciones en una sola petición: {"cotizaciones": [{capital, tasa, meses}, ...]}."""
+    cotizaciones = parametros.get('cotizaciones')
+    if not isinstance(cotizaciones, list):
+        raise ErrorHTTP(400, "Se esperaba una lista 'cotizaciones'.")
+    if len(cotizaciones) > MAX_LOTE:
+        raise ErrorHTTP(413, f"Máximo {MAX_LOTE} cotizaciones por lote.")
+
+    cuotas = []
+    for i, cotizacion in enumerate(cotizaciones):
+        if not isinstance(cotizacion, dict):
+            raise ErrorHTTP(400, f"La cotización {i} debe ser un objeto.")
+        try:
+            capital, tasa, meses = _leer_cotizacion(cotizacion)
+        except ErrorHTTP as e:
+            raise ErrorHTTP(e.estado, f"Cotización {i}: {e}")
+        cuotas.append(_cuota_json(calcular_cuota_fija(capital, tasa, meses)))
+    return {'cuotas': cuotas}
+
+
+def tabla(parametros: Dict[str, Any]) -> Dict[str, Any]:
+    """Tabla de amortización pagando la cuota esperada cada mes."""
+    capital, tasa, meses = _leer_cotizacion(parametros)
+    try:
+        fecha_aprobacion = parse_fecha(parametros['fecha_aprobacion']) if 'fecha_aprobacion' in parametros else date.today()
+    except (TypeError, ValueError):
+        raise ErrorHTTP(400, "'fecha_aprobacion' debe tener el formato YYYY-MM-DD.")
+
+    filas = []
+    try:
+        for fila in itertools.islice(generar_tabla_amortizacion(capital, tasa, meses, fecha_aprobacion), MAX_MESES):
+            # Con entradas finitas los montos pueden desbordar; en la tabla null significa
+            # incumplimiento, así que un monto no representable es un error y no un null
+            if not all(math.isfinite(fila[campo]) for campo in ('cuota_esperada', 'pago', 'interes', 'amortizacion', 'saldo')):
+                raise ErrorHTTP(400, "Los montos de la tabla exceden el rango numérico soportado.")
+            filas.append({
+                'mes': fila['mes'],
+                'fecha_limite': fila['fecha_limite'].isoformat(),
+                'cuota_esperada': fila['cuota_esperada'],
+                'pago': fila['pago'],
+                'interes': fila['interes'],
+                'amortizacion': fila['amortizacion'],
+                'saldo': fila['saldo'],
+            })
+    except (OverflowError, ValueError):
+        # Una fecha límite pasada del año 9999
+        raise ErrorHTTP(400, "Las fechas límite de la tabla exceden el calendario soportado.")
+    return {'cuota': filas[0]['cuota_esperada'] if filas else _cuota_json(calcular_cuota_fija(capital, tasa, meses)),
+            'filas': filas}
+
+
+def mora(parametros: Dict[str, Any]) -> Dict[str, Any]:
+    """Capital tras la mora, con las mismas validaciones que `run_cli`.
+
+    Los meses de mora se dan con `meses_mora` o con `fecha_esperada` y `fecha_real`.
+    Los montos van como texto para no perder los centavos de Decimal.
+    """
+    try:
+        capital = _to_decimal(parametros['capital'])
+        tasa = _to_decimal(parametros['tasa'])
+        if 'meses_mora' in parametros:
+            meses_mora = _entero(parametros, 'meses_mora', minimo=0)
+        else:
+            meses_mora = calcular_meses_de_mora(parse_fecha(parametros['fecha_esperada']),
+                                                parse_fecha(parametros['fecha_real']))
+    except KeyError as e:
+        raise ErrorHTTP(400, f"Falta el parámetro {e}.")
+    except (InvalidOperation, TypeError, ValueError) as e:
+        raise ErrorHTTP(400, f"Entrada inválida: {e}")
+
+    if not capital.is_finite() or capital <= 0:
+        raise ErrorHTTP(400, "El capital debe ser mayor que cero.")
+    if not tasa.is_finite() or tasa < 0:
+        raise ErrorHTTP(400, "La tasa no puede ser negativa.")
+    if meses_mora > MAX_MESES:
+        raise ErrorHTTP(400, f"Máximo {MAX_MESES} meses de mora.")
+
+    incluir_historial = _verdadero(parametros, 'historial')
+    try:
+        capital_final, historial = actualizar_capital_por_meses(capital, tasa, meses_mora,
+                                                                perezoso=not incluir_historial)
+    except InvalidOperation:
+        raise ErrorHTTP(400, "El capital final excede la precisión soportada.")
+
+    respuesta = {'meses_mora': meses_mora, 'capital_final': str(capital_final)}
+    if incluir_historial:
+        respuesta['historial'] = [{campo: str(valor) if isinstance(valor, Decimal) else valor
+                                   for campo, valor in h.items()} for h in historial]
+    return respuesta
+
+
+RUTAS: Dict[str, Callable[[Dict[str, Any]], Dict[str, Any]]] = {
+    '/cotizar': cotizar,
+    '/cotizar/lote': cotizar_lote,
+    '/tabla': tabla,
+    '/mora': mora,
+}
+
+
+# ==================== PROTOCOLO HTTP/1.1 ====================
+
+def _respuesta(estado: int, cuerpo: Dict[str, Any], mantener: bool) -> bytes:
+    datos = json.dumps(cuerpo, ensure_ascii=False, allow_nan=False).encode('utf-8')
+    cabecera = (f"HTTP/1.1 {estado} {ESTADOS[estado]}\r\n"
+                f"Content-Type: application/json; charset=utf-8\r\n"
+                f"Content-Length: {len(datos)}\r\n"
+                f"Connection: {'keep-alive' if mantener else 'close'}\r\n\r\n")
+    return cabecera.encode('latin-1') + datos
+
+
+def atender(metodo: str, objetivo: str, cuerpo: bytes) -> Tuple[int, Dict[str, Any]]:
+    """Resuelve una petición ya leída y devuelve (estado, cuerpo JSON)."""
+    partes = urlsplit(objetivo)
+    manejador = RUTAS.get(partes.path)
+    if manejador is None:
+        return 404, {'error': f"Ruta desconocida: {partes.path}"}
+
+    try:
+        if metodo == 'GET':
+            parametros = dict(parse_qsl(partes.query))
+        elif metodo == 'POST':
+            try:
+                parametros = json.loads(cuerpo or b'{}')
+            except ValueError:
+                raise ErrorHTTP(400, "El cuerpo no es JSON válido.")
+            if not isinstance(parametros, dict):
+                raise ErrorHTTP(400, "El cuerpo debe ser un objeto JSON.")
+        else:
+            raise ErrorHTTP(405, f"Método no permitido: {metodo}")
+        return 200, manejador(parametros)
+    except ErrorHTTP as e:
+        return e.estado, {'error': str(e)}
+
+
+async def _leer_peticion(lector: asyncio.StreamReader):
+    """Lee una petición completa. Devuelve None si el cliente cerró la conexión."""
+    try:
+        cabecera = await asyncio.wait_for(lector.readuntil(b"\r\n\r\n"), TIEMPO_INACTIVO)
+    except (asyncio.IncompleteReadError, asyncio.TimeoutError, ConnectionError):
+        return None
+    except asyncio.LimitOverrunError:
+        raise ErrorHTTP(413, "Cabecera demasiado grande.")
+
+    lineas = cabecera.decode('latin-1').split("\r\n")
+    try:
+        metodo, objetivo, version = lineas[0].split(" ")
+    except ValueError:
+        raise ErrorHTTP(400, "Línea de petición inválida.")
+    cabeceras = {}
+    for linea in lineas[1:]:
+        if linea:
+            nombre, _, valor = linea.partition(":")
+            cabeceras[nombre.strip().lower()] = valor.strip()
+
+    try:
+        largo = int(cabeceras.get('content-length', 0))
+    except ValueError:
+        raise ErrorHTTP(400, "Content-Length inválido.")
+    if largo < 0:
+        raise ErrorHTTP(400, "Content-Length inválido.")
+    if largo > MAX_CUERPO:
+        raise ErrorHTTP(413, "Cuerpo demasiado grande.")
+    try:
+        # Un cliente que manda menos bytes de los anunciados no retiene la conexión
+        cuerpo = await asyncio.wait_for(lector.readexactly(largo), TIEMPO_INACTIVO) if largo else b''
+    except asyncio.TimeoutError:
+        return None
+
+    conexion = cabeceras.get('connection', '').lower()
+    mantener = conexion == 'keep-alive' if version == 'HTTP/1.0' else conexion != 'close'
+    return metodo, objetivo, cuerpo, mantener
+
+
+async def _conexion(lector: asyncio.StreamReader, escritor: asyncio.StreamWriter) -> None:
+    """Atiende peticiones en la misma conexión (keep-alive) hasta que se cierre."""
+    try:
+        while True:
+            try:
+                peticion = await _leer_peticion(lector)
+            except ErrorHTTP as e:
+                escritor.write(_respuesta(e.estado, {'error': str(e)}, False))
+                break
+            except asyncio.IncompleteReadError:
+                break
+            if peticion is None:
+                break
+
+            metodo, objetivo, cuerpo, mantener = peticion
+            try:
+                estado, respuesta = atender(metodo, objetivo, cuerpo)
+            except Exception as e:
+                estado, respuesta = 500, {'error': f"Error interno: {e}"}
+            escritor.write(_respuesta(estado, respuesta, mantener))
+            # Con peticiones en cadena (pipelining) solo se espera si el búfer se llenó
+            await escritor.drain()
+            if not mantener:
+                break
+    except ConnectionError:
+        pass
+    finally:
+        escritor.close()
+
+
+async def servir(host: str = '127.0.0.1', puerto: int = 8080,
+                 listo: Optional[Callable[[int], None]] = None) -> None:
+    servidor = await asyncio.start_server(_conexion, host, puerto, limit=MAX_CABECERA)
+    if listo is not None:
+        listo(servidor.sockets[0].getsockname()[1])
+    async with servidor:
+        await servidor.serve_forever()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Servicio HTTP de cotización de créditos.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--puerto", type=int, default=8080)
+    args = parser.parse_args()
+
+    def anunciar(puerto):
+        print(f"Escuchando en http://{args.host}:{puerto}", flush=True)
+
+    try:
+        asyncio.run(servir(args.host, args.puerto, anunciar))
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,233 @@
+import argparse
+from typing import Any, Dict, Iterator, Optional
+
+import numpy as np
+
+from main import calcular_cuota_fija
+
+# =================================================================
+# Archivo: simulacion_mora.py
+# Propósito: Monte Carlo de incumplimientos y pagos parciales para provisiones
+# =================================================================
+
+# Cada camino es la misma simulación que `generar_tabla_amortizacion`, pero el
+# pago de cada mes se sortea: incumplimiento total (None), pago parcial de una
+# fracción de la cuota esperada, o la cuota completa. Los caminos se simulan en
+# bloques vectorizados y el saldo final se resume en un histograma de bordes
+# fijos (sumable entre bloques), así que la memoria no depende del número de caminos.
+
+TAMANO_BLOQUE = 250_000
+MAX_MESES = 600
+CENTAVO = 0.01
+ERROR_RELATIVO_SALDO = 0.001  # error máximo de los percentiles de saldo tomados del histograma
+
+# ==================== FUNCIONES DE CÁLCULO ====================
+
+def _por_mes(probabilidad, max_meses: int, nombre: str) -> np.ndarray:
+    """Escalar o arreglo (una probabilidad por mes) -> arreglo de largo `max_meses`."""
+    valores = np.asarray(probabilidad, dtype=np.float64)
+    if valores.ndim > 1 or valores.size == 0:
+        raise ValueError(f"{nombre} debe ser un número o una lista no vacía de probabilidades por mes")
+    if valores.ndim == 0:
+        valores = np.full(max_meses, float(valores))
+    elif valores.shape[0] < max_meses:
+        # Pasado el último mes indicado se repite la última probabilidad
+        valores = np.concatenate([valores, np.full(max_meses - valores.shape[0], valores[-1])])
+    valores = valores[:max_meses]
+    if not ((valores >= 0) & (valores <= 1)).all():
+        raise ValueError(f"{nombre} debe estar entre 0 y 1")
+    return valores
+
+
+def _cuota_caminos(saldo: np.ndarray, tasa: float, meses_restantes: int) -> np.ndarray:
+    """`calcular_cuota_fija` para todos los caminos de un mes, bit a bit igual a la escalar."""
+    if tasa / 100 == 0:
+        return np.where(saldo > 0, saldo / meses_restantes, 0.0)
+    # Con capital 1 la versión escalar devuelve el factor (o 1 si el denominador es 0)
+    factor = calcular_cuota_fija(1.0, tasa, meses_restantes)
+    with np.errstate(invalid='ignore'):
+        return np.where(saldo > 0, np.maximum(saldo * factor, 0), 0.0)
+
+
+def _simular_bloque(capital: float, tasa: float, plazo: int, prob_incumplimiento: np.ndarray,
+                    prob_parcial: np.ndarray, fraccion_parcial: float, caminos: int,
+                    rng: np.random.Generator) -> Dict[str, np.ndarray]:
+    """Simula `caminos` caminos de un crédito hasta liquidarlos o llegar a `len(prob_incumplimiento)` meses."""
+    saldo = np.full(caminos, float(capital))
+    capitalizado = np.zeros(caminos)
+    meses = np.zeros(caminos, dtype=np.int64)
+    tasa_decimal = tasa / 100
+
+    for mes in range(1, prob_incumplimiento.shape[0] + 1):
+        activo = saldo > 0
+        if not activo.any():
+            break
+        meses[activo] = mes
+
+        # Un sorteo por camino y mes: [0, p_inc) incumple, [p_inc, p_inc + p_parcial) paga parcial
+        sorteo = rng.random(caminos)
+        incumple = sorteo < prob_incumplimiento[mes - 1]
+        parcial = ~incumple & (sorteo < prob_incumplimiento[mes - 1] + prob_parcial[mes - 1])
+
+        cuota = _cuota_caminos(saldo, tasa, plazo - mes + 1 if mes <= plazo else 1)
+        pago = np.where(parcial, cuota * fraccion_parcial, cuota)
+
+        # Mismas reglas que `aplicar_pago_mensual`
+        interes_periodo = saldo * tasa_decimal
+        capitalizado += np.where(incumple, interes_periodo, np.maximum(interes_periodo - pago, 0.0))
+        saldo = np.where(incumple, saldo + interes_periodo,
+                         np.where(pago < interes_periodo, saldo + (interes_periodo - pago),
+                                  saldo - (pago - interes_periodo)))
+        saldo = np.where(saldo < 0, 0.0, saldo)
+
+    return {'meses': meses, 'liquidado': saldo <= 0, 'saldo_final': saldo, 'capitalizado': capitalizado}
+
+
+def bordes_saldo(capital: float, tasa: float, max_meses: int,
+                 error_relativo: float = ERROR_RELATIVO_SALDO) -> np.ndarray:
+    """
+    Bordes del histograma de saldo final: [0, un centavo) y luego intervalos
+    geométricos de razón (1 + e) / (1 - e) hasta el saldo de no pagar nunca.
+
+    Ningún camino supera `capital * (1 + tasa) ** max_meses`, así que el número
+    de intervalos depende solo del crédito y del horizonte, no de los caminos.
+    """
+    razon = np.log((1 + error_relativo) / (1 - error_relativo))
+    log_maximo = min(np.log(capital) + max_meses * np.log1p(max(tasa, 0.0) / 100), np.log(np.finfo(np.float64).max))
+    intervalos = max(int(np.ceil((log_maximo - np.log(CENTAVO)) / razon)), 1)
+    return np.concatenate([[0.0], CENTAVO * np.exp(razon * np.arange(intervalos + 1))])
+
+
+def histograma_saldo(saldo: np.ndarray, bordes: np.ndarray) -> np.ndarray:
+    """Caminos por intervalo de `bordes`; lo que no cabe (inf, NaN) cuenta en el último."""
+    indice = np.clip(np.searchsorted(bordes, saldo, side='right') - 1, 0, bordes.size - 2)
+    return np.bincount(indice, minlength=bordes.size - 1)
+
+
+def simular_caminos(capital: float, tasa: float, plazo: int, prob_incumplimiento, prob_parcial=0.0,
+                    fraccion_parcial: float = 0.5, caminos: int = 100_000, max_meses: int = MAX_MESES,
+                    semilla: Optional[int] = None, tamano_bloque: int = TAMANO_BLOQUE) -> Iterator[Dict[str, np.ndarray]]:
+    """
+    Genera los resultados por camino, un bloque de a lo sumo `tamano_bloque` caminos a la vez.
+
+    `prob_incumplimiento` y `prob_parcial` son escalares o una probabilidad por
+    mes (desde el mes 1). Un pago parcial es `fraccion_parcial` de la cuota
+    esperada. Cada bloque usa su propio flujo aleatorio derivado de `semilla`,
+    así que con la misma semilla y el mismo tamaño de bloque el resultado se repite.
+
+    Cada bloque trae, por camino: meses simulados (el mes de liquidación si
+    `liquidado`), saldo final capitalizado e interés capitalizado acumulado.
+    """
+    # Se valida al llamar, no al pedir el primer bloque
+    if not capital > 0 or plazo <= 0 or caminos < 0 or max_meses <= 0:
+        raise ValueError("El capital, el plazo y el horizonte deben ser mayores a cero")
+    if not 0 <= fraccion_parcial <= 1:
+        raise ValueError("fraccion_parcial debe estar entre 0 y 1")
+    if tamano_bloque <= 0:
+        raise ValueError("tamano_bloque debe ser mayor a cero")
+    incumplimiento = _por_mes(prob_incumplimiento, max_meses, "prob_incumplimiento")
+    parcial = _por_mes(prob_parcial, max_meses, "prob_parcial")
+    if (incumplimiento + parcial > 1).any():
+        raise ValueError("prob_incumplimiento + prob_parcial no puede superar 1")
+    return _bloques(capital, tasa, plazo, incumplimiento, parcial, fraccion_parcial, caminos, semilla, tamano_bloque)
+
+
+def _bloques(capital: float, tasa: float, plazo: int, incumplimiento: np.ndarray, parcial: np.ndarray,
+             fraccion_parcial: float, caminos: int, semilla: Optional[int],
+             tamano_bloque: int) -> Iterator[Dict[str, np.ndarray]]:
+    num_bloques = -(-caminos // tamano_bloque)
+    flujos = np.random.SeedSequence(semilla).spawn(num_bloques)
+    for k, flujo in enumerate(flujos):
+        n = min(tamano_bloque, caminos - k * tamano_bloque)
+        yield _simular_bloque(capital, tasa, plazo, incumplimiento, parcial, fraccion_parcial, n,
+                              np.random.default_rng(flujo))
+
+
+def simular_mora(capital: float, tasa: float, plazo: int, prob_incumplimiento, prob_parcial=0.0,
+                 fraccion_parcial: float = 0.5, caminos: int = 100_000, max_meses: int = MAX_MESES,
+                 semilla: Optional[int] = None, tamano_bloque: int = TAMANO_BLOQUE,
+                 guardar_saldos: bool = False) -> Dict[str, Any]:
+    """
+    Distribuciones de meses hasta liquidar y de saldo final sobre `caminos` caminos.
+
+    - histograma_meses[m]: caminos liquidados exactamente en el mes m
+    - histograma_saldo[k]: caminos con saldo final en [bordes_saldo[k], bordes_saldo[k + 1])
+    - capitalizado_medio: interés promedio sumado al saldo por mora o pagos parciales
+    - saldo_final: saldo de cada camino, ordenado (solo con `guardar_saldos`, ocupa O(caminos))
+
+    Los caminos sin liquidar en `max_meses` cuentan en `caminos - liquidados`.
+    """
+    bloques = simular_caminos(capital, tasa, plazo, prob_incumplimiento, prob_parcial, fraccion_parcial,
+                              caminos, max_meses, semilla, tamano_bloque)
+    histograma = np.zeros(max_meses + 1, dtype=np.int64)
+    bordes = bordes_saldo(capital, tasa, max_meses)
+    saldo_hist = np.zeros(bordes.size - 1, dtype=np.int64)
+    saldos = []
+    capitalizado = 0.0
+    for bloque in bloques:
+        histograma += np.bincount(bloque['meses'][bloque['liquidado']], minlength=max_meses + 1)
+        saldo_hist += histograma_saldo(bloque['saldo_final'], bordes)
+        capitalizado += float(bloque['capitalizado'].sum())
+        if guardar_saldos:
+            saldos.append(bloque['saldo_final'])
+
+    resultado = {
+        'caminos': caminos,
+        'liquidados': int(histograma.sum()),
+        'histograma_meses': histograma,
+        'histograma_saldo': saldo_hist,
+        'bordes_saldo': bordes,
+        'capitalizado_medio': capitalizado / caminos if caminos else 0.0,
+    }
+    if guardar_saldos:
+        resultado['saldo_final'] = np.sort(np.concatenate(saldos)) if saldos else np.zeros(0)
+    return resultado
+
+
+def percentil_meses(histograma: np.ndarray, q: float) -> Optional[int]:
+    """Mes en el que se alcanza el percentil `q` (0-100) de los caminos del histograma."""
+    acumulado = np.cumsum(histograma)
+    if not acumulado.size or acumulado[-1] == 0:
+        return None
+    return int(np.searchsorted(acumulado, acumulado[-1] * q / 100))
+
+
+def percentil_saldo(histograma: np.ndarray, bordes: np.ndarray, q: float) -> Optional[float]:
+    """
+    Percentil `q` (0-100) del saldo final a partir de su histograma.
+
+    Difiere del saldo del primer camino ordenado que alcanza `q` en menos de
+    `ERROR_RELATIVO_SALDO` relativo, o de un centavo si el saldo es menor.
+    """
+    acumulado = np.cumsum(histograma)
+    if not acumulado.size or acumulado[-1] == 0:
+        return None
+    k = int(np.searchsorted(acumulado, acumulado[-1] * q / 100))
+    if k == 0:
+        return 0.0
+    # Media armónica de los bordes: el mismo error relativo hacia ambos lados
+    return float(2 * bordes[k] * bordes[k + 1] / (bordes[k] + bordes[k + 1]))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Simulación Monte Carlo de mora para un crédito.")
+    parser.add_argument("capital", type=float)
+    parser.add_argument("tasa", type=float, help="interés mensual (%%)")
+    parser.add_argument("plazo", type=int, help="meses del plazo original")
+    parser.add_argument("--prob-incumplimiento", type=float, default=0.05)
+    parser.add_argument("--prob-parcial", type=float, default=0.10)
+    parser.add_argument("--fraccion-parcial", type=float, default=0.5)
+    parser.add_argument("--caminos", type=int, default=1_000_000)
+    parser.add_argument("--max-meses", type=int, default=MAX_MESES)
+    parser.add_argument("--semilla", type=int, default=None)
+    args = parser.parse_args()
+
+    resultado = simular_mora(args.capital, args.tasa, args.plazo, args.prob_incumplimiento, args.prob_parcial,
+                             args.fraccion_parcial, args.caminos, args.max_meses, args.semilla)
+    print(f"Caminos: {resultado['caminos']:,} | Liquidados: {resultado['liquidados']:,}")
+    for q in (50, 90, 99):
+        print(f"Meses hasta liquidar p{q}: {percentil_meses(resultado['histograma_meses'], q)}")
+    if resultado['caminos']:
+        p50, p99 = (percentil_saldo(resultado['histograma_saldo'], resultado['bordes_saldo'], q) for q in (50, 99))
+        print(f"Saldo final p50/p99: ${p50:,.2f} / ${p99:,.2f}")
+    print(f"Interés capitalizado promedio: ${resultado['capitalizado_medio']:,.2f}")
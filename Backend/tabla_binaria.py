@@ -0,0 +1,214 @@
+import argparse
+import itertools
+import math
+import struct
+from datetime import date
+from typing import Any, Callable, Dict, Iterable, Iterator, Optional, Tuple
+
+import numpy as np
+
+from main import _pagar_cuota_esperada, generar_tabla_amortizacion
+
+# =========================================
+#   TABLAS DE AMORTIZACIÓN EN FORMATO BINARIO (MMAP)
+# =========================================
+#
+# Archivo = cabecera (64 bytes) + filas de ancho fijo + índice ordenado por préstamo.
+#
+#   cabecera: MAGIA, versión, id_minimo, cantidad de préstamos, filas, offset del índice
+#   filas:    una por mes, montos en centavos int64 y fecha límite en días desde 1970 (int32)
+#   índice:   una entrada por préstamo, ordenada por id: id, primera fila, capital y meses
+#
+# El índice ocupa lo mismo sin importar cuán dispersos sean los ids. Un préstamo
+# se encuentra con búsqueda binaria sobre la columna de ids del mmap (O(log n),
+# solo se tocan unas pocas páginas); si los ids son consecutivos la posición es
+# `prestamo_id - id_minimo`, O(1). El mes N es luego aritmética sobre el mmap.
+
+MAGIA = b"TABLAMOR"
+VERSION = 2
+CABECERA = struct.Struct("<8sIxxxxqqqq")
+TAMANO_CABECERA = 64
+SIN_PAGO = np.iinfo(np.int64).min  # pago None (incumplimiento)
+EPOCA = date(1970, 1, 1).toordinal()
+MAX_MESES = 1200
+
+FILA = np.dtype([
+    ('saldo', '<i8'),
+    ('cuota_esperada', '<i8'),
+    ('pago', '<i8'),
+    ('interes', '<i8'),
+    ('amortizacion', '<i8'),
+    ('fecha_limite', '<i4'),
+    ('es_plazo_extra', '<i4'),
+])
+ENTRADA = np.dtype([('prestamo_id', '<i8'), ('primera_fila', '<i8'), ('capital', '<i8'), ('meses', '<i4'),
+                    ('_reservado', '<i4')])
+
+
+def _centavos(valor: float, campo: str) -> int:
+    """Monto en centavos int64; los no finitos o fuera de rango se rechazan con un mensaje claro."""
+    if not math.isfinite(valor):
+        raise ValueError(f"{campo} no es un monto finito: {valor}")
+    centavos = int(round(valor * 100))
+    if not SIN_PAGO < centavos < 2**63:
+        raise ValueError(f"{campo} no cabe en centavos int64: {valor}")
+    return centavos
+
+
+class EscritorTablas:
+    """Escribe las tablas préstamo por préstamo, en streaming; el índice se escribe al cerrar."""
+
+    def __init__(self, ruta: str):
+        self._archivo = open(ruta, "wb")
+        self._archivo.write(b"\0" * TAMANO_CABECERA)
+        self._entradas: Dict[int, Tuple[int, int, int]] = {}
+        self._filas = 0
+
+    def agregar(self, prestamo_id: int, capital: float, filas: Iterable[Dict[str, Any]]) -> int:
+        """Agrega la tabla de un préstamo (filas de `generar_tabla_amortizacion`). Devuelve sus meses."""
+        if prestamo_id in self._entradas:
+            raise ValueError(f"Préstamo repetido: {prestamo_id}")
+        if not -2**63 <= prestamo_id < 2**63:
+            raise ValueError(f"El id {prestamo_id} no cabe en int64")
+
+        # Se valida todo antes de escribir: un préstamo inválido no deja filas huérfanas
+        capital_centavos = _centavos(capital, f"Préstamo {prestamo_id}: capital")
+        registros = []
+        for fila in filas:
+            mes = f"Préstamo {prestamo_id}, mes {fila['mes']}"
+            pago = fila['pago']
+            registros.append((
+                _centavos(fila['saldo'], f"{mes}: saldo"), _centavos(fila['cuota_esperada'], f"{mes}: cuota_esperada"),
+                SIN_PAGO if pago is None else _centavos(pago, f"{mes}: pago"),
+                _centavos(fila['interes'], f"{mes}: interes"), _centavos(fila['amortizacion'], f"{mes}: amortizacion"),
+                fila['fecha_limite'].toordinal() - EPOCA, int(fila['es_plazo_extra']),
+            ))
+        self._archivo.write(np.array(registros, dtype=FILA).tobytes())
+        self._entradas[prestamo_id] = (self._filas, capital_centavos, len(registros))
+        self._filas += len(registros)
+        return len(registros)
+
+    def cerrar(self) -> None:
+        id_minimo = min(self._entradas, default=0)
+        ids = len(self._entradas)
+        indice = np.array([(prestamo_id, *self._entradas[prestamo_id], 0) for prestamo_id in sorted(self._entradas)],
+                          dtype=ENTRADA)
+
+        offset_indice = self._archivo.tell()
+        self._archivo.write(indice.tobytes())
+        self._archivo.seek(0)
+        self._archivo.write(CABECERA.pack(MAGIA, VERSION, id_minimo, ids, self._filas, offset_indice))
+        self._archivo.close()
+
+    def __enter__(self) -> 'EscritorTablas':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.cerrar()
+
+
+def escribir_tablas(ruta: str, prestamos: Iterable[Tuple[int, float, float, int, date]],
+                    obtener_pago: Optional[Callable[..., Optional[float]]] = None,
+                    max_meses: int = MAX_MESES) -> int:
+    """Genera y guarda la tabla de cada préstamo (prestamo_id, capital, tasa, plazo, fecha_aprobacion).
+
+    `obtener_pago(prestamo_id, mes, saldo, cuota_esperada, fecha_limite, es_plazo_extra)`
+    decide los pagos; por defecto se paga la cuota esperada. Cada tabla se
+    corta en `max_meses` meses. Devuelve el total de filas escritas.
+    """
+    total = 0
+    with EscritorTablas(ruta) as escritor:
+        for prestamo_id, capital, tasa, plazo, aprobacion in prestamos:
+            pagar = _pagar_cuota_esperada
+            if obtener_pago is not None:
+                def pagar(*estado_mes, _id=prestamo_id):
+                    return obtener_pago(_id, *estado_mes)
+            filas = generar_tabla_amortizacion(capital, tasa, plazo, aprobacion, pagar)
+            total += escritor.agregar(prestamo_id, capital, itertools.islice(filas, max_meses))
+    return total
+
+
+class TablaBinaria:
+    """Lectura de un archivo de tablas con `numpy.memmap`: solo se tocan las páginas consultadas."""
+
+    def __init__(self, ruta: str):
+        with open(ruta, "rb") as archivo:
+            magia, version, self.id_minimo, ids, filas, offset_indice = CABECERA.unpack(archivo.read(CABECERA.size))
+        if magia != MAGIA or version != VERSION:
+            raise ValueError(f"{ruta} no es un archivo de tablas (versión {VERSION})")
+
+        self.filas = np.memmap(ruta, dtype=FILA, mode='r', offset=TAMANO_CABECERA, shape=(filas,)) \
+            if filas else np.empty(0, dtype=FILA)
+        self.indice = np.memmap(ruta, dtype=ENTRADA, mode='r', offset=offset_indice, shape=(ids,)) \
+            if ids else np.empty(0, dtype=ENTRADA)
+        self._ids = self.indice['prestamo_id']
+        self._consecutivos = ids > 0 and int(self._ids[-1]) - self.id_minimo + 1 == ids
+
+    def _entrada(self, prestamo_id: int):
+        if self._consecutivos:
+            posicion = prestamo_id - self.id_minimo
+        elif -2**63 <= prestamo_id < 2**63:
+            posicion = int(np.searchsorted(self._ids, prestamo_id))
+        else:
+            raise KeyError(prestamo_id)
+        if not 0 <= posicion < len(self.indice) or self._ids[posicion] != prestamo_id:
+            raise KeyError(prestamo_id)
+        return self.indice[posicion]
+
+    def __contains__(self, prestamo_id: int) -> bool:
+        try:
+            self._entrada(prestamo_id)
+        except KeyError:
+            return False
+        return True
+
+    def meses(self, prestamo_id: int) -> int:
+        return int(self._entrada(prestamo_id)['meses'])
+
+    def saldo_centavos(self, prestamo_id: int, mes: int) -> int:
+        """Saldo al cierre del mes `mes` (0 = capital inicial; pasado el último mes, el saldo final)."""
+        entrada = self._entrada(prestamo_id)
+        if mes <= 0 or entrada['meses'] == 0:
+            return int(entrada['capital'])
+        return int(self.filas[entrada['primera_fila'] + min(mes, entrada['meses']) - 1]['saldo'])
+
+    def saldo(self, prestamo_id: int, mes: int) -> float:
+        return self.saldo_centavos(prestamo_id, mes) / 100
+
+    def fila(self, prestamo_id: int, mes: int) -> Dict[str, Any]:
+        """El mes `mes` (desde 1) con las claves de `generar_tabla_amortizacion`, en pesos y fechas."""
+        entrada = self._entrada(prestamo_id)
+        if not 1 <= mes <= entrada['meses']:
+            raise IndexError(f"El préstamo {prestamo_id} tiene {entrada['meses']} meses")
+        registro = self.filas[entrada['primera_fila'] + mes - 1]
+        pago = int(registro['pago'])
+        return {
+            'mes': mes,
+            'fecha_limite': date.fromordinal(EPOCA + int(registro['fecha_limite'])),
+            'cuota_esperada': int(registro['cuota_esperada']) / 100,
+            'es_plazo_extra': bool(registro['es_plazo_extra']),
+            'pago': None if pago == SIN_PAGO else pago / 100,
+            'interes': int(registro['interes']) / 100,
+            'amortizacion': int(registro['amortizacion']) / 100,
+            'saldo': int(registro['saldo']) / 100,
+        }
+
+    def tabla(self, prestamo_id: int) -> np.ndarray:
+        """Vista (sin copia) de todas las filas del préstamo."""
+        entrada = self._entrada(prestamo_id)
+        return self.filas[entrada['primera_fila']:entrada['primera_fila'] + entrada['meses']]
+
+    def __iter__(self) -> Iterator[int]:
+        for prestamo_id in self._ids:
+            yield int(prestamo_id)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Consulta el saldo de un préstamo en un mes.")
+    parser.add_argument("archivo", help="archivo de tablas")
+    parser.add_argument("prestamo_id", type=int)
+    parser.add_argument("mes", type=int)
+    args = parser.parse_args()
+
+    tablas = TablaBinaria(args.archivo)
+    print(tablas.fila(args.prestamo_id, args.mes))
@@ -0,0 +1,94 @@
+import argparse
+import ast
+import subprocess
+import sys
+from pathlib import Path
+
+# =================================================================
+# Archivo: bench_arranque.py
+# Propósito: Medir con `-X importtime` lo que cuesta importar cada punto de entrada
+# =================================================================
+
+RAIZ = Path(__file__).resolve().parent.parent
+
+# (carpeta, archivo, modo): con 'modulo' se importa el archivo completo; con
+# 'cabecera' solo sus imports de nivel superior, porque al importarlo se abriría
+# la ventana de Tk.
+PUNTOS_DE_ENTRADA = [
+    ("Backend", "main.py", "modulo"),
+    ("Backend", "replay_pagos.py", "modulo"),
+    ("Backend", "portafolio_paralelo.py", "modulo"),
+    ("Extras", "main_mejorado.py", "modulo"),
+    ("Extras", "reporte_pdf.py", "modulo"),
+    ("Extras", "calculadora_credito_tkinter.py", "cabecera"),
+    ("Extras", "calculadora_credito_tkinter_pdf.py", "cabecera"),
+]
+
+# El núcleo de cálculo debe poder importarse sin ninguna de estas dependencias.
+NUCLEO = ["main", "main_mejorado", "dinero", "fechas_mora", "historial", "mora_float", "tabla_tk", "tareas_tk",
+          "cache_resultados"]
+PESADOS = ("tkinter", "matplotlib", "reportlab", "numpy")
+MARCA = "--- inicio ---"
+
+
+def imports_de_cabecera(ruta: Path) -> str:
+    """Solo las sentencias import de nivel superior del archivo."""
+    arbol = ast.parse(ruta.read_text(encoding="utf-8"))
+    return "\n".join(ast.unparse(nodo) for nodo in arbol.body if isinstance(nodo, (ast.Import, ast.ImportFrom)))
+
+
+def medir_imports(carpetas, codigo: str):
+    """Ejecuta `codigo` en un intérprete nuevo y devuelve (microsegundos, módulos cargados).
+
+    Solo se cuentan los imports posteriores al arranque del intérprete.
+    """
+    preludio = "import sys\n"
+    preludio += "".join(f"sys.path.insert(0, {str(RAIZ / c)!r})\n" for c in carpetas)
+    preludio += f"sys.stderr.write({MARCA + chr(10)!r}); sys.stderr.flush()\n"
+    proceso = subprocess.run([sys.executable, "-X", "importtime", "-c", preludio + codigo],
+                             capture_output=True, text=True)
+    if proceso.returncode != 0:
+        raise SystemExit(proceso.stderr.strip().splitlines()[-1])
+
+    lineas = proceso.stderr.split(MARCA + "\n", 1)[1].splitlines()
+    total = 0
+    modulos = set()
+    for linea in lineas:
+        if not linea.startswith("import time:") or "|" not in linea:
+            continue
+        _, acumulado, paquete = linea[len("import time:"):].split("|")
+        if not acumulado.strip().isdigit():
+            continue
+        modulos.add(paquete.strip())
+        if not paquete.startswith("  "):
+            # Import de primer nivel: su tiempo acumulado ya incluye a sus dependencias
+            total += int(acumulado)
+    return total, modulos
+
+
+def pesados_cargados(modulos):
+    return sorted({m.split(".")[0] for m in modulos if m.split(".")[0] in PESADOS})
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark del tiempo de arranque (imports) por punto de entrada")
+    parser.add_argument("--repeticiones", type=int, default=5)
+    args = parser.parse_args()
+
+    _, modulos = medir_imports(["Backend", "Extras"], "\n".join(f"import {m}" for m in NUCLEO))
+    cargados = pesados_cargados(modulos)
+    if cargados:
+        raise SystemExit(f"El núcleo de cálculo importa dependencias pesadas: {', '.join(cargados)}")
+
+    print(f"{'Punto de entrada':<52} | {'Imports (ms)':>12} | Dependencias pesadas al arrancar")
+    for carpeta, archivo, modo in PUNTOS_DE_ENTRADA:
+        ruta = RAIZ / carpeta / archivo
+        codigo = f"import {ruta.stem}" if modo == "modulo" else imports_de_cabecera(ruta)
+        # Nos quedamos con la mejor repetición (menos ruido del sistema de archivos)
+        mejor, modulos = min(medir_imports([carpeta], codigo) for _ in range(args.repeticiones))
+        nombre = f"{carpeta}/{archivo}" + (" (imports)" if modo == "cabecera" else "")
+        print(f"{nombre:<52} | {mejor / 1000:>12.1f} | {', '.join(pesados_cargados(modulos)) or '-'}")
+
+
+if __name__ == "__main__":
+    main()
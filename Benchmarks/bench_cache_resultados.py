@@ -0,0 +1,131 @@
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, timedelta
+from decimal import Decimal
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "Extras"))
+
+from cache_resultados import CacheResultados, _a_json, _desde_json, cotizar_mora, normalizar_consulta
+from dinero import Dinero
+from main_mejorado import actualizar_capital_por_meses
+from mora_float import actualizar_capital_por_meses as actualizar_capital_float
+
+# =================================================================
+# Archivo: bench_cache_resultados.py
+# Propósito: Tasa de aciertos y latencia de la caché de resultados con re-cotizaciones
+# =================================================================
+
+
+def generar_consultas(n: int, distintas: int, semilla: int = 11):
+    """Consultas con popularidad tipo Zipf; la misma consulta aparece escrita de varias formas."""
+    rng = random.Random(semilla)
+    base = []
+    for _ in range(distintas):
+        esperada = date(2023, 1, 1) + timedelta(days=rng.randrange(365))
+        real = esperada + timedelta(days=rng.randrange(0, 1500))
+        base.append((rng.randrange(10_000, 5_000_000) / 100, rng.choice([1, 1.5, 2, 2.5, 3]), esperada, real))
+    pesos = [1 / (k + 1) for k in range(distintas)]
+    consultas = []
+    for capital, tasa, esperada, real in rng.choices(base, pesos, k=n):
+        forma = rng.randrange(3)
+        if forma == 0:
+            consultas.append((f"{capital:.2f}".replace('.', ','), str(tasa), esperada.isoformat(), real.isoformat()))
+        elif forma == 1:
+            consultas.append((f" {capital:.2f} ", f"{tasa:.2f}", f" {esperada.isoformat()}", real.isoformat()))
+        else:
+            consultas.append((Decimal(f"{capital:.2f}"), Decimal(str(tasa)), esperada, real))
+    return consultas
+
+
+def verificar(consultas, cache):
+    """Lo devuelto por la caché es lo mismo que recalcular la consulta."""
+    for consulta in consultas:
+        meses, capital_final, historial = cache.obtener(*consulta)
+        esperado = cotizar_mora(*normalizar_consulta(*consulta))
+        if (meses, capital_final, list(historial)) != (esperado[0], esperado[1], list(esperado[2])):
+            raise SystemExit(f"La caché difiere del cálculo para {consulta}")
+
+
+def verificar_formato_disco():
+    """Ida y vuelta del formato en disco para los tres tipos de historial."""
+    casos = [
+        actualizar_capital_por_meses(Decimal('1500.55'), Decimal('2.5'), 40),
+        actualizar_capital_por_meses(Dinero(150055), Decimal('2.5'), 40),
+        actualizar_capital_float(1500.55, 2.5, 40),
+        actualizar_capital_por_meses(Decimal('9' * 18), Decimal('50'), 12),  # columnas fuera de int64
+    ]
+    for capital_final, historial in casos:
+        leido = _desde_json(_a_json((capital_final, historial)))
+        if leido[0] != capital_final or list(leido[1]) != list(historial):
+            raise SystemExit(f"El formato en disco no conserva un historial {historial.tipo}")
+
+
+def medir(consultas, cache):
+    inicio = time.perf_counter()
+    for consulta in consultas:
+        cache.obtener(*consulta)
+    return time.perf_counter() - inicio
+
+
+def _proceso(ruta, consultas):
+    with CacheResultados(ruta_disco=ruta) as cache:
+        tiempo = medir(consultas, cache)
+        return tiempo, cache.estadisticas()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de la caché de resultados")
+    parser.add_argument("--consultas", type=int, default=20_000)
+    parser.add_argument("--distintas", type=int, default=2_000)
+    parser.add_argument("--procesos", type=int, default=4)
+    args = parser.parse_args()
+
+    consultas = generar_consultas(args.consultas, args.distintas)
+    verificar_formato_disco()
+    verificar(consultas[:500], CacheResultados(max_entradas=64))
+
+    # Sin caché: cada consulta se normaliza y se recalcula
+    inicio = time.perf_counter()
+    for consulta in consultas:
+        cotizar_mora(*normalizar_consulta(*consulta))
+    t_sin = time.perf_counter() - inicio
+
+    filas = [("sin caché", t_sin, None)]
+    for max_entradas in (256, 4096):
+        cache = CacheResultados(max_entradas=max_entradas)
+        filas.append((f"memoria ({max_entradas})", medir(consultas, cache), cache.estadisticas()))
+
+    with tempfile.TemporaryDirectory() as carpeta:
+        ruta = os.path.join(carpeta, "cache.db")
+        with CacheResultados(max_entradas=256, ruta_disco=ruta) as cache:
+            filas.append(("memoria+disco", medir(consultas, cache), cache.estadisticas()))
+
+        # Procesos nuevos (memoria vacía) que comparten el disco ya poblado
+        with ProcessPoolExecutor(max_workers=args.procesos) as ejecutor:
+            partes = [consultas[k::args.procesos] for k in range(args.procesos)]
+            resultados = list(ejecutor.map(_proceso, [ruta] * args.procesos, partes))
+        estadisticas = {clave: sum(r[1][clave] for r in resultados)
+                        for clave in ('aciertos_memoria', 'aciertos_disco', 'fallos', 'vencidos', 'desalojos')}
+        consultados = estadisticas['aciertos_memoria'] + estadisticas['aciertos_disco'] + estadisticas['fallos']
+        estadisticas['tasa_aciertos'] = (estadisticas['aciertos_memoria'] + estadisticas['aciertos_disco']) / consultados
+        filas.append((f"{args.procesos} procesos", max(r[0] for r in resultados) * args.procesos, estadisticas))
+
+    print(f"{args.consultas:,} consultas, {args.distintas:,} distintas (verificadas contra el cálculo directo)")
+    print(f"{'Variante':<16} | {'µs/consulta':>11} | {'Aciertos':>8} | {'Memoria':>8} | {'Disco':>8} | {'Desalojos':>9}")
+    for nombre, tiempo, estadisticas in filas:
+        if estadisticas is None:
+            print(f"{nombre:<16} | {tiempo * 1e6 / len(consultas):>11.1f} | {'-':>8} | {'-':>8} | {'-':>8} | {'-':>9}")
+            continue
+        print(f"{nombre:<16} | {tiempo * 1e6 / len(consultas):>11.1f} | {estadisticas['tasa_aciertos']:>8.1%} | "
+              f"{estadisticas['aciertos_memoria']:>8,} | {estadisticas['aciertos_disco']:>8,} | "
+              f"{estadisticas['desalojos']:>9,}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "Backend"))
+
+from main import sumar_un_mes
+from calendario import fecha_limite, fechas_limite_lote
+
+# =================================================================
+# Archivo: bench_calendario.py
+# Propósito: Comparar `sumar_un_mes` encadenado contra el índice de fechas (verificado en tests/)
+# =================================================================
+
+
+def generar_cartera(n: int, fechas_distintas: int, semilla: int = 12345):
+    """Fechas de aprobación compartidas por muchos créditos y el mes a consultar."""
+    rng = np.random.default_rng(semilla)
+    base = np.datetime64('2015-01-01') + rng.integers(0, 3650, fechas_distintas)
+    fechas = base[rng.integers(0, fechas_distintas, n)]
+    meses = rng.integers(1, 121, n)
+    return fechas, meses
+
+
+def encadenado(fechas, meses):
+    resultado = []
+    for f, n in zip(fechas.tolist(), meses.tolist()):
+        for _ in range(n):
+            f = sumar_un_mes(f)
+        resultado.append(f)
+    return resultado
+
+
+def escalar_cacheado(fechas, meses):
+    return [fecha_limite(f, n) for f, n in zip(fechas.tolist(), meses.tolist())]
+
+
+def medir(funcion, *args):
+    inicio = time.perf_counter()
+    resultado = funcion(*args)
+    return resultado, time.perf_counter() - inicio
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark del índice de fechas límite")
+    parser.add_argument("--creditos", type=int, nargs="+", default=[10_000, 100_000])
+    parser.add_argument("--fechas-distintas", type=int, default=500)
+    args = parser.parse_args()
+
+    print(f"{'Créditos':>10} | {'Encadenado (s)':>14} | {'Caché escalar (s)':>17} | {'Vectorizado (s)':>15}")
+    for n in args.creditos:
+        fechas, meses = generar_cartera(n, args.fechas_distintas)
+        fecha_limite.cache_clear()
+        _, t_cadena = medir(encadenado, fechas, meses)
+        _, t_cache = medir(escalar_cacheado, fechas, meses)
+        _, t_vector = medir(fechas_limite_lote, fechas, meses)
+
+        print(f"{n:>10,} | {t_cadena:>14.3f} | {t_cache:>17.3f} | {t_vector:>15.4f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "Backend"))
+
+from main import calcular_cuota_fija
+from cuota_lote import calcular_cuota_fija_lote, calcular_cuota_fija_tabla
+
+# =================================================================
+# Archivo: bench_cuota_fija.py
+# Propósito: Comparar el bucle escalar contra la versión vectorizada
+# =================================================================
+
+
+def generar_cartera(n: int, semilla: int = 12345):
+    """Cartera sintética con algunos casos especiales mezclados."""
+    rng = np.random.default_rng(semilla)
+    capital = rng.uniform(500, 500_000, n).round(2)
+    tasa = rng.choice([0.0, 0.9, 1.5, 2.2, 3.1, 4.5], n)
+    meses = rng.choice([0, 6, 12, 24, 36, 60, 120, 480], n)
+    capital[rng.random(n) < 0.01] = 0
+    return capital, tasa, meses
+
+
+def medir(funcion, *args):
+    inicio = time.perf_counter()
+    resultado = funcion(*args)
+    return resultado, time.perf_counter() - inicio
+
+
+def bucle_escalar(capital, tasa, meses):
+    return [calcular_cuota_fija(c, t, m) for c, t, m in zip(capital.tolist(), tasa.tolist(), meses.tolist())]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de calcular_cuota_fija")
+    parser.add_argument("--tamanos", type=int, nargs="+", default=[10_000, 1_000_000, 10_000_000])
+    args = parser.parse_args()
+
+    print(f"{'Créditos':>12} | {'Escalar (s)':>12} | {'Vectorizado (s)':>15} | {'Aceleración':>11} | {'Tabla (s)':>10}")
+    for n in args.tamanos:
+        capital, tasa, meses = generar_cartera(n)
+        esperado, t_escalar = medir(bucle_escalar, capital, tasa, meses)
+        obtenido, t_lote = medir(calcular_cuota_fija_lote, capital, tasa, meses)
+        tabla, t_tabla = medir(calcular_cuota_fija_tabla, capital, tasa, meses)
+
+        if not np.allclose(np.asarray(esperado, dtype=np.float64), obtenido, rtol=1e-12, atol=0, equal_nan=True):
+            raise SystemExit(f"Los resultados difieren para n={n}")
+        # La tabla reutiliza los factores de la versión escalar: debe coincidir bit a bit.
+        if not np.array_equal(np.asarray(esperado, dtype=np.float64), tabla, equal_nan=True):
+            raise SystemExit(f"La tabla de factores difiere para n={n}")
+
+        print(f"{n:>12,} | {t_escalar:>12.3f} | {t_lote:>15.3f} | {t_escalar / t_lote:>10.1f}x | {t_tabla:>10.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "Backend"))
+
+from main import calcular_cuota_fija
+from cuota_inversa import HOLGURA_CUOTA, capital_maximo, plazo_necesario, tasa_implicita
+
+# =================================================================
+# Archivo: bench_cuota_inversa.py
+# Propósito: Ida y vuelta contra calcular_cuota_fija y µs por cotización de las inversas
+# =================================================================
+
+
+def verificar(capital, tasa, meses, cuota, muestra):
+    """Cada inversa, aplicada a la cuota escalar, debe devolver los datos de partida."""
+    capitales = capital_maximo(cuota, tasa, meses)
+    if not np.allclose(capitales, capital, rtol=1e-10, atol=0):
+        raise SystemExit("capital_maximo no recupera el capital")
+
+    tasas = tasa_implicita(capital, cuota, meses)
+    for i in range(muestra):
+        recalculada = calcular_cuota_fija(capital[i], float(tasas[i]), int(meses[i]))
+        if not np.isclose(recalculada, cuota[i], rtol=1e-10, atol=0):
+            raise SystemExit(f"tasa_implicita no reproduce la cuota del caso {i}")
+
+    # La cuota exacta de un plazo tiene ese plazo como mínimo
+    plazos = plazo_necesario(capital, tasa, cuota)
+    if not np.array_equal(plazos, meses):
+        raise SystemExit("plazo_necesario no recupera el plazo")
+    for i in range(muestra):
+        maxima = cuota[i] * 1.25
+        plazo = int(plazo_necesario(capital[i], tasa[i], maxima))
+        limite = maxima * (1 + HOLGURA_CUOTA)
+        if calcular_cuota_fija(capital[i], tasa[i], plazo) > limite or \
+                (plazo > 1 and calcular_cuota_fija(capital[i], tasa[i], plazo - 1) <= maxima * (1 - HOLGURA_CUOTA)):
+            raise SystemExit(f"plazo_necesario no da el plazo mínimo en el caso {i}")
+
+
+def medir(funcion, *argumentos, repeticiones=3):
+    mejor = float('inf')
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        funcion(*argumentos)
+        mejor = min(mejor, time.perf_counter() - inicio)
+    return mejor
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de las inversas de la cuota fija")
+    parser.add_argument("--cotizaciones", type=int, default=100_000)
+    parser.add_argument("--muestra", type=int, default=5_000, help="casos verificados uno por uno")
+    parser.add_argument("--semilla", type=int, default=3)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.semilla)
+    n = args.cotizaciones
+    capital = np.round(rng.uniform(500, 500_000, n), 2)
+    tasa = np.round(rng.uniform(0, 6, n), 2)
+    tasa[::50] = 0.0
+    meses = rng.integers(1, 361, n)
+    cuota = np.array([calcular_cuota_fija(c, t, int(m)) for c, t, m in zip(capital, tasa, meses)])
+
+    verificar(capital, tasa, meses, cuota, min(args.muestra, n))
+
+    casos = [
+        ("capital_maximo", capital_maximo, (cuota, tasa, meses)),
+        ("plazo_necesario", plazo_necesario, (capital, tasa, cuota)),
+        ("tasa_implicita", tasa_implicita, (capital, cuota, meses)),
+    ]
+    escalares = min(2_000, n)
+    print(f"{n:,} cotizaciones (verificadas contra calcular_cuota_fija)")
+    print(f"{'Inversa':<16} | {'µs/cotización (arreglo)':>23} | {'µs/cotización (escalar)':>23}")
+    for nombre, funcion, argumentos in casos:
+        t_arreglo = medir(funcion, *argumentos)
+        uno_a_uno = [tuple(float(a[i]) for a in argumentos) for i in range(escalares)]
+        t_escalar = medir(lambda: [funcion(*fila) for fila in uno_a_uno])
+        print(f"{nombre:<16} | {t_arreglo * 1e6 / n:>23.3f} | {t_escalar * 1e6 / escalares:>23.2f}")
+
+
+if __name__ == "__main__":
+    main()
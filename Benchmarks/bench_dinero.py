@@ -0,0 +1,50 @@
+import argparse
+import random
+import sys
+import time
+from decimal import Decimal
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "Extras"))
+
+from dinero import Dinero, capitalizar_centavos_lote
+from main_mejorado import actualizar_capital_por_meses, calcular_capital_final
+
+# =================================================================
+# Archivo: bench_dinero.py
+# Propósito: Aceleración de Dinero frente a Decimal (la equivalencia se prueba en tests/test_dinero.py)
+# =================================================================
+
+
+def medir(funcion):
+    inicio = time.perf_counter()
+    funcion()
+    return time.perf_counter() - inicio
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de Dinero contra Decimal")
+    parser.add_argument("--cuentas", type=int, default=1_000)
+    parser.add_argument("--meses", type=int, default=360)
+    args = parser.parse_args()
+
+    rng = random.Random(1)
+    tasas = [Decimal('0.9'), Decimal('1.5'), Decimal('2.25'), Decimal('3.1')]
+    cuentas = [(Decimal(rng.randint(50_000, 50_000_000)).scaleb(-2), rng.choice(tasas)) for _ in range(args.cuentas)]
+    cuentas_dinero = [(Dinero.desde_decimal(c), t) for c, t in cuentas]
+
+    t_decimal = medir(lambda: [actualizar_capital_por_meses(c, t, args.meses) for c, t in cuentas])
+    t_dinero = medir(lambda: [actualizar_capital_por_meses(c, t, args.meses) for c, t in cuentas_dinero])
+    t_final = medir(lambda: [calcular_capital_final(c, t, args.meses) for c, t in cuentas_dinero])
+    t_lote = medir(lambda: capitalizar_centavos_lote([c.centavos for c, _ in cuentas_dinero],
+                                                     [t for _, t in cuentas_dinero], args.meses))
+
+    print(f"{args.cuentas:,} cuentas x {args.meses} meses de mora")
+    print(f"  Decimal con historial: {t_decimal:8.3f} s")
+    print(f"  Dinero con historial:  {t_dinero:8.3f} s ({t_decimal / t_dinero:5.1f}x)")
+    print(f"  Dinero solo final:     {t_final:8.3f} s ({t_decimal / t_final:5.1f}x)")
+    print(f"  Dinero lote (int64):   {t_lote:8.3f} s ({t_decimal / t_lote:5.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
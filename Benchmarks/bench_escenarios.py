@@ -0,0 +1,83 @@
+import argparse
+import sys
+import time
+from datetime import date
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "Backend"))
+
+from main import aplicar_pago_mensual, calcular_cuota_fija, generar_tabla_amortizacion, sumar_un_mes
+from escenarios import TablaIncremental
+
+# =================================================================
+# Archivo: bench_escenarios.py
+# Propósito: Barrido de escenarios "qué pasa si": recálculo incremental contra desde el mes 1
+# =================================================================
+
+
+def tabla_completa(capital, tasas, plazo, aprobacion, pagos, extras):
+    """Referencia: todos los meses desde el mes 1, con la tasa vigente de cada mes."""
+    filas = []
+    saldo, fecha, mes = capital, aprobacion, 0
+    while saldo > 0 and mes < 1200:
+        mes += 1
+        fecha = sumar_un_mes(fecha)
+        tasa = tasas[max(m for m in tasas if m <= mes)]
+        cuota = calcular_cuota_fija(saldo, tasa, plazo - mes + 1 if mes <= plazo else 1)
+        pago = pagos[mes] if mes in pagos else cuota + extras.get(mes, 0.0)
+        saldo, interes = aplicar_pago_mensual(saldo, tasa, pago)
+        filas.append((mes, fecha, pago, interes, saldo))
+    return filas
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de escenarios incrementales")
+    parser.add_argument("--escenarios", type=int, default=500)
+    parser.add_argument("--plazo", type=int, default=360)
+    parser.add_argument("--mes-cambio", type=int, default=300, help="mes donde se aplica el pago extra")
+    args = parser.parse_args()
+
+    capital, tasa, aprobacion = 150_000.0, 1.1, date(2024, 1, 31)
+    extras = [100.0 * (i + 1) for i in range(args.escenarios)]
+
+    # Recalcular cada escenario desde el mes 1
+    inicio = time.perf_counter()
+    completos = []
+    for extra in extras:
+        def pagar(mes, saldo, cuota_esperada, *_):
+            return cuota_esperada + (extra if mes == args.mes_cambio else 0.0)
+        completos.append([f['saldo'] for f in generar_tabla_amortizacion(capital, tasa, args.plazo, aprobacion, pagar)])
+    t_completo = time.perf_counter() - inicio
+
+    # Incremental: la base se calcula una vez y cada escenario retoma en el mes cambiado
+    base = TablaIncremental(capital, tasa, args.plazo, aprobacion)
+    len(base)
+    inicio = time.perf_counter()
+    incrementales = []
+    recalculados = 0
+    for extra in extras:
+        escenario = base.copia().agregar_pago_extra(args.mes_cambio, extra)
+        incrementales.append([f['saldo'] for f in escenario])
+        recalculados += escenario.meses_recalculados
+    t_incremental = time.perf_counter() - inicio
+
+    if incrementales != completos:
+        raise SystemExit("Los escenarios incrementales difieren del recálculo completo")
+
+    # Cambios de tasa y pagos fijos contra una referencia independiente
+    escenario = base.copia().cambiar_tasa(24, 1.4).fijar_pago(30, None).agregar_pago_extra(40, 5_000.0)
+    escenario.cambiar_tasa(120, 0.9)
+    referencia = tabla_completa(capital, {1: tasa, 24: 1.4, 120: 0.9}, args.plazo, aprobacion, {30: None}, {40: 5_000.0})
+    if [(f['mes'], f['fecha_limite'], f['pago'], f['interes'], f['saldo']) for f in escenario] != referencia:
+        raise SystemExit("El escenario con cambios de tasa difiere de la referencia")
+
+    print(f"{args.escenarios} escenarios, plazo {args.plazo}, cambio en el mes {args.mes_cambio}")
+    print(f"{'Método':<12} | {'Total (ms)':>10} | {'ms/escenario':>12} | {'Meses calculados':>16}")
+    print(f"{'completo':<12} | {t_completo * 1e3:>10.1f} | {t_completo * 1e3 / len(extras):>12.3f} | "
+          f"{sum(len(c) for c in completos):>16,}")
+    print(f"{'incremental':<12} | {t_incremental * 1e3:>10.1f} | {t_incremental * 1e3 / len(extras):>12.3f} | "
+          f"{recalculados:>16,}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+import argparse
+import calendar
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "Backend"))
+
+from main import calcular_cuota_fija, generar_tabla_amortizacion
+from estado_prestamos import AlmacenPrestamos
+
+# =================================================================
+# Archivo: bench_estado_prestamos.py
+# Propósito: Comparar el cierre de mes incremental contra repetir los historiales
+# =================================================================
+
+
+def generar_cartera(n: int, meses: int, semilla: int = 2024):
+    """Préstamos aprobados durante 2023 y un pago (o impago) por mes de cada uno."""
+    rng = random.Random(semilla)
+    prestamos, pagos = [], []
+    for pid in range(1, n + 1):
+        capital = round(rng.uniform(1_000, 50_000), 2)
+        tasa = round(rng.uniform(0.5, 4), 2)
+        plazo = rng.randint(6, 60)
+        prestamos.append((pid, capital, tasa, plazo, date(2023, 1, 1) + timedelta(days=rng.randrange(365))))
+        cuota = calcular_cuota_fija(capital, tasa, plazo)
+        for mes in range(1, meses + 2):
+            pagos.append((pid, mes, rng.choice([None, 0.0, 0.5 * cuota, cuota, cuota, cuota, 1.5 * cuota])))
+    return prestamos, pagos
+
+
+def cortes_mensuales(meses: int):
+    """Último día de cada mes desde enero de 2024."""
+    cortes = []
+    for k in range(meses):
+        año, mes = 2024 + k // 12, k % 12 + 1
+        cortes.append(date(año, mes, calendar.monthrange(año, mes)[1]))
+    return cortes
+
+
+def replay_completo(prestamos, pagos_por_mes, hasta: date):
+    """Lo que se haría sin estado guardado: repetir cada historial desde el mes 1."""
+    saldos = {}
+    for pid, capital, tasa, plazo, aprobacion in prestamos:
+        def obtener_pago(mes, *_):
+            return pagos_por_mes.get((pid, mes))
+
+        filas = []
+        for fila in generar_tabla_amortizacion(capital, tasa, plazo, aprobacion, obtener_pago):
+            if fila['fecha_limite'] > hasta:
+                break
+            filas.append(fila)
+        saldos[pid] = filas
+    return saldos
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark del almacén de préstamos en SQLite")
+    parser.add_argument("--prestamos", type=int, default=5_000)
+    parser.add_argument("--meses", type=int, default=24, help="cierres mensuales a simular")
+    args = parser.parse_args()
+
+    prestamos, pagos = generar_cartera(args.prestamos, args.meses + 12)
+    pagos_por_mes = {(pid, mes): monto for pid, mes, monto in pagos}
+    cortes = cortes_mensuales(args.meses)
+
+    with tempfile.TemporaryDirectory() as carpeta:
+        with AlmacenPrestamos(os.path.join(carpeta, "prestamos.db")) as almacen:
+            inicio = time.perf_counter()
+            almacen.agregar_prestamos(prestamos)
+            almacen.registrar_pagos(pagos)
+            t_carga = time.perf_counter() - inicio
+            print(f"Alta de {len(prestamos):,} préstamos y {len(pagos):,} pagos: {t_carga:.2f} s")
+
+            # El primer corte pone al día todo 2023; los siguientes solo procesan un mes
+            print(f"{'Corte':>10} | {'Meses cerrados':>14} | {'Incremental (s)':>15}")
+            for corte in cortes:
+                inicio = time.perf_counter()
+                resumen = almacen.cerrar_mes(corte)
+                t_cierre = time.perf_counter() - inicio
+                print(f"{corte.isoformat():>10} | {resumen['meses']:>14,} | {t_cierre:>15.3f}")
+
+            inicio = time.perf_counter()
+            esperado = replay_completo(prestamos, pagos_por_mes, cortes[-1])
+            t_replay = time.perf_counter() - inicio
+
+            for pid, filas in esperado.items():
+                if almacen.movimientos(pid) != filas:
+                    raise SystemExit(f"El préstamo {pid} difiere de generar_tabla_amortizacion")
+
+    print(f"Repetir todos los historiales hasta {cortes[-1]}: {t_replay:.3f} s (resultados idénticos)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+import argparse
+import sys
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "Extras"))
+
+from historial import Historial
+
+# =================================================================
+# Archivo: bench_historial_memoria.py
+# Propósito: Memoria del historial como lista de dicts vs. columnas compactas
+# =================================================================
+
+
+def historial_dicts(capital: float, tasa: float, meses: int):
+    """Formato original: un dict por mes."""
+    historial = []
+    for mes in range(1, meses + 1):
+        interes = capital * (tasa / 100)
+        historial.append({
+            "mes": mes,
+            "capital_antes": round(capital, 2),
+            "interes": round(interes, 2),
+            "capital_despues": round(capital + interes, 2),
+        })
+        capital += interes
+    return historial
+
+
+def historial_compacto(capital: float, tasa: float, meses: int):
+    historial = Historial('float')
+    for mes in range(1, meses + 1):
+        interes = capital * (tasa / 100)
+        historial.agregar(mes, round(capital, 2), round(interes, 2), round(capital + interes, 2))
+        capital += interes
+    return historial
+
+
+def medir_memoria(constructor, creditos: int, meses: int) -> int:
+    tracemalloc.start()
+    cartera = [constructor(1_000 + i, 2.5, meses) for i in range(creditos)]
+    actual, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del cartera
+    return actual
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de memoria del historial")
+    parser.add_argument("--creditos", type=int, default=10_000)
+    parser.add_argument("--meses", type=int, default=60)
+    parser.add_argument("--objetivo", type=int, default=1_000_000,
+                        help="créditos para la extrapolación lineal")
+    args = parser.parse_args()
+
+    print(f"{args.creditos:,} créditos x {args.meses} meses (extrapolado a {args.objetivo:,} créditos)")
+    for nombre, constructor in (("Lista de dicts", historial_dicts), ("Historial compacto", historial_compacto)):
+        total = medir_memoria(constructor, args.creditos, args.meses)
+        por_fila = total / (args.creditos * args.meses)
+        extrapolado = total * args.objetivo / args.creditos
+        print(f"  {nombre:<20} {por_fila:7.1f} B/fila | {extrapolado / 2**30:8.2f} GiB")
+
+
+if __name__ == "__main__":
+    main()
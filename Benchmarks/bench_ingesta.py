@@ -0,0 +1,89 @@
+import argparse
+import csv
+import os
+import random
+import sys
+import tempfile
+import tracemalloc
+from datetime import date, timedelta
+from decimal import Decimal, ROUND_HALF_UP
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "Extras"))
+
+from main_mejorado import _to_decimal, actualizar_capital_por_meses, calcular_meses_de_mora, parse_fecha
+from ingesta import ingerir_archivo
+
+# =================================================================
+# Archivo: bench_ingesta.py
+# Propósito: Filas por segundo y memoria de la ingesta masiva de solicitudes
+# =================================================================
+
+
+def generar_solicitudes(ruta: str, n: int, semilla: int = 7) -> None:
+    """CSV sintético con coma decimal, tasas y fechas repetidas y ~5 % de filas inválidas."""
+    rng = random.Random(semilla)
+    tasas = [f"{t / 10:.1f}".replace('.', ',') for t in range(5, 51)]
+    with open(ruta, 'w', newline='', encoding='utf-8') as archivo:
+        escritor = csv.writer(archivo)
+        escritor.writerow(['solicitud_id', 'capital', 'tasa', 'fecha_esperada', 'fecha_real'])
+        for i in range(n):
+            esperada = date(2023, 1, 1) + timedelta(days=rng.randrange(365))
+            real = esperada + timedelta(days=rng.randrange(-30, 730))
+            capital = f"{rng.uniform(100, 50_000):.2f}".replace('.', ',')
+            fila = [i, capital, rng.choice(tasas), esperada.isoformat(), real.isoformat()]
+            if rng.random() < 0.05:
+                fila[rng.randrange(1, 5)] = rng.choice(['', 'abc', '-10', '2023-02-30'])
+            escritor.writerow(fila)
+
+
+def referencia(capital_texto: str, tasa_texto: str, esperada_texto: str, real_texto: str) -> str:
+    """El camino de `run_cli`, fila por fila, con el historial completo."""
+    try:
+        capital = _to_decimal(capital_texto.strip().replace(' ', ''))
+        tasa = _to_decimal(tasa_texto.strip())
+        if capital <= 0 or tasa < 0:
+            return ''
+        esperada, real = parse_fecha(esperada_texto), parse_fecha(real_texto)
+    except Exception:
+        return ''
+    capital_final, _ = actualizar_capital_por_meses(capital, tasa, calcular_meses_de_mora(esperada, real))
+    return str(capital_final.quantize(Decimal('0.01'), rounding=ROUND_HALF_UP))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de la ingesta masiva de solicitudes")
+    parser.add_argument("--filas", type=int, nargs="+", default=[50_000, 200_000])
+    parser.add_argument("--tamano-bloque", type=int, default=10_000)
+    parser.add_argument("--muestra", type=int, default=2_000, help="filas comparadas contra el camino de run_cli")
+    args = parser.parse_args()
+
+    print(f"{'Filas':>10} | {'Inválidas':>9} | {'Filas/s':>10} | {'Memoria pico (MB)':>17}")
+    with tempfile.TemporaryDirectory() as carpeta:
+        for n in args.filas:
+            entrada = os.path.join(carpeta, f"solicitudes_{n}.csv")
+            salida = os.path.join(carpeta, f"resultados_{n}.csv")
+            generar_solicitudes(entrada, n)
+
+            metricas = ingerir_archivo(entrada, salida, args.tamano_bloque)
+            # Segunda pasada solo para la memoria: tracemalloc distorsiona los tiempos
+            tracemalloc.start()
+            ingerir_archivo(entrada, salida, args.tamano_bloque)
+            _, pico = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+
+            with open(entrada, newline='', encoding='utf-8') as f_entrada, \
+                    open(salida, newline='', encoding='utf-8') as f_salida:
+                filas = zip(csv.DictReader(f_entrada), csv.DictReader(f_salida))
+                for _, (solicitud, resultado) in zip(range(args.muestra), filas):
+                    esperado = referencia(solicitud['capital'], solicitud['tasa'],
+                                          solicitud['fecha_esperada'], solicitud['fecha_real'])
+                    if resultado['capital_final'] != esperado or (esperado == '') != bool(resultado['error']):
+                        raise SystemExit(f"La solicitud {solicitud['solicitud_id']} difiere del camino de run_cli")
+
+            print(f"{n:>10,} | {metricas['invalidas']:>9,} | {metricas['filas_por_segundo']:>10,.0f} | "
+                  f"{pico / 2**20:>17.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "Extras"))
+
+from fechas_mora import calcular_meses_de_mora, calcular_meses_de_mora_lote
+
+# =================================================================
+# Archivo: bench_meses_mora.py
+# Propósito: Medir calcular_meses_de_mora escalar vs. vectorizado (verificado en tests/)
+# =================================================================
+
+
+def generar_pares(n: int, semilla: int = 12345):
+    rng = np.random.default_rng(semilla)
+    esperado = np.datetime64('1950-01-01') + rng.integers(0, 40_000, n)
+    real = esperado + rng.integers(-400, 4_000, n)
+    return esperado, real
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de calcular_meses_de_mora")
+    parser.add_argument("--pares", type=int, nargs="+", default=[100_000, 1_000_000, 5_000_000])
+    args = parser.parse_args()
+
+    print(f"{'Pares':>12} | {'Escalar (pares/s)':>18} | {'Vectorizado (pares/s)':>21}")
+    for n in args.pares:
+        esperado, real = generar_pares(n)
+        esperado_py, real_py = esperado.tolist(), real.tolist()
+
+        inicio = time.perf_counter()
+        [calcular_meses_de_mora(e, r) for e, r in zip(esperado_py, real_py)]
+        t_escalar = time.perf_counter() - inicio
+
+        inicio = time.perf_counter()
+        calcular_meses_de_mora_lote(esperado, real)
+        t_vector = time.perf_counter() - inicio
+
+        print(f"{n:>12,} | {n / t_escalar:>18,.0f} | {n / t_vector:>21,.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+import argparse
+import random
+import sys
+import time
+from decimal import Decimal, InvalidOperation
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "Extras"))
+
+from main_mejorado import actualizar_capital_por_meses
+
+# =================================================================
+# Archivo: bench_mora_decimal.py
+# Propósito: Comparar el bucle Decimal de mora contra el modo rápido
+# =================================================================
+
+
+def generar_cuentas(n: int, semilla: int = 12345):
+    """Cuentas sintéticas en mora: (capital, tasa %)."""
+    rng = random.Random(semilla)
+    tasas = [Decimal('0.9'), Decimal('1.5'), Decimal('2.25'), Decimal('3.1'), Decimal('4.75')]
+    return [(Decimal(rng.randint(50_000, 50_000_000)).scaleb(-2), rng.choice(tasas)) for _ in range(n)]
+
+
+def medir(cuentas, meses_mora: int, perezoso: bool):
+    inicio = time.perf_counter()
+    finales = [actualizar_capital_por_meses(c, t, meses_mora, perezoso=perezoso)[0] for c, t in cuentas]
+    return finales, time.perf_counter() - inicio
+
+
+def verificar_precision(casos: int = 3_000, semilla: int = 7) -> None:
+    """Capitales y tasas grandes: `capital * tasa` pasa de 28 dígitos y Decimal empieza a redondear."""
+    rng = random.Random(semilla)
+
+    def final(perezoso, capital, tasa, meses):
+        try:
+            return actualizar_capital_por_meses(capital, tasa, meses, perezoso=perezoso)[0]
+        except InvalidOperation:
+            return "excede la precisión"
+
+    cuentas = [(Decimal('509847258'), Decimal('98.4'), 56)]
+    cuentas += [(Decimal(rng.randrange(1, 10**12)).scaleb(-rng.randint(0, 2)),
+                 Decimal(str(round(rng.uniform(0, 100), rng.randint(0, 4)))), rng.randint(1, 120))
+                for _ in range(casos)]
+    for capital, tasa, meses in cuentas:
+        if final(False, capital, tasa, meses) != final(True, capital, tasa, meses):
+            raise SystemExit(f"El modo rápido difiere del bucle para {capital} al {tasa} % en {meses} meses")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de actualizar_capital_por_meses")
+    parser.add_argument("--cuentas", type=int, default=2_000)
+    parser.add_argument("--meses", type=int, nargs="+", default=[12, 120, 360, 600])
+    args = parser.parse_args()
+
+    verificar_precision()
+    cuentas = generar_cuentas(args.cuentas)
+    print(f"{'Meses mora':>10} | {'Bucle (s)':>10} | {'Rápido (s)':>10} | {'Aceleración':>11}")
+    for meses_mora in args.meses:
+        esperado, t_bucle = medir(cuentas, meses_mora, perezoso=False)
+        obtenido, t_rapido = medir(cuentas, meses_mora, perezoso=True)
+
+        if esperado != obtenido:
+            raise SystemExit(f"Los resultados difieren para {meses_mora} meses")
+
+        print(f"{meses_mora:>10} | {t_bucle:>10.3f} | {t_rapido:>10.3f} | {t_bucle / t_rapido:>10.1f}x")
+
+
+if __name__ == "__main__":
+    main()
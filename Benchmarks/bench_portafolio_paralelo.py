@@ -0,0 +1,53 @@
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "Backend"))
+
+from bench_replay_pagos import generar_libro
+from portafolio_paralelo import simular_cartera_paralelo
+from replay_pagos import replay_libro_pagos
+
+# =================================================================
+# Archivo: bench_portafolio_paralelo.py
+# Propósito: Cartera repartida entre procesos: idéntica byte a byte a la ejecución serial
+# =================================================================
+
+COLUMNAS = ('prestamo_id', 'saldo', 'meses', 'liquidado', 'cuota_siguiente')
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de la simulación de cartera en paralelo")
+    parser.add_argument("--prestamos", type=int, default=200_000)
+    parser.add_argument("--meses", type=int, default=36)
+    parser.add_argument("--procesos", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--fragmentos", type=int, nargs="+", default=[1, 4, 7, 16])
+    parser.add_argument("--tamano-bloque", type=int, default=50_000)
+    args = parser.parse_args()
+
+    cartera, libro = generar_libro(args.prestamos, args.meses)
+
+    inicio = time.perf_counter()
+    serial = replay_libro_pagos(*cartera, *libro, hasta_mes=args.meses, tamano_bloque=args.tamano_bloque)
+    t_serial = time.perf_counter() - inicio
+
+    print(f"{args.prestamos:,} créditos, {libro[0].size:,} registros, {args.procesos} procesos")
+    print(f"{'Fragmentos':>10} | {'Tiempo (s)':>10} | {'Aceleración':>11}")
+    print(f"{'serial':>10} | {t_serial:>10.2f} | {'1.0x':>11}")
+    for fragmentos in args.fragmentos:
+        inicio = time.perf_counter()
+        paralelo = simular_cartera_paralelo(*cartera, *libro, hasta_mes=args.meses, procesos=args.procesos,
+                                            num_fragmentos=fragmentos, tamano_bloque=args.tamano_bloque)
+        t_paralelo = time.perf_counter() - inicio
+
+        for columna in COLUMNAS:
+            if serial[columna].dtype != paralelo[columna].dtype or \
+                    serial[columna].tobytes() != paralelo[columna].tobytes():
+                raise SystemExit(f"Con {fragmentos} fragmentos la columna '{columna}' difiere de la serial")
+        print(f"{fragmentos:>10} | {t_paralelo:>10.2f} | {t_serial / t_paralelo:>10.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+import argparse
+import sys
+import time
+from datetime import date
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "Backend"))
+
+from main import calcular_cuota_fija, generar_tabla_amortizacion
+from replay_pagos import replay_libro_pagos
+
+# =================================================================
+# Archivo: bench_replay_pagos.py
+# Propósito: Replay vectorizado de un libro de pagos contra la simulación crédito por crédito
+# =================================================================
+
+
+def generar_libro(n: int, meses: int, semilla: int = 21):
+    """Cartera y libro de pagos sintéticos: pagos completos, parciales, extras, faltantes y NaN."""
+    rng = np.random.default_rng(semilla)
+    prestamo_id = rng.permutation(np.arange(1, n + 1) * 3)  # ids no consecutivos y desordenados
+    capital = rng.uniform(1_000, 80_000, n).round(2)
+    tasa = rng.choice([0.0, 0.8, 1.5, 2.5, 4.0], n)
+    plazo = rng.choice([6, 12, 24, 36, 60], n)
+
+    cuota = np.array([calcular_cuota_fija(c, t, int(p)) for c, t, p in zip(capital, tasa, plazo)])
+    pos = np.repeat(np.arange(n), meses)
+    mes = np.tile(np.arange(1, meses + 1), n)
+    factor = rng.choice([1.0, 1.0, 1.0, 0.3, 1.6, 0.0], pos.size)
+    monto = (cuota[pos] * factor).round(2)
+    monto[rng.random(pos.size) < 0.04] = np.nan          # registrado sin pago
+    conservar = rng.random(pos.size) >= 0.05              # meses sin registro
+    libro = (prestamo_id[pos][conservar], mes[conservar], monto[conservar])
+    return (prestamo_id, capital, tasa, plazo), libro
+
+
+def replay_escalar(cartera, libro, hasta_mes: int):
+    """Referencia: `generar_tabla_amortizacion` por crédito, con los pagos del libro."""
+    prestamo_id, capital, tasa, plazo = cartera
+    pagos = {}
+    for pid, mes, monto in zip(*(c.tolist() for c in libro)):
+        if monto == monto:  # NaN = registrado sin pago
+            pagos[pid, mes] = pagos.get((pid, mes), 0.0) + monto
+        else:
+            pagos.setdefault((pid, mes), None)
+
+    saldos, meses, cuotas = [], [], []
+    for pid, c, t, p in zip(prestamo_id.tolist(), capital.tolist(), tasa.tolist(), plazo.tolist()):
+        def pagar(mes, *_):
+            return pagos.get((pid, mes))
+        saldo, ultimo = c, 0
+        for fila in generar_tabla_amortizacion(c, t, p, date(2024, 1, 31), pagar):
+            saldo, ultimo = fila['saldo'], fila['mes']
+            if ultimo >= hasta_mes:
+                break
+        saldos.append(saldo)
+        meses.append(ultimo)
+        cuotas.append(calcular_cuota_fija(saldo, t, max(p - ultimo, 1)) if saldo > 0 else 0.0)
+    return np.array(saldos), np.array(meses), np.array(cuotas)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark del replay de libros de pagos")
+    parser.add_argument("--prestamos", type=int, nargs="+", default=[10_000, 100_000])
+    parser.add_argument("--meses", type=int, default=48)
+    args = parser.parse_args()
+
+    print(f"{'Créditos':>10} | {'Registros':>10} | {'Por crédito (s)':>15} | {'Vectorizado (s)':>15} | {'Aceleración':>11}")
+    for n in args.prestamos:
+        cartera, libro = generar_libro(n, args.meses)
+
+        inicio = time.perf_counter()
+        saldo, meses, cuota = replay_escalar(cartera, libro, args.meses)
+        t_escalar = time.perf_counter() - inicio
+
+        inicio = time.perf_counter()
+        resultado = replay_libro_pagos(*cartera, *libro, hasta_mes=args.meses)
+        t_lote = time.perf_counter() - inicio
+
+        # Mismas operaciones en el mismo orden: el saldo debe coincidir bit a bit
+        if not np.array_equal(resultado['saldo'], saldo) or not np.array_equal(resultado['meses'], meses):
+            raise SystemExit(f"El replay difiere de generar_tabla_amortizacion para n={n}")
+        if not np.array_equal(resultado['liquidado'], saldo <= 0):
+            raise SystemExit(f"La marca de liquidado difiere para n={n}")
+        # La cuota siguiente sale de la versión vectorizada: igual hasta ~1e-15 relativo
+        if not np.allclose(resultado['cuota_siguiente'], cuota, rtol=1e-12, atol=0):
+            raise SystemExit(f"La cuota siguiente difiere para n={n}")
+
+        print(f"{n:>10,} | {libro[0].size:>10,} | {t_escalar:>15.2f} | {t_lote:>15.2f} | {t_escalar / t_lote:>10.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+import argparse
+import os
+import sys
+import tempfile
+import time
+from decimal import Decimal
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "Extras"))
+
+from reportlab.lib.pagesizes import letter
+from reportlab.pdfgen import canvas
+
+from main_mejorado import actualizar_capital_por_meses
+from reporte_pdf import escribir_estado_pdf, generar_estados_lote
+
+# =================================================================
+# Archivo: bench_reporte_pdf.py
+# Propósito: Páginas por segundo del exportador PDF (uno y en lote)
+# =================================================================
+
+
+def exportar_pdf_original(archivo, capital_inicial, capital_final, historial) -> int:
+    """Copia del exportador anterior (una línea por fila), como referencia."""
+    c = canvas.Canvas(archivo, pagesize=letter)
+    c.setFont("Helvetica-Bold", 16)
+    c.drawString(50, 750, "Reporte del Crédito con Mora")
+    c.setFont("Helvetica", 12)
+    c.drawString(50, 720, f"Capital inicial: {capital_inicial:,.2f}")
+    c.drawString(50, 700, f"Capital final: {capital_final:,.2f}")
+    c.drawString(50, 680, "Historial por mes:")
+
+    paginas, y = 1, 660
+    for h in historial:
+        c.drawString(50, y, f"Mes {h['mes']}: Capital antes = {h['capital_antes']}, "
+                            f"Interés = {h['interes']}, Capital después = {h['capital_despues']}")
+        y -= 20
+        if y < 50:
+            c.showPage()
+            paginas += 1
+            y = 750
+    c.save()
+    return paginas
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark del exportador PDF")
+    parser.add_argument("--meses", type=int, default=2_400)
+    parser.add_argument("--creditos", type=int, default=500)
+    parser.add_argument("--procesos", type=int, default=None)
+    args = parser.parse_args()
+
+    capital, tasa = Decimal('25000.00'), Decimal('0.35')
+    with tempfile.TemporaryDirectory() as carpeta:
+        for nombre, exportar in (("Original", exportar_pdf_original), ("Streaming", escribir_estado_pdf)):
+            inicio = time.perf_counter()
+            capital_final, historial = actualizar_capital_por_meses(capital, tasa, args.meses, perezoso=True)
+            paginas = exportar(os.path.join(carpeta, f"{nombre}.pdf"), capital, capital_final, historial)
+            segundos = time.perf_counter() - inicio
+            print(f"{nombre:<10} {args.meses} meses: {paginas:4d} páginas en {segundos:6.3f} s "
+                  f"({paginas / segundos:7.1f} páginas/s, {args.meses / segundos:9,.0f} filas/s)")
+
+        trabajos = ((os.path.join(carpeta, f"estado_{i}.pdf"), '15000.00', '1.5', 60 + i % 240)
+                    for i in range(args.creditos))
+        resumen = generar_estados_lote(trabajos, args.procesos)
+        print(f"Lote: {resumen['estados']} estados, {resumen['paginas']} páginas en {resumen['segundos']:.2f} s "
+              f"({resumen['paginas_por_segundo']:.1f} páginas/s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+import argparse
+import asyncio
+import json
+import random
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "Backend"))
+
+from main import calcular_cuota_fija
+
+# =================================================================
+# Archivo: bench_servicio_http.py
+# Propósito: Prueba de carga del servicio HTTP de cotizaciones en local
+# =================================================================
+
+SERVICIO = Path(__file__).resolve().parent.parent / "Backend" / "servicio_http.py"
+
+
+def iniciar_servidor():
+    """Levanta el servicio en un proceso aparte, en un puerto libre."""
+    proceso = subprocess.Popen([sys.executable, str(SERVICIO), "--puerto", "0"],
+                               stdout=subprocess.PIPE, text=True)
+    linea = proceso.stdout.readline()
+    if not linea.startswith("Escuchando"):
+        proceso.kill()
+        raise SystemExit("No se pudo iniciar el servicio HTTP")
+    return proceso, int(linea.rsplit(":", 1)[1])
+
+
+def cotizaciones_aleatorias(n: int, rng: random.Random):
+    return [{'capital': round(rng.uniform(1_000, 100_000), 2), 'tasa': round(rng.uniform(0, 5), 2),
+             'meses': rng.randint(1, 360)} for _ in range(n)]
+
+
+def peticion(cotizaciones) -> bytes:
+    """GET /cotizar para una cotización; POST /cotizar/lote para varias."""
+    if len(cotizaciones) == 1:
+        c = cotizaciones[0]
+        return (f"GET /cotizar?capital={c['capital']}&tasa={c['tasa']}&meses={c['meses']} HTTP/1.1\r\n"
+                f"Host: localhost\r\n\r\n").encode()
+    cuerpo = json.dumps({'cotizaciones': cotizaciones}).encode()
+    return (f"POST /cotizar/lote HTTP/1.1\r\nHost: localhost\r\nContent-Type: application/json\r\n"
+            f"Content-Length: {len(cuerpo)}\r\n\r\n").encode() + cuerpo
+
+
+async def leer_respuesta(lector):
+    cabecera = await lector.readuntil(b"\r\n\r\n")
+    estado = int(cabecera.split(b" ", 2)[1])
+    largo = next(int(linea.split(b":")[1]) for linea in cabecera.split(b"\r\n")
+                 if linea.lower().startswith(b"content-length:"))
+    return estado, json.loads(await lector.readexactly(largo))
+
+
+async def cliente(puerto: int, peticiones: int, lote: int, profundidad: int, semilla: int, latencias):
+    """Una conexión keep-alive que envía `peticiones`, con hasta `profundidad` en vuelo."""
+    rng = random.Random(semilla)
+    lector, escritor = await asyncio.open_connection("127.0.0.1", puerto)
+    pendientes = []
+    enviadas = recibidas = 0
+    while recibidas < peticiones:
+        while enviadas < peticiones and len(pendientes) < profundidad:
+            cotizaciones = cotizaciones_aleatorias(lote, rng)
+            escritor.write(peticion(cotizaciones))
+            pendientes.append((time.perf_counter(), cotizaciones))
+            enviadas += 1
+        await escritor.drain()
+
+        estado, cuerpo = await leer_respuesta(lector)
+        inicio, cotizaciones = pendientes.pop(0)
+        latencias.append(time.perf_counter() - inicio)
+        recibidas += 1
+        if estado != 200:
+            raise SystemExit(f"Respuesta {estado}: {cuerpo}")
+
+        cuotas = cuerpo['cuotas'] if lote > 1 else [cuerpo['cuota']]
+        esperadas = [calcular_cuota_fija(c['capital'], c['tasa'], c['meses']) for c in cotizaciones]
+        if cuotas != esperadas:
+            raise SystemExit("Las cuotas del servicio difieren de calcular_cuota_fija")
+    escritor.close()
+    await escritor.wait_closed()
+
+
+async def carga(puerto: int, conexiones: int, peticiones: int, lote: int, profundidad: int):
+    latencias = []
+    inicio = time.perf_counter()
+    await asyncio.gather(*(cliente(puerto, peticiones, lote, profundidad, semilla, latencias)
+                           for semilla in range(conexiones)))
+    return time.perf_counter() - inicio, sorted(latencias)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Prueba de carga del servicio HTTP de cotizaciones")
+    parser.add_argument("--conexiones", type=int, default=8)
+    parser.add_argument("--peticiones", type=int, default=500, help="peticiones por conexión")
+    parser.add_argument("--lotes", type=int, nargs="+", default=[1, 100], help="cotizaciones por petición")
+    parser.add_argument("--profundidad", type=int, default=1, help="peticiones en vuelo por conexión")
+    args = parser.parse_args()
+
+    proceso, puerto = iniciar_servidor()
+    try:
+        print(f"{'Lote':>6} | {'Peticiones/s':>12} | {'Cotizaciones/s':>14} | {'p50 (ms)':>8} | {'p99 (ms)':>8}")
+        for lote in args.lotes:
+            segundos, latencias = asyncio.run(carga(puerto, args.conexiones, args.peticiones, lote, args.profundidad))
+            total = len(latencias)
+            p50 = latencias[total // 2] * 1000
+            p99 = latencias[min(total - 1, int(total * 0.99))] * 1000
+            print(f"{lote:>6} | {total / segundos:>12,.0f} | {total * lote / segundos:>14,.0f} | {p50:>8.2f} | {p99:>8.2f}")
+    finally:
+        proceso.terminate()
+        proceso.wait()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+import argparse
+import itertools
+import sys
+import time
+from datetime import date
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "Backend"))
+
+from main import generar_tabla_amortizacion
+from simulacion_mora import ERROR_RELATIVO_SALDO, CENTAVO, percentil_meses, percentil_saldo, simular_caminos, simular_mora
+
+# =================================================================
+# Archivo: bench_simulacion_mora.py
+# Propósito: Caminos por segundo del Monte Carlo de mora y verificación contra main.py
+# =================================================================
+
+
+def camino_referencia(capital, tasa, plazo, sorteos, p_inc, p_parcial, fraccion, max_meses):
+    """Un camino con `generar_tabla_amortizacion`, usando los mismos sorteos que el bloque."""
+    def pagar(mes, saldo, cuota_esperada, *_):
+        if sorteos[mes - 1] < p_inc:
+            return None
+        if sorteos[mes - 1] < p_inc + p_parcial:
+            return cuota_esperada * fraccion
+        return cuota_esperada
+
+    meses, saldo, capitalizado = 0, capital, 0.0
+    for fila in itertools.islice(generar_tabla_amortizacion(capital, tasa, plazo, date(2024, 1, 31), pagar), max_meses):
+        meses, saldo = fila['mes'], fila['saldo']
+        capitalizado += fila['interes'] if fila['pago'] is None else max(fila['interes'] - fila['pago'], 0.0)
+    return meses, saldo, capitalizado
+
+
+def verificar(capital, tasa, plazo, p_inc, p_parcial, fraccion, caminos, max_meses, semilla):
+    bloque = next(simular_caminos(capital, tasa, plazo, p_inc, p_parcial, fraccion, caminos, max_meses,
+                                  semilla, tamano_bloque=caminos))
+    # Mismo flujo que usa el primer bloque: un sorteo por camino y mes
+    rng = np.random.default_rng(np.random.SeedSequence(semilla).spawn(1)[0])
+    sorteos = np.array([rng.random(caminos) for _ in range(int(bloque['meses'].max()))])
+    for j in range(caminos):
+        meses, saldo, capitalizado = camino_referencia(capital, tasa, plazo, sorteos[:, j], p_inc, p_parcial,
+                                                       fraccion, max_meses)
+        if (meses, saldo) != (bloque['meses'][j], bloque['saldo_final'][j]) or \
+                not np.isclose(capitalizado, bloque['capitalizado'][j], rtol=1e-9):
+            raise SystemExit(f"El camino {j} difiere de generar_tabla_amortizacion")
+
+
+def verificar_percentiles(resultado):
+    """Los percentiles del histograma quedan dentro del error prometido frente a los exactos."""
+    saldos = resultado['saldo_final']
+    for q in (1, 10, 50, 90, 99, 99.9, 100):
+        # Primer camino (ordenado) en el que la proporción acumulada llega a q, como `percentil_meses`
+        exacto = float(saldos[np.searchsorted(np.arange(1, saldos.size + 1), saldos.size * q / 100)])
+        aproximado = percentil_saldo(resultado['histograma_saldo'], resultado['bordes_saldo'], q)
+        if abs(aproximado - exacto) > max(ERROR_RELATIVO_SALDO * exacto, CENTAVO):
+            raise SystemExit(f"El percentil {q} del saldo ({aproximado}) se aleja del exacto ({exacto})")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark del Monte Carlo de mora")
+    parser.add_argument("--caminos", type=int, nargs="+", default=[100_000, 1_000_000])
+    parser.add_argument("--verificar", type=int, default=500, help="caminos comparados contra main.py")
+    parser.add_argument("--semilla", type=int, default=5)
+    args = parser.parse_args()
+
+    capital, tasa, plazo, max_meses = 25_000.0, 1.8, 60, 240
+    p_inc, p_parcial, fraccion = 0.06, 0.12, 0.4
+    verificar(capital, tasa, plazo, p_inc, p_parcial, fraccion, args.verificar, max_meses, args.semilla)
+    verificar(capital, 0.0, plazo, p_inc, p_parcial, fraccion, args.verificar, max_meses, args.semilla)
+
+    repetido = simular_mora(capital, tasa, plazo, p_inc, p_parcial, fraccion, 20_000, max_meses, args.semilla,
+                            tamano_bloque=7_000, guardar_saldos=True)
+    otra_vez = simular_mora(capital, tasa, plazo, p_inc, p_parcial, fraccion, 20_000, max_meses, args.semilla,
+                            tamano_bloque=7_000)
+    if not np.array_equal(repetido['histograma_saldo'], otra_vez['histograma_saldo']):
+        raise SystemExit("La misma semilla no reproduce la simulación")
+    verificar_percentiles(repetido)
+    # Horizonte igual al plazo con mucha mora: la mayoría de los caminos termina con saldo
+    verificar_percentiles(simular_mora(capital, tasa, plazo, 0.5, 0.2, fraccion, 20_000, plazo,
+                                       args.semilla, guardar_saldos=True))
+
+    print(f"Crédito {capital:,.0f} al {tasa} % mensual, {plazo} meses; "
+          f"incumple {p_inc:.0%}, parcial {p_parcial:.0%} (verificados {args.verificar} caminos)")
+    print(f"{'Caminos':>10} | {'Tiempo (s)':>10} | {'Caminos/s':>12} | {'Liquidados':>10} | "
+          f"{'Meses p50/p99':>13} | {'Saldo final p99':>15}")
+    for caminos in args.caminos:
+        inicio = time.perf_counter()
+        resultado = simular_mora(capital, tasa, plazo, p_inc, p_parcial, fraccion, caminos, max_meses, args.semilla)
+        tiempo = time.perf_counter() - inicio
+        histograma = resultado['histograma_meses']
+        meses = f"{percentil_meses(histograma, 50)}/{percentil_meses(histograma, 99)}"
+        print(f"{caminos:>10,} | {tiempo:>10.2f} | {caminos / tiempo:>12,.0f} | {resultado['liquidados']:>10,} | "
+              f"{meses:>13} | {percentil_saldo(resultado['histograma_saldo'], resultado['bordes_saldo'], 99):>15,.2f}")
+
+
+if __name__ == "__main__":
+    main()
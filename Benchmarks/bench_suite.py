@@ -0,0 +1,262 @@
+import argparse
+import io
+import json
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import time
+from datetime import date, timedelta
+from decimal import Decimal
+from pathlib import Path
+from typing import Callable, Dict, List, Tuple
+
+RAIZ = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(RAIZ / "Backend"))
+sys.path.insert(0, str(RAIZ / "Extras"))
+
+import main
+import main_mejorado
+import mora_float
+from fechas_mora import calcular_meses_de_mora
+
+# =================================================================
+# Archivo: bench_suite.py
+# Propósito: Suite reproducible de todos los caminos calientes, con
+#            resultados en JSON para comparar entre commits
+# =================================================================
+
+
+# ==================== CARTERA SINTÉTICA ====================
+
+def generar_cartera(n: int, semilla: int):
+    """Créditos sintéticos: capital, tasa y plazo, fechas y un patrón de pagos por crédito."""
+    rng = random.Random(semilla)
+    creditos = []
+    for _ in range(n):
+        aprobacion = date(2020, 1, 1) + timedelta(days=rng.randrange(5 * 365))
+        creditos.append({
+            'capital': round(rng.uniform(500, 100_000), 2),
+            'tasa': round(rng.uniform(0, 5), 2),
+            'plazo': rng.randint(1, 120),
+            'aprobacion': aprobacion,
+            'pago_real': aprobacion + timedelta(days=rng.randrange(3 * 365)),
+            # Por mes: 0 = paga la cuota, 1 = paga la mitad, 2 = no paga
+            'patron': [rng.choices((0, 1, 2), weights=(8, 1, 1))[0] for _ in range(12)],
+        })
+    return creditos
+
+
+# ==================== CASOS ====================
+# Cada caso recibe la cartera y los argumentos y devuelve (función sin argumentos, operaciones por llamada).
+
+def caso_cuota_fija(cartera, args):
+    entradas = [(c['capital'], c['tasa'], c['plazo']) for c in cartera]
+
+    def correr():
+        main.configurar_cache_factores(main.TAMANO_CACHE_FACTORES)  # cada repetición parte con la caché vacía
+        for capital, tasa, plazo in entradas:
+            main.calcular_cuota_fija(capital, tasa, plazo)
+    return correr, len(entradas)
+
+
+def caso_sumar_un_mes(cartera, args):
+    fechas = [c['aprobacion'] for c in cartera]
+
+    def correr():
+        for fecha in fechas:
+            for _ in range(12):
+                fecha = main.sumar_un_mes(fecha)
+    return correr, 12 * len(fechas)
+
+
+def caso_meses_de_mora(cartera, args):
+    pares = [(c['aprobacion'], c['pago_real']) for c in cartera]
+
+    def correr():
+        for esperada, real in pares:
+            calcular_meses_de_mora(esperada, real)
+    return correr, len(pares)
+
+
+def caso_mora_float(cartera, args):
+    entradas = [(c['capital'], c['tasa']) for c in cartera]
+
+    def correr():
+        for capital, tasa in entradas:
+            mora_float.actualizar_capital_por_meses(capital, tasa, args.meses_mora)
+    return correr, len(entradas) * args.meses_mora
+
+
+def caso_mora_decimal(cartera, args):
+    entradas = [(Decimal(str(c['capital'])), Decimal(str(c['tasa']))) for c in cartera]
+
+    def correr():
+        for capital, tasa in entradas:
+            main_mejorado.actualizar_capital_por_meses(capital, tasa, args.meses_mora)
+    return correr, len(entradas) * args.meses_mora
+
+
+def caso_mora_decimal_perezoso(cartera, args):
+    entradas = [(Decimal(str(c['capital'])), Decimal(str(c['tasa']))) for c in cartera]
+
+    def correr():
+        for capital, tasa in entradas:
+            main_mejorado.actualizar_capital_por_meses(capital, tasa, args.meses_mora, perezoso=True)
+    return correr, len(entradas) * args.meses_mora
+
+
+def caso_bucle_pagos(cartera, args):
+    """La lógica del bucle de `Backend/main.py::main` con pagos sintéticos en lugar de `input()`."""
+    def pagador(patron):
+        def obtener_pago(mes, saldo, cuota_esperada, fecha_limite, es_plazo_extra):
+            if es_plazo_extra:
+                return cuota_esperada
+            return (cuota_esperada, cuota_esperada / 2, None)[patron[mes % len(patron)]]
+        return obtener_pago
+
+    creditos = [(c['capital'], c['tasa'], c['plazo'], c['aprobacion'], pagador(c['patron'])) for c in cartera]
+    filas = [0]
+
+    def correr():
+        total = 0
+        for capital, tasa, plazo, aprobacion, obtener_pago in creditos:
+            for _ in main.generar_tabla_amortizacion(capital, tasa, plazo, aprobacion, obtener_pago):
+                total += 1
+        filas[0] = total
+    correr()
+    return correr, filas[0]
+
+
+def caso_exportar_pdf(cartera, args):
+    # Depende de reportlab; si no está instalado el caso se omite
+    from reporte_pdf import escribir_estado_pdf
+
+    estados = []
+    for c in cartera[:args.estados_pdf]:
+        capital = Decimal(str(c['capital']))
+        capital_final, historial = main_mejorado.actualizar_capital_por_meses(capital, Decimal(str(c['tasa'])), 600)
+        estados.append((capital, capital_final, historial))
+
+    def correr():
+        for capital, capital_final, historial in estados:
+            escribir_estado_pdf(io.BytesIO(), capital, capital_final, historial)
+    return correr, len(estados)
+
+
+CASOS: Dict[str, Callable] = {
+    'cuota_fija': caso_cuota_fija,
+    'sumar_un_mes': caso_sumar_un_mes,
+    'meses_de_mora': caso_meses_de_mora,
+    'mora_float': caso_mora_float,
+    'mora_decimal': caso_mora_decimal,
+    'mora_decimal_perezoso': caso_mora_decimal_perezoso,
+    'bucle_pagos': caso_bucle_pagos,
+    'exportar_pdf': caso_exportar_pdf,
+}
+
+
+# ==================== MEDICIÓN ====================
+
+def medir(correr: Callable, repeticiones: int, calentamiento: int) -> List[float]:
+    for _ in range(calentamiento):
+        correr()
+    tiempos = []
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        correr()
+        tiempos.append(time.perf_counter() - inicio)
+    return tiempos
+
+
+def commit_actual() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=RAIZ,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "desconocido"
+
+
+def comparar(actual: Dict, anterior: Dict, umbral: float) -> List[Tuple[str, float]]:
+    """Casos cuya mediana empeoró más que `umbral` (por ejemplo 1.10 = 10 % más lenta)."""
+    regresiones = []
+    print(f"\nComparación con {anterior['metadatos']['commit']}:")
+    print(f"{'Caso':<24} | {'Antes (s)':>10} | {'Ahora (s)':>10} | {'Ahora/antes':>11}")
+    for nombre, resultado in actual['casos'].items():
+        previo = anterior['casos'].get(nombre)
+        if previo is None:
+            continue
+        razon = resultado['mediana'] / previo['mediana']
+        marca = "  REGRESIÓN" if razon > umbral else ""
+        print(f"{nombre:<24} | {previo['mediana']:>10.4f} | {resultado['mediana']:>10.4f} | {razon:>10.2f}x{marca}")
+        if razon > umbral:
+            regresiones.append((nombre, razon))
+    return regresiones
+
+
+def main_suite():
+    parser = argparse.ArgumentParser(description="Suite de benchmarks de los caminos calientes")
+    parser.add_argument("--prestamos", type=int, default=5_000, help="tamaño de la cartera sintética")
+    parser.add_argument("--semilla", type=int, default=12345)
+    parser.add_argument("--meses-mora", type=int, default=60)
+    parser.add_argument("--estados-pdf", type=int, default=20)
+    parser.add_argument("--repeticiones", type=int, default=5)
+    parser.add_argument("--calentamiento", type=int, default=1)
+    parser.add_argument("--solo", nargs="+", choices=list(CASOS), help="correr solo estos casos")
+    parser.add_argument("--salida", help="archivo JSON donde guardar los resultados")
+    parser.add_argument("--comparar", help="JSON de una corrida anterior para detectar regresiones")
+    parser.add_argument("--umbral", type=float, default=1.10, help="razón de medianas que cuenta como regresión")
+    args = parser.parse_args()
+
+    cartera = generar_cartera(args.prestamos, args.semilla)
+    resultados = {
+        'metadatos': {
+            'commit': commit_actual(),
+            'python': platform.python_version(),
+            'plataforma': platform.platform(),
+            'fecha': time.strftime("%Y-%m-%dT%H:%M:%S"),
+            'parametros': {k: v for k, v in vars(args).items() if k not in ('salida', 'comparar')},
+        },
+        'casos': {},
+        'omitidos': {},
+    }
+
+    print(f"{'Caso':<24} | {'Mediana (s)':>11} | {'Mínimo (s)':>10} | {'Desv. (s)':>9} | {'Operaciones/s':>14}")
+    for nombre in args.solo or CASOS:
+        try:
+            correr, operaciones = CASOS[nombre](cartera, args)
+        except ImportError as e:
+            resultados['omitidos'][nombre] = str(e)
+            print(f"{nombre:<24} | omitido ({e})")
+            continue
+
+        tiempos = medir(correr, args.repeticiones, args.calentamiento)
+        mediana = statistics.median(tiempos)
+        resultados['casos'][nombre] = {
+            'operaciones': operaciones,
+            'tiempos': tiempos,
+            'mediana': mediana,
+            'minimo': min(tiempos),
+            'media': statistics.fmean(tiempos),
+            'desviacion': statistics.stdev(tiempos) if len(tiempos) > 1 else 0.0,
+            'operaciones_por_segundo': operaciones / mediana if mediana else 0.0,
+        }
+        r = resultados['casos'][nombre]
+        print(f"{nombre:<24} | {mediana:>11.4f} | {r['minimo']:>10.4f} | {r['desviacion']:>9.4f} | "
+              f"{r['operaciones_por_segundo']:>14,.0f}")
+
+    if args.salida:
+        with open(args.salida, "w", encoding="utf-8") as archivo:
+            json.dump(resultados, archivo, indent=2, ensure_ascii=False)
+        print(f"\nResultados guardados en {args.salida}")
+
+    if args.comparar:
+        with open(args.comparar, encoding="utf-8") as archivo:
+            anterior = json.load(archivo)
+        if comparar(resultados, anterior, args.umbral):
+            raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main_suite()
@@ -0,0 +1,109 @@
+import argparse
+import itertools
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "Backend"))
+
+from main import generar_tabla_amortizacion
+from tabla_binaria import MAX_MESES, EscritorTablas, TablaBinaria, escribir_tablas
+
+# =================================================================
+# Archivo: bench_tabla_binaria.py
+# Propósito: Consultas puntuales de saldo: archivo binario (mmap) contra recalcular la tabla
+# =================================================================
+
+
+def generar_cartera(n: int, semilla: int = 99):
+    rng = random.Random(semilla)
+    prestamos = [(pid, round(rng.uniform(1_000, 80_000), 2), round(rng.uniform(0.5, 4), 2), rng.randint(6, 120),
+                  date(2022, 1, 1) + timedelta(days=rng.randrange(730))) for pid in range(1, n + 1)]
+    impagos = {(pid, mes) for pid, *_ in prestamos for mes in range(1, 121) if rng.random() < 0.05}
+    return prestamos, impagos
+
+
+def verificar_ids_dispersos(carpeta: str) -> None:
+    """Ids muy separados no agrandan el índice; nunca se guardan montos no finitos."""
+    ruta = os.path.join(carpeta, "dispersos.bin")
+    ids = [1, 7, 10**10, 2**62, -5]
+    prestamos = [(pid, 1_000.0 * (k + 1), 1.5, 12, date(2024, 1, 31)) for k, pid in enumerate(ids)]
+    escribir_tablas(ruta, prestamos)
+    tablas = TablaBinaria(ruta)
+    if len(tablas.indice) != len(ids) or list(tablas) != sorted(ids):
+        raise SystemExit("El índice no tiene una entrada por préstamo")
+    for pid, capital, tasa, plazo, aprobacion in prestamos:
+        esperado = list(generar_tabla_amortizacion(capital, tasa, plazo, aprobacion))
+        if tablas.meses(pid) != len(esperado) or abs(tablas.saldo(pid, 5) - round(esperado[4]['saldo'], 2)) > 0.005:
+            raise SystemExit(f"El préstamo {pid} no se lee bien con ids dispersos")
+    if 8 in tablas or 10**10 + 1 in tablas or 2**70 in tablas:
+        raise SystemExit("Se encontró un préstamo inexistente")
+    del tablas
+
+    with EscritorTablas(os.path.join(carpeta, "invalidos.bin")) as escritor:
+        for capital in (float('nan'), float('inf'), 1e300):
+            try:
+                escritor.agregar(1, capital, [])
+            except ValueError:
+                continue
+            raise SystemExit(f"Se aceptó el capital {capital}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark del formato binario de tablas de amortización")
+    parser.add_argument("--prestamos", type=int, default=20_000)
+    parser.add_argument("--consultas", type=int, default=20_000)
+    args = parser.parse_args()
+
+    prestamos, impagos = generar_cartera(args.prestamos)
+
+    def obtener_pago(prestamo_id, mes, saldo, cuota_esperada, fecha_limite, es_plazo_extra):
+        return None if (prestamo_id, mes) in impagos else cuota_esperada
+
+    rng = random.Random(1)
+    consultas = [(p, rng.randint(1, p[3])) for p in rng.choices(prestamos, k=args.consultas)]
+
+    with tempfile.TemporaryDirectory() as carpeta:
+        verificar_ids_dispersos(carpeta)
+        ruta = os.path.join(carpeta, "tablas.bin")
+        inicio = time.perf_counter()
+        filas = escribir_tablas(ruta, prestamos, obtener_pago)
+        t_escritura = time.perf_counter() - inicio
+        tamano = os.path.getsize(ruta)
+        print(f"Escritura: {len(prestamos):,} préstamos, {filas:,} filas, {tamano / 2**20:.1f} MB "
+              f"({tamano / filas:.0f} bytes/fila) en {t_escritura:.2f} s")
+
+        inicio = time.perf_counter()
+        tablas = TablaBinaria(ruta)
+        t_apertura = time.perf_counter() - inicio
+
+        inicio = time.perf_counter()
+        binario = [tablas.saldo(p[0], mes) for p, mes in consultas]
+        t_binario = time.perf_counter() - inicio
+
+        inicio = time.perf_counter()
+        recalculado = []
+        for (pid, capital, tasa, plazo, aprobacion), mes in consultas:
+            def pagar(*estado_mes, _id=pid):
+                return obtener_pago(_id, *estado_mes)
+            filas_mes = itertools.islice(generar_tabla_amortizacion(capital, tasa, plazo, aprobacion, pagar),
+                                         min(mes, MAX_MESES))
+            recalculado.append(list(filas_mes)[-1]['saldo'])
+        t_recalculo = time.perf_counter() - inicio
+
+        if any(abs(b - round(r, 2)) > 0.005 for b, r in zip(binario, recalculado)):
+            raise SystemExit("Los saldos del archivo difieren de generar_tabla_amortizacion")
+        del tablas
+
+    print(f"Apertura del archivo: {t_apertura * 1e3:.2f} ms")
+    print(f"{'Método':<12} | {'Consultas/s':>12} | {'µs/consulta':>11}")
+    for nombre, segundos in (("mmap", t_binario), ("recalcular", t_recalculo)):
+        print(f"{nombre:<12} | {len(consultas) / segundos:>12,.0f} | {segundos / len(consultas) * 1e6:>11.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,281 @@
+import argparse
+import hashlib
+import json
+import threading
+import time
+from array import array
+from collections import OrderedDict
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from dinero import Dinero
+from fechas_mora import calcular_meses_de_mora
+from historial import Historial
+from main_mejorado import (_to_decimal, actualizar_capital_por_meses, parse_capital, parse_fecha, parse_tasa,
+                           run_cli, validar_capital_y_tasa)
+
+# =========================================
+#   CACHÉ DE RESULTADOS POR CONSULTA NORMALIZADA
+# =========================================
+#
+# La clave es el SHA-256 de la consulta normalizada (capital, tasa, fecha esperada,
+# fecha real), así que "1000,50" y "1000.5" comparten resultado. Hay un nivel en
+# memoria (LRU con TTL) y, opcionalmente, uno en disco (SQLite en modo WAL) que
+# varios procesos pueden compartir.
+
+VERSION_CALCULO = 1  # subirla invalida lo guardado en disco si cambian las reglas
+MAX_ENTRADAS = 1024
+MAX_ENTRADAS_DISCO = 100_000
+TTL = 300.0  # segundos; None = sin vencimiento
+PODA_CADA = 64  # escrituras en disco entre podas por tamaño
+
+ESQUEMA = """
+CREATE TABLE IF NOT EXISTS resultados (
+    clave   TEXT PRIMARY KEY,
+    expira  REAL,
+    valor   TEXT NOT NULL
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS resultados_por_vencimiento ON resultados (expira);
+"""
+
+# ==================== NORMALIZACIÓN ====================
+
+def _texto_decimal(valor: Decimal) -> str:
+    """Texto canónico de un Decimal (sin ceros de más) sin redondear a la precisión del contexto."""
+    texto = format(valor, 'f')
+    if '.' in texto:
+        texto = texto.rstrip('0').rstrip('.')
+    return '0' if texto in ('-0', '') else texto
+
+
+def _fecha(valor: str | date) -> date:
+    if isinstance(valor, datetime):
+        return valor.date()
+    if isinstance(valor, date):
+        return valor
+    return parse_fecha(valor)
+
+
+def normalizar_consulta(capital, tasa, fecha_esperada, fecha_real) -> Tuple[Decimal, Decimal, date, date]:
+    """Pasa la consulta por `_to_decimal` y `parse_fecha` (textos como los de `run_cli`)."""
+    capital = parse_capital(capital) if isinstance(capital, str) else _to_decimal(capital)
+    tasa = parse_tasa(tasa) if isinstance(tasa, str) else _to_decimal(tasa)
+    capital, tasa = Decimal(_texto_decimal(capital)), Decimal(_texto_decimal(tasa))
+    return capital, tasa, _fecha(fecha_esperada), _fecha(fecha_real)
+
+
+def clave_consulta(capital: Decimal, tasa: Decimal, fecha_esperada: date, fecha_real: date,
+                   espacio: str = 'decimal') -> str:
+    """Clave de contenido de una consulta ya normalizada; `espacio` separa variantes del cálculo."""
+    texto = '|'.join((str(VERSION_CALCULO), espacio, _texto_decimal(capital), _texto_decimal(tasa),
+                      fecha_esperada.isoformat(), fecha_real.isoformat()))
+    return hashlib.sha256(texto.encode()).hexdigest()
+
+# ==================== CÁLCULO POR DEFECTO ====================
+
+def cotizar_mora(capital: Decimal, tasa: Decimal, fecha_esperada: date, fecha_real: date) -> Tuple[int, Decimal, Historial]:
+    """(meses_mora, capital_final, historial) con las reglas de `run_cli`."""
+    validar_capital_y_tasa(capital, tasa)
+    meses_mora = calcular_meses_de_mora(fecha_esperada, fecha_real)
+    if meses_mora == 0:
+        return 0, capital, Historial('decimal')
+    capital_final, historial = actualizar_capital_por_meses(capital, tasa, meses_mora)
+    return meses_mora, capital_final, historial
+
+# ==================== FORMATO EN DISCO ====================
+
+def _a_json(valor):
+    if isinstance(valor, Historial):
+        return {'historial': valor.tipo, 'meses': list(valor.meses),
+                'columnas': [list(c) for c in (valor.capital_antes, valor.interes, valor.capital_despues)]}
+    if isinstance(valor, Dinero):
+        return {'dinero': valor.centavos}
+    if isinstance(valor, Decimal):
+        return {'decimal': str(valor)}
+    if isinstance(valor, date):
+        return {'fecha': valor.isoformat()}
+    if isinstance(valor, (tuple, list)):
+        return [_a_json(v) for v in valor]
+    if valor is None or isinstance(valor, (bool, int, float, str)):
+        return valor
+    raise TypeError(f"No se puede guardar en disco un {type(valor).__name__}")
+
+
+def _desde_json(valor):
+    if isinstance(valor, list):
+        return tuple(_desde_json(v) for v in valor)
+    if not isinstance(valor, dict):
+        return valor
+    if 'historial' in valor:
+        historial = Historial(valor['historial'])
+        codigo = 'd' if historial.tipo == 'float' else 'q'
+        historial.meses = array('i', valor['meses'])
+        try:
+            columnas = [array(codigo, c) for c in valor['columnas']]
+        except OverflowError:
+            columnas = valor['columnas']
+        historial.capital_antes, historial.interes, historial.capital_despues = columnas
+        return historial
+    if 'dinero' in valor:
+        return Dinero(valor['dinero'])
+    if 'decimal' in valor:
+        return Decimal(valor['decimal'])
+    return date.fromisoformat(valor['fecha'])
+
+# ==================== CACHÉ ====================
+
+class CacheResultados:
+    """Resultados de `calcular` por consulta normalizada, con TTL y tamaño acotado.
+
+    El nivel en memoria es un LRU de `max_entradas`; con `ruta_disco` hay además
+    un nivel SQLite compartido entre procesos, acotado a `max_entradas_disco`
+    (se desalojan primero los que vencen antes). Los errores de `calcular` no se
+    guardan. Es seguro usarla desde varios hilos (p. ej. el hilo de la ventana y
+    el del cálculo en segundo plano).
+    """
+
+    def __init__(self, calcular: Callable[..., Any] = cotizar_mora, espacio: str = 'decimal',
+                 max_entradas: int = MAX_ENTRADAS, ttl: Optional[float] = TTL,
+                 ruta_disco: Optional[str] = None, max_entradas_disco: int = MAX_ENTRADAS_DISCO,
+                 reloj: Callable[[], float] = time.time):
+        self.calcular = calcular
+        self.espacio = espacio
+        self.max_entradas = max_entradas
+        self.ttl = ttl
+        self.max_entradas_disco = max_entradas_disco
+        self.reloj = reloj
+        self._memoria: 'OrderedDict[str, Tuple[Optional[float], Any]]' = OrderedDict()
+        self._cerrojo = threading.Lock()
+        self._escrituras = 0
+        self.aciertos_memoria = self.aciertos_disco = self.fallos = 0
+        self.vencidos = self.desalojos = 0
+
+        self._disco = None
+        if ruta_disco is not None:
+            import sqlite3
+            self._disco = sqlite3.connect(ruta_disco, timeout=30, check_same_thread=False)
+            self._disco.execute("PRAGMA journal_mode=WAL")
+            self._disco.execute("PRAGMA synchronous=NORMAL")
+            self._disco.executescript(ESQUEMA)
+
+    def cerrar(self) -> None:
+        if self._disco is not None:
+            self._disco.close()
+            self._disco = None
+
+    def __enter__(self) -> 'CacheResultados':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.cerrar()
+
+    # ==================== CONSULTA ====================
+
+    def clave(self, capital, tasa, fecha_esperada, fecha_real) -> str:
+        return clave_consulta(*normalizar_consulta(capital, tasa, fecha_esperada, fecha_real), espacio=self.espacio)
+
+    def obtener(self, capital, tasa, fecha_esperada, fecha_real) -> Any:
+        """Resultado de `calcular` para la consulta, calculándolo solo si no está guardado."""
+        consulta = normalizar_consulta(capital, tasa, fecha_esperada, fecha_real)
+        clave = clave_consulta(*consulta, espacio=self.espacio)
+        encontrado, valor = self._buscar(clave)
+        if not encontrado:
+            valor = self.calcular(*consulta)
+            self.guardar(clave, valor)
+        return valor
+
+    def buscar(self, clave: str, defecto: Any = None) -> Any:
+        """Valor guardado con `clave`, o `defecto` (cuenta como fallo)."""
+        encontrado, valor = self._buscar(clave)
+        return valor if encontrado else defecto
+
+    def _buscar(self, clave: str) -> Tuple[bool, Any]:
+        ahora = self.reloj()
+        with self._cerrojo:
+            entrada = self._memoria.get(clave)
+            if entrada is not None:
+                if entrada[0] is None or entrada[0] > ahora:
+                    self._memoria.move_to_end(clave)
+                    self.aciertos_memoria += 1
+                    return True, entrada[1]
+                del self._memoria[clave]
+                self.vencidos += 1
+
+            if self._disco is not None:
+                fila = self._disco.execute("SELECT expira, valor FROM resultados WHERE clave = ?", (clave,)).fetchone()
+                if fila is not None:
+                    if fila[0] is None or fila[0] > ahora:
+                        valor = _desde_json(json.loads(fila[1]))
+                        self._en_memoria(clave, fila[0], valor)
+                        self.aciertos_disco += 1
+                        return True, valor
+                    self.vencidos += 1
+
+            self.fallos += 1
+            return False, None
+
+    # ==================== ESCRITURA ====================
+
+    def guardar(self, clave: str, valor: Any) -> None:
+        expira = None if self.ttl is None else self.reloj() + self.ttl
+        texto = None if self._disco is None else json.dumps(_a_json(valor), separators=(',', ':'))
+        with self._cerrojo:
+            self._en_memoria(clave, expira, valor)
+            if texto is not None:
+                with self._disco:
+                    self._disco.execute("INSERT OR REPLACE INTO resultados VALUES (?, ?, ?)", (clave, expira, texto))
+                self._escrituras += 1
+                if self._escrituras % PODA_CADA == 0:
+                    self._podar_disco()
+
+    def _en_memoria(self, clave: str, expira: Optional[float], valor: Any) -> None:
+        self._memoria[clave] = (expira, valor)
+        self._memoria.move_to_end(clave)
+        while len(self._memoria) > self.max_entradas:
+            self._memoria.popitem(last=False)
+            self.desalojos += 1
+
+    def _podar_disco(self) -> None:
+        with self._disco:
+            self._disco.execute("DELETE FROM resultados WHERE expira <= ?", (self.reloj(),))
+            sobrantes = self._disco.execute("SELECT COUNT(*) FROM resultados").fetchone()[0] - self.max_entradas_disco
+            if sobrantes > 0:
+                # Sin vencimiento (NULL) se ordena primero en SQLite: se desalojan antes los que vencen antes
+                self._disco.execute(
+                    "DELETE FROM resultados WHERE clave IN (SELECT clave FROM resultados "
+                    "ORDER BY expira IS NULL, expira LIMIT ?)", (sobrantes,))
+                self.desalojos += sobrantes
+
+    def limpiar(self) -> None:
+        """Vacía ambos niveles (el de disco, para todos los procesos que lo comparten)."""
+        with self._cerrojo:
+            self._memoria.clear()
+            if self._disco is not None:
+                with self._disco:
+                    self._disco.execute("DELETE FROM resultados")
+
+    # ==================== MÉTRICAS ====================
+
+    def estadisticas(self) -> Dict[str, Any]:
+        """Aciertos por nivel, fallos, vencidos, desalojos y tasa de aciertos."""
+        consultas = self.aciertos_memoria + self.aciertos_disco + self.fallos
+        return {
+            'aciertos_memoria': self.aciertos_memoria,
+            'aciertos_disco': self.aciertos_disco,
+            'fallos': self.fallos,
+            'vencidos': self.vencidos,
+            'desalojos': self.desalojos,
+            'entradas_memoria': len(self._memoria),
+            'tasa_aciertos': (self.aciertos_memoria + self.aciertos_disco) / consultas if consultas else 0.0,
+        }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Calculadora de mora por consola con caché de resultados en disco.")
+    parser.add_argument("--disco", default="cache_resultados.db", help="archivo SQLite compartido entre procesos")
+    parser.add_argument("--ttl", type=float, default=TTL)
+    args = parser.parse_args()
+
+    with CacheResultados(ttl=args.ttl, ruta_disco=args.disco) as cache:
+        run_cli(cache)
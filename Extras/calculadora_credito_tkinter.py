@@ -2,45 +2,11 @@ import tkinter as tk
 from tkinter import ttk, messagebox
 from datetime import datetime
 
-
-# =============== LÓGICA DEL CRÉDITO ===================
-
-def calcular_interes(capital, tasa):
-    return capital * (tasa / 100)
-
-
-def actualizar_capital_por_meses(capital, tasa, meses_mora):
-    historial = []
-
-    for mes in range(1, meses_mora + 1):
-        interes = calcular_interes(capital, tasa)
-        nuevo_capital = capital + interes
-
-        historial.append({
-            "mes": mes,
-            "capital_antes": round(capital, 2),
-            "interes": round(interes, 2),
-            "capital_despues": round(nuevo_capital, 2)
-        })
-
-        capital = nuevo_capital
-
-    return capital, historial
-
-
-def calcular_meses_de_mora(fecha_pago_esperado, fecha_pago_real):
-    if fecha_pago_real <= fecha_pago_esperado:
-        return 0  # Pagó a tiempo
-
-    years_diff = fecha_pago_real.year - fecha_pago_esperado.year
-    months_diff = fecha_pago_real.month - fecha_pago_esperado.month
-
-    meses = years_diff * 12 + months_diff
-
-    if fecha_pago_real.day < fecha_pago_esperado.day:
-        meses -= 1
-
-    return max(0, meses)
+from cache_resultados import CacheResultados
+from fechas_mora import calcular_meses_de_mora
+from mora_float import actualizar_capital_por_meses
+from tabla_tk import TablaPerezosa
+from tareas_tk import EjecutorTk
 
 
 # =============== INTERFAZ TKINTER ===================
@@ -59,34 +25,65 @@ def procesar():
 
     meses_mora = calcular_meses_de_mora(fecha_esperada, fecha_real)
 
-    # Limpiamos tabla
-    for row in tabla.get_children():
-        tabla.delete(row)
+    # Cancelamos un cálculo anterior y limpiamos tabla
+    ejecutor.cancelar()
+    tabla_perezosa.limpiar()
 
     if meses_mora == 0:
         messagebox.showinfo("Resultado", f"El pago fue puntual.\nCapital final: ${capital:,.2f}")
         return
 
-    capital_final, historial = actualizar_capital_por_meses(capital, tasa, meses_mora)
+    # Una consulta repetida (misma entrada normalizada) se muestra sin recalcular
+    clave = cache.clave(capital, tasa, fecha_esperada, fecha_real)
+    resultado = cache.buscar(clave)
+    if resultado is not None:
+        mostrar_resultado(resultado)
+        return
 
-    # Insertar filas en la tabla
-    for h in historial:
-        tabla.insert("", "end", values=(
-            h["mes"],
-            h["capital_antes"],
-            h["interes"],
-            h["capital_despues"]
-        ))
+    ejecutor.iniciar(calcular_en_segundo_plano, clave, capital, tasa, meses_mora,
+                     al_terminar=mostrar_resultado, al_error=mostrar_error,
+                     al_progreso=mostrar_progreso, al_cancelar=limpiar_progreso)
+
+
+def calcular_en_segundo_plano(tarea, clave, capital, tasa, meses_mora):
+    # Corre fuera del hilo de Tk: no debe tocar widgets
+    capital_final, historial = actualizar_capital_por_meses(capital, tasa, meses_mora, progreso=tarea.progreso)
+    resultado = meses_mora, capital_final, historial
+    cache.guardar(clave, resultado)
+    return resultado
+
+
+def mostrar_resultado(resultado):
+    meses_mora, capital_final, historial = resultado
+    limpiar_progreso()
+
+    # Insertar filas en la tabla (por bloques, a medida que se desplaza)
+    tabla_perezosa.mostrar(historial)
 
     messagebox.showinfo("Resultado",
                         f"Meses de mora: {meses_mora}\n\nCapital final: ${capital_final:,.2f}")
 
 
+def mostrar_error(error):
+    limpiar_progreso()
+    messagebox.showerror("Error", f"No se pudo completar el cálculo\n{error}")
+
+
+def mostrar_progreso(hecho, total, texto):
+    barra_progreso["value"] = 100 * hecho / total if total else 0
+    etiqueta_progreso["text"] = f"{texto}... {hecho:,}/{total:,}"
+
+
+def limpiar_progreso():
+    barra_progreso["value"] = 0
+    etiqueta_progreso["text"] = ""
+
+
 # =============== CREACIÓN DE LA VENTANA ===================
 
 ventana = tk.Tk()
 ventana.title("Calculadora de Crédito con Mora")
-ventana.geometry("650x500")
+ventana.geometry("650x580")
 
 # ==== Entradas ====
 
@@ -109,15 +106,32 @@ entry_fecha_real.pack()
 # Botón
 tk.Button(ventana, text="Calcular", command=procesar, bg="green", fg="white").pack(pady=10)
 
+# ==== Progreso ====
+
+barra_progreso = ttk.Progressbar(ventana, mode="determinate", maximum=100, length=300)
+barra_progreso.pack()
+etiqueta_progreso = tk.Label(ventana, text="")
+etiqueta_progreso.pack()
+tk.Button(ventana, text="Cancelar", command=lambda: ejecutor.cancelar()).pack(pady=5)
+
 # ==== Tabla ====
 
 columnas = ("Mes", "Capital Antes", "Interés", "Capital Después")
-tabla = ttk.Treeview(ventana, columns=columnas, show="headings", height=10)
+marco_tabla = tk.Frame(ventana)
+marco_tabla.pack(expand=True)
+tabla = ttk.Treeview(marco_tabla, columns=columnas, show="headings", height=10)
+barra_tabla = ttk.Scrollbar(marco_tabla, orient="vertical")
 
 for col in columnas:
     tabla.heading(col, text=col)
     tabla.column(col, anchor="center", width=120)
 
-tabla.pack(expand=True)
+tabla.pack(side="left", expand=True)
+barra_tabla.pack(side="right", fill="y")
+tabla_perezosa = TablaPerezosa(tabla, barra_tabla)
+
+ejecutor = EjecutorTk(ventana)
+cache = CacheResultados(espacio='float')
 
 ventana.mainloop()
+ejecutor.cerrar()
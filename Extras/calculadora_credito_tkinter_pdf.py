@@ -1,51 +1,12 @@
 import tkinter as tk
-from tkinter import ttk, messagebox
+from tkinter import ttk, messagebox, filedialog
 from datetime import datetime
-from reportlab.lib.pagesizes import letter
-from reportlab.pdfgen import canvas
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 
-
-# =========================================
-#      LÓGICA DEL CRÉDITO
-# =========================================
-
-def calcular_interes(capital, tasa):
-    return capital * (tasa / 100)
-
-
-def actualizar_capital_por_meses(capital, tasa, meses_mora):
-    historial = []
-
-    for mes in range(1, meses_mora + 1):
-        interes = calcular_interes(capital, tasa)
-        nuevo_capital = capital + interes
-
-        historial.append({
-            "mes": mes,
-            "capital_antes": round(capital, 2),
-            "interes": round(interes, 2),
-            "capital_despues": round(nuevo_capital, 2)
-        })
-        capital = nuevo_capital
-
-    return capital, historial
-
-
-def calcular_meses_de_mora(fecha_pago_esperado, fecha_pago_real):
-    if fecha_pago_real <= fecha_pago_esperado:
-        return 0
-
-    years_diff = fecha_pago_real.year - fecha_pago_esperado.year
-    months_diff = fecha_pago_real.month - fecha_pago_esperado.month
-
-    meses = years_diff * 12 + months_diff
-
-    if fecha_pago_real.day < fecha_pago_esperado.day:
-        meses -= 1
-
-    return max(0, meses)
+from cache_resultados import CacheResultados
+from fechas_mora import calcular_meses_de_mora
+from mora_float import actualizar_capital_por_meses
+from tabla_tk import TablaPerezosa
+from tareas_tk import EjecutorTk
 
 
 # =========================================
@@ -53,53 +14,70 @@ def calcular_meses_de_mora(fecha_pago_esperado, fecha_pago_real):
 # =========================================
 
 def exportar_pdf(capital_inicial, capital_final, historial):
-    try:
-        archivo = "resultado_credito.pdf"
-        c = canvas.Canvas(archivo, pagesize=letter)
+    archivo = filedialog.asksaveasfilename(defaultextension=".pdf", initialfile="resultado_credito.pdf",
+                                           filetypes=[("PDF", "*.pdf")])
+    if not archivo:
+        return
 
-        c.setFont("Helvetica-Bold", 16)
-        c.drawString(50, 750, "Reporte del Crédito con Mora")
+    ejecutor.iniciar(exportar_en_segundo_plano, archivo, capital_inicial, capital_final, historial,
+                     al_terminar=lambda paginas: pdf_generado(archivo, paginas),
+                     al_error=lambda e: mostrar_error("No se pudo generar el PDF", e),
+                     al_progreso=mostrar_progreso, al_cancelar=limpiar_progreso)
 
-        c.setFont("Helvetica", 12)
-        c.drawString(50, 720, f"Capital inicial: {capital_inicial:,.2f}")
-        c.drawString(50, 700, f"Capital final: {capital_final:,.2f}")
-        c.drawString(50, 680, "Historial por mes:")
 
-        y = 660
-        for h in historial:
-            texto = (
-                f"Mes {h['mes']}: Capital antes = {h['capital_antes']}, "
-                f"Interés = {h['interes']}, Capital después = {h['capital_despues']}"
-            )
-            c.drawString(50, y, texto)
-            y -= 20
-            if y < 50:
-                c.showPage()
-                y = 750
+def exportar_en_segundo_plano(tarea, archivo, capital_inicial, capital_final, historial):
+    # reportlab se carga al exportar por primera vez, no al abrir la ventana
+    from reporte_pdf import escribir_estado_pdf
 
-        c.save()
-        messagebox.showinfo("PDF generado", f"Archivo creado: {archivo}")
+    filas = tarea.recorrer(historial, len(historial), "Exportando")
+    return escribir_estado_pdf(archivo, capital_inicial, capital_final, filas)
 
-    except Exception as e:
-        messagebox.showerror("Error", f"No se pudo generar el PDF\n{str(e)}")
+
+def pdf_generado(archivo, paginas):
+    limpiar_progreso()
+    messagebox.showinfo("PDF generado", f"Archivo creado: {archivo}\nPáginas: {paginas}")
 
 
 # =========================================
 #      GRAFICAR
 # =========================================
 
-def graficar(historial):
-    meses = [h["mes"] for h in historial]
-    capitales = [h["capital_despues"] for h in historial]
+# Con muchos meses los marcadores solo tapan la línea y hacen lento el dibujo
+MAX_MARCADORES = 200
+
+
+def crear_grafica(master):
+    # matplotlib se importa aquí, al graficar por primera vez, y no al arrancar
+    from matplotlib.figure import Figure
+    from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 
-    fig, ax = plt.subplots(figsize=(5, 3))
-    ax.plot(meses, capitales, marker="o")
+    # Una sola figura para toda la sesión: cada cálculo solo cambia los datos
+    fig = Figure(figsize=(5, 3))
+    ax = fig.add_subplot()
+    linea, = ax.plot([], [], marker="o")
     ax.set_title("Capital vs Tiempo (Meses de Mora)")
     ax.set_xlabel("Mes")
     ax.set_ylabel("Capital")
     ax.grid(True)
 
-    return fig
+    canvas_plot = FigureCanvasTkAgg(fig, master=master)
+    canvas_plot.get_tk_widget().pack()
+    return canvas_plot, ax, linea
+
+
+def graficar(meses, capitales):
+    global grafica
+    if grafica is None:
+        if not meses:
+            return
+        grafica = crear_grafica(ventana)
+    canvas_plot, ax, linea = grafica
+
+    linea.set_data(meses, capitales)
+    linea.set_marker("o" if len(meses) <= MAX_MARCADORES else "")
+    ax.relim()
+    ax.autoscale_view()
+    canvas_plot.draw_idle()
 
 
 # =========================================
@@ -118,33 +96,75 @@ def procesar():
         messagebox.showerror("Error", "Verifique los datos ingresados.")
         return
 
-    capital_inicial_global = capital
-
     meses_mora = calcular_meses_de_mora(fecha_esperada, fecha_real)
 
-    for row in tabla.get_children():
-        tabla.delete(row)
+    # Cancelamos un cálculo anterior y limpiamos tabla
+    ejecutor.cancelar()
+    tabla_perezosa.limpiar()
 
     if meses_mora == 0:
         messagebox.showinfo("Resultado", f"Pago puntual.\nCapital final: ${capital:,.2f}")
+        capital_inicial_global = capital
         historial_global = []
         capital_final_global = capital
+        graficar([], [])
+        return
+
+    # Una consulta repetida (misma entrada normalizada) se muestra sin recalcular
+    clave = cache.clave(capital, tasa, fecha_esperada, fecha_real)
+    resultado = cache.buscar(clave)
+    if resultado is not None:
+        mostrar_resultado(resultado)
         return
 
-    capital_final, historial = actualizar_capital_por_meses(capital, tasa, meses_mora)
+    ejecutor.iniciar(calcular_en_segundo_plano, clave, capital, tasa, meses_mora,
+                     al_terminar=mostrar_resultado,
+                     al_error=lambda e: mostrar_error("No se pudo completar el cálculo", e),
+                     al_progreso=mostrar_progreso, al_cancelar=limpiar_progreso)
+
+
+def calcular_en_segundo_plano(tarea, clave, capital, tasa, meses_mora):
+    # Corre fuera del hilo de Tk: calcula y prepara las series, sin tocar widgets
+    capital_final, historial = actualizar_capital_por_meses(capital, tasa, meses_mora, progreso=tarea.progreso)
+    tarea.progreso(meses_mora, meses_mora, "Graficando")
+    # La primera vez, matplotlib se importa aquí y no en el hilo de la ventana
+    import matplotlib.figure
+    serie = historial.columna("mes"), historial.columna("capital_despues")
+    resultado = capital, meses_mora, capital_final, historial, serie
+    cache.guardar(clave, resultado)
+    return resultado
+
+
+def mostrar_resultado(resultado):
+    global historial_global, capital_final_global, capital_inicial_global
+
+    capital, meses_mora, capital_final, historial, serie = resultado
+    limpiar_progreso()
 
+    capital_inicial_global = capital
     capital_final_global = capital_final
     historial_global = historial
 
-    for h in historial:
-        tabla.insert("", "end", values=(h["mes"], h["capital_antes"], h["interes"], h["capital_despues"]))
+    # La tabla inserta filas a medida que se desplaza; la gráfica se actualiza en su lugar
+    tabla_perezosa.mostrar(historial)
+    graficar(*serie)
 
     messagebox.showinfo("Resultado", f"Meses de mora: {meses_mora}\nCapital final: ${capital_final:,.2f}")
 
-    fig = graficar(historial)
-    canvas_plot = FigureCanvasTkAgg(fig, master=ventana)
-    canvas_plot.get_tk_widget().pack()
-    canvas_plot.draw()
+
+def mostrar_error(mensaje, error):
+    limpiar_progreso()
+    messagebox.showerror("Error", f"{mensaje}\n{error}")
+
+
+def mostrar_progreso(hecho, total, texto):
+    barra_progreso["value"] = 100 * hecho / total if total else 0
+    etiqueta_progreso["text"] = f"{texto}... {hecho:,}/{total:,}"
+
+
+def limpiar_progreso():
+    barra_progreso["value"] = 0
+    etiqueta_progreso["text"] = ""
 
 
 # ---------------------------------------------
@@ -171,16 +191,34 @@ entry_fecha_real.pack()
 
 tk.Button(ventana, text="Calcular", command=procesar, bg="green", fg="white").pack(pady=10)
 
+barra_progreso = ttk.Progressbar(ventana, mode="determinate", maximum=100, length=300)
+barra_progreso.pack()
+etiqueta_progreso = tk.Label(ventana, text="")
+etiqueta_progreso.pack()
+tk.Button(ventana, text="Cancelar", command=lambda: ejecutor.cancelar()).pack(pady=5)
+
 columnas = ("Mes", "Capital Antes", "Interés", "Capital Después")
-tabla = ttk.Treeview(ventana, columns=columnas, show="headings", height=8)
+marco_tabla = tk.Frame(ventana)
+marco_tabla.pack()
+tabla = ttk.Treeview(marco_tabla, columns=columnas, show="headings", height=8)
+barra_tabla = ttk.Scrollbar(marco_tabla, orient="vertical")
 
 for col in columnas:
     tabla.heading(col, text=col)
     tabla.column(col, width=150, anchor="center")
 
-tabla.pack()
+tabla.pack(side="left")
+barra_tabla.pack(side="right", fill="y")
+tabla_perezosa = TablaPerezosa(tabla, barra_tabla)
 
 tk.Button(ventana, text="Exportar PDF", bg="blue", fg="white",
           command=lambda: exportar_pdf(capital_inicial_global, capital_final_global, historial_global)).pack(pady=10)
 
+# La gráfica se crea con el primer resultado
+grafica = None
+
+ejecutor = EjecutorTk(ventana)
+cache = CacheResultados(espacio='float')
+
 ventana.mainloop()
+ejecutor.cerrar()
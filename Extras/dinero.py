@@ -0,0 +1,126 @@
+from decimal import Decimal, ROUND_HALF_UP
+from functools import total_ordering
+from typing import Tuple
+
+# =========================================
+#   DINERO EN CENTAVOS ENTEROS (PUNTO FIJO)
+# =========================================
+
+
+def redondear_mitad_arriba(numerador: int, denominador: int) -> int:
+    """División entera con ROUND_HALF_UP (la mitad se aleja de cero). `denominador` > 0."""
+    signo = -1 if numerador < 0 else 1
+    return signo * ((2 * abs(numerador) + denominador) // (2 * denominador))
+
+
+def tasa_como_fraccion(tasa_porcentaje: Decimal) -> Tuple[int, int]:
+    """Devuelve (numerador, denominador) tales que interés_centavos = centavos * num / den.
+
+    Lanza ValueError/OverflowError si la tasa no es finita.
+    """
+    num, den = Decimal(tasa_porcentaje).as_integer_ratio()
+    return num, 100 * den
+
+
+def capitalizar_centavos(centavos: int, tasa_porcentaje: Decimal, meses: int) -> int:
+    """Aplica `meses` meses de interés compuesto redondeando a centavos cada mes."""
+    num, den = tasa_como_fraccion(tasa_porcentaje)
+    for _ in range(max(0, meses)):
+        centavos += redondear_mitad_arriba(centavos * num, den)
+    return centavos
+
+
+@total_ordering
+class Dinero:
+    """Monto monetario guardado como un entero de centavos.
+
+    Las operaciones redondean con ROUND_HALF_UP, igual que el camino con
+    `Decimal.quantize(Decimal('0.01'))`, pero con aritmética entera. Coincide
+    centavo a centavo con ese camino mientras cada producto capital * tasa quepa
+    en la precisión del contexto de Decimal (28 dígitos); pasada esa cota Decimal
+    redondea el producto y Dinero sigue siendo exacto.
+    """
+
+    __slots__ = ('centavos',)
+
+    def __init__(self, centavos: int = 0):
+        self.centavos = centavos
+
+    @classmethod
+    def desde_decimal(cls, valor: Decimal) -> 'Dinero':
+        """Redondea `valor` a centavos con ROUND_HALF_UP."""
+        return cls(int(Decimal(valor).quantize(Decimal('0.01'), rounding=ROUND_HALF_UP).scaleb(2)))
+
+    def a_decimal(self) -> Decimal:
+        return Decimal(self.centavos).scaleb(-2)
+
+    def interes(self, tasa_porcentaje: Decimal) -> 'Dinero':
+        """Interés del periodo a `tasa_porcentaje` %, redondeado a centavos."""
+        num, den = tasa_como_fraccion(tasa_porcentaje)
+        return Dinero(redondear_mitad_arriba(self.centavos * num, den))
+
+    def __add__(self, otro: 'Dinero') -> 'Dinero':
+        if not isinstance(otro, Dinero):
+            return NotImplemented
+        return Dinero(self.centavos + otro.centavos)
+
+    def __sub__(self, otro: 'Dinero') -> 'Dinero':
+        if not isinstance(otro, Dinero):
+            return NotImplemented
+        return Dinero(self.centavos - otro.centavos)
+
+    def __neg__(self) -> 'Dinero':
+        return Dinero(-self.centavos)
+
+    def __eq__(self, otro) -> bool:
+        if not isinstance(otro, Dinero):
+            return NotImplemented
+        return self.centavos == otro.centavos
+
+    def __lt__(self, otro: 'Dinero') -> bool:
+        if not isinstance(otro, Dinero):
+            return NotImplemented
+        return self.centavos < otro.centavos
+
+    def __hash__(self) -> int:
+        return hash(self.centavos)
+
+    def __bool__(self) -> bool:
+        return self.centavos != 0
+
+    def __format__(self, formato: str) -> str:
+        return format(self.a_decimal(), formato)
+
+    def __str__(self) -> str:
+        return str(self.a_decimal())
+
+    def __repr__(self) -> str:
+        return f"Dinero('{self.a_decimal()}')"
+
+
+def capitalizar_centavos_lote(centavos, tasas_porcentaje, meses):
+    """Versión vectorizada de `capitalizar_centavos` para muchas cuentas (int64).
+
+    `tasas_porcentaje` es una secuencia de tasas (Decimal o texto) y `meses` un
+    escalar o un arreglo por cuenta. Lanza OverflowError si algún producto
+    intermedio dejaría de caber en int64. Requiere NumPy.
+    """
+    import numpy as np
+
+    centavos = np.array(centavos, dtype=np.int64)
+    fracciones = [tasa_como_fraccion(Decimal(str(t))) for t in tasas_porcentaje]
+    num = np.array([f[0] for f in fracciones], dtype=np.int64).reshape(-1)
+    den = np.array([f[1] for f in fracciones], dtype=np.int64).reshape(-1)
+    centavos, num, den, meses = np.broadcast_arrays(centavos, num, den, np.asarray(meses, dtype=np.int64))
+    centavos = centavos.copy()
+
+    # 2 * |centavos * num| + den debe caber en int64.
+    limite = (np.iinfo(np.int64).max - int(den.max(initial=0))) // (2 * max(int(np.abs(num).max(initial=0)), 1))
+    for mes in range(int(meses.max(initial=0))):
+        if np.abs(centavos).max(initial=0) > limite:
+            raise OverflowError("El capital excede el rango de int64 para esta tasa.")
+        producto = centavos * num
+        interes = np.sign(producto) * ((2 * np.abs(producto) + den) // (2 * den))
+        centavos += np.where(mes < meses, interes, 0)
+
+    return centavos
@@ -0,0 +1,59 @@
+from datetime import date
+
+# =========================================
+#   MESES DE MORA (IMPLEMENTACIÓN COMPARTIDA)
+# =========================================
+
+
+def calcular_meses_de_mora(fecha_pago_esperado: date, fecha_pago_real: date) -> int:
+    """Calcula meses completos de mora entre dos fechas.
+
+    Si `fecha_pago_real` <= `fecha_pago_esperado` retorna 0.
+    """
+    if fecha_pago_real <= fecha_pago_esperado:
+        return 0
+
+    years_diff = fecha_pago_real.year - fecha_pago_esperado.year
+    months_diff = fecha_pago_real.month - fecha_pago_esperado.month
+    meses = years_diff * 12 + months_diff
+
+    if fecha_pago_real.day < fecha_pago_esperado.day:
+        meses -= 1
+
+    return max(0, meses)
+
+
+def calcular_meses_de_mora_lote(fechas_pago_esperado, fechas_pago_real):
+    """Versión vectorizada de `calcular_meses_de_mora` sobre columnas de fechas.
+
+    Acepta cualquier cosa convertible a `datetime64[D]` (las horas se descartan)
+    y devuelve un arreglo int64 con los mismos conteos que la versión escalar.
+    Requiere NumPy, que solo se importa al usar esta función.
+    """
+    import numpy as np
+
+    esperado = np.asarray(fechas_pago_esperado, dtype='datetime64[D]').astype(np.int64)
+    real = np.asarray(fechas_pago_real, dtype='datetime64[D]').astype(np.int64)
+
+    año_e, mes_e, dia_e = _año_mes_dia(esperado)
+    año_r, mes_r, dia_r = _año_mes_dia(real)
+    meses = (año_r - año_e) * 12 + (mes_r - mes_e) - (dia_r < dia_e)
+
+    return np.where(real <= esperado, 0, np.maximum(meses, 0))
+
+
+def _año_mes_dia(dias):
+    """Año, mes y día de un arreglo de días desde 1970-01-01 (calendario gregoriano).
+
+    Aritmética entera pura: convertir con `astype('datetime64[M]')` es bastante más lento.
+    """
+    z = dias + 719468
+    era = z // 146097
+    doe = z - era * 146097
+    yoe = (doe - doe // 1460 + doe // 36524 - doe // 146096) // 365
+    doy = doe - (365 * yoe + yoe // 4 - yoe // 100)
+    mp = (5 * doy + 2) // 153
+    dia = doy - (153 * mp + 2) // 5 + 1
+    mes = mp + 3 - 12 * (mp >= 10)
+    año = yoe + era * 400 + (mes <= 2)
+    return año, mes, dia
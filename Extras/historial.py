@@ -0,0 +1,130 @@
+from array import array
+from decimal import Decimal
+from typing import Dict, Iterator, List
+
+from dinero import Dinero
+
+# =========================================
+#   HISTORIAL COMPACTO (COLUMNAS EN ARRAYS)
+# =========================================
+
+CAMPOS = ('mes', 'capital_antes', 'interes', 'capital_despues')
+
+
+class FilaHistorial:
+    """Fila del historial con acceso `h['mes']`, como los dicts de antes, pero sin dict."""
+
+    __slots__ = CAMPOS
+
+    def __init__(self, mes, capital_antes, interes, capital_despues):
+        self.mes = mes
+        self.capital_antes = capital_antes
+        self.interes = interes
+        self.capital_despues = capital_despues
+
+    def __getitem__(self, clave: str):
+        if clave not in CAMPOS:
+            raise KeyError(clave)
+        return getattr(self, clave)
+
+    def keys(self):
+        return CAMPOS
+
+    def items(self):
+        return [(campo, getattr(self, campo)) for campo in CAMPOS]
+
+    def a_dict(self) -> Dict:
+        return dict(self.items())
+
+    def __eq__(self, otra) -> bool:
+        if isinstance(otra, FilaHistorial):
+            return self.items() == otra.items()
+        if isinstance(otra, dict):
+            return self.a_dict() == otra
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"FilaHistorial({self.a_dict()!r})"
+
+
+class Historial:
+    """Historial mensual guardado como columnas (`array`) en lugar de un dict por mes.
+
+    `tipo` indica cómo se guardan y devuelven los montos:
+      - 'float':   array('d'); devuelve floats (variantes Tkinter).
+      - 'decimal': centavos en array('q'); devuelve Decimal con 2 decimales.
+      - 'dinero':  centavos en array('q'); devuelve `Dinero`.
+
+    Se recorre y se indexa como la lista de dicts original (`h['mes']`).
+    """
+
+    __slots__ = ('tipo', 'meses', 'capital_antes', 'interes', 'capital_despues')
+
+    def __init__(self, tipo: str = 'float'):
+        if tipo not in ('float', 'decimal', 'dinero'):
+            raise ValueError(f"Tipo de historial desconocido: {tipo}")
+        codigo = 'd' if tipo == 'float' else 'q'
+        self.tipo = tipo
+        self.meses = array('i')
+        self.capital_antes = array(codigo)
+        self.interes = array(codigo)
+        self.capital_despues = array(codigo)
+
+    def _a_columna(self, valor):
+        if self.tipo == 'decimal':
+            return int(valor.scaleb(2))
+        if self.tipo == 'dinero':
+            return valor.centavos
+        return valor
+
+    def _desde_columna(self, valor):
+        if self.tipo == 'decimal':
+            return Decimal(valor).scaleb(-2)
+        if self.tipo == 'dinero':
+            return Dinero(valor)
+        return valor
+
+    def agregar(self, mes: int, capital_antes, interes, capital_despues) -> None:
+        montos = [self._a_columna(v) for v in (capital_antes, interes, capital_despues)]
+        try:
+            self.capital_antes.append(montos[0])
+            self.interes.append(montos[1])
+            self.capital_despues.append(montos[2])
+        except OverflowError:
+            # Montos fuera de int64: las columnas pasan a listas de enteros de Python.
+            self.capital_antes, self.interes, self.capital_despues = (
+                list(c[:len(self.meses)]) for c in (self.capital_antes, self.interes, self.capital_despues))
+            self.capital_antes.append(montos[0])
+            self.interes.append(montos[1])
+            self.capital_despues.append(montos[2])
+        self.meses.append(mes)
+
+    def extender(self, filas) -> 'Historial':
+        """Agrega filas con claves 'mes', 'capital_antes', 'interes', 'capital_despues'."""
+        for h in filas:
+            self.agregar(h['mes'], h['capital_antes'], h['interes'], h['capital_despues'])
+        return self
+
+    def columna(self, campo: str) -> List:
+        """Valores de una columna completa (por ejemplo, para graficar)."""
+        if campo == 'mes':
+            return list(self.meses)
+        return [self._desde_columna(v) for v in getattr(self, campo)]
+
+    def __len__(self) -> int:
+        return len(self.meses)
+
+    def __getitem__(self, i: int) -> FilaHistorial:
+        return FilaHistorial(
+            self.meses[i],
+            self._desde_columna(self.capital_antes[i]),
+            self._desde_columna(self.interes[i]),
+            self._desde_columna(self.capital_despues[i]),
+        )
+
+    def __iter__(self) -> Iterator[FilaHistorial]:
+        for i in range(len(self.meses)):
+            yield self[i]
+
+    def __bool__(self) -> bool:
+        return len(self.meses) > 0
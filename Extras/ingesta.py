@@ -0,0 +1,231 @@
+import argparse
+import csv
+import sys
+import time
+from datetime import date, datetime
+from decimal import Decimal, InvalidOperation, ROUND_HALF_UP
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+from main_mejorado import (calcular_capital_final, calcular_meses_de_mora, parse_capital, parse_fecha, parse_tasa,
+                           validar_capital_y_tasa)
+
+# =========================================
+#   INGESTA MASIVA DE SOLICITUDES (CSV / PARQUET)
+# =========================================
+
+COLUMNAS_ENTRADA = ('capital', 'tasa', 'fecha_esperada', 'fecha_real')
+COLUMNAS_SALIDA = ('solicitud_id', 'capital', 'tasa', 'meses_mora', 'capital_final', 'error')
+TAMANO_BLOQUE = 50_000
+
+
+# ==================== LECTURA POR BLOQUES ====================
+
+def leer_csv_por_bloques(ruta: str, tamano_bloque: int = TAMANO_BLOQUE) -> Iterator[Dict[str, List]]:
+    """Lee el CSV de a `tamano_bloque` filas y entrega cada bloque como columnas."""
+    with open(ruta, newline='', encoding='utf-8') as archivo:
+        # Las líneas en blanco (incluida la del final) no son solicitudes
+        lector = (fila for fila in csv.reader(archivo) if fila)
+        encabezado = [c.strip() for c in next(lector, [])]
+        _verificar_columnas(encabezado)
+        while True:
+            filas = [fila for _, fila in zip(range(tamano_bloque), lector)]
+            if not filas:
+                return
+            # Filas cortas se completan con vacíos (quedarán como inválidas)
+            ancho = len(encabezado)
+            columnas = list(zip(*(fila + [''] * (ancho - len(fila)) for fila in filas)))
+            yield {nombre: list(columnas[i]) for i, nombre in enumerate(encabezado)}
+
+
+def leer_parquet_por_bloques(ruta: str, tamano_bloque: int = TAMANO_BLOQUE) -> Iterator[Dict[str, List]]:
+    """Igual que `leer_csv_por_bloques`, pero con lotes de un Parquet. Requiere pyarrow."""
+    import pyarrow.parquet as pq
+
+    archivo = pq.ParquetFile(ruta)
+    nombres = archivo.schema_arrow.names
+    _verificar_columnas(nombres)
+    columnas = [c for c in ('solicitud_id',) + COLUMNAS_ENTRADA if c in nombres]
+    for lote in archivo.iter_batches(batch_size=tamano_bloque, columns=columnas):
+        yield lote.to_pydict()
+
+
+def _verificar_columnas(nombres) -> None:
+    faltantes = [c for c in COLUMNAS_ENTRADA if c not in nombres]
+    if faltantes:
+        raise ValueError(f"Faltan columnas: {', '.join(faltantes)}")
+
+
+# ==================== CONVERSIÓN Y PRECIO ====================
+
+def _convertir_columna(valores: List, conversor: Callable) -> List:
+    """Aplica `conversor` una sola vez por valor distinto del bloque.
+
+    Tasas y fechas se repiten mucho dentro de un archivo. Un error queda en su
+    lugar de la columna como la excepción misma.
+    """
+    convertidos: Dict[Any, Any] = {}
+    resultado = []
+    for valor in valores:
+        try:
+            resultado.append(convertidos[valor])
+        except KeyError:
+            try:
+                convertido = conversor(valor)
+            except Exception as e:
+                convertido = e
+            convertidos[valor] = convertido
+            resultado.append(convertido)
+    return resultado
+
+
+def _texto(conversor: Callable) -> Callable:
+    """Adapta un parser de texto a valores tipados (Parquet entrega float, int o date)."""
+    def convertir(valor):
+        if valor is None:
+            raise ValueError("Valor vacío.")
+        return conversor(valor if isinstance(valor, str) else str(valor))
+    return convertir
+
+
+def _fecha(valor) -> date:
+    if isinstance(valor, datetime):
+        return valor.date()
+    if isinstance(valor, date):
+        return valor
+    return _texto(parse_fecha)(valor)
+
+
+def procesar_bloque(columnas: Dict[str, List]) -> Dict[str, List]:
+    """Valida y tarifica un bloque en columnas, con las reglas y el cálculo de `run_cli`.
+
+    Las filas inválidas no detienen el proceso: salen con el mismo mensaje que
+    mostraría `run_cli` en la columna `error`.
+    """
+    n = len(columnas['capital'])
+    capitales = _convertir_columna(columnas['capital'], _texto(parse_capital))
+    tasas = _convertir_columna(columnas['tasa'], _texto(parse_tasa))
+    esperadas = _convertir_columna(columnas['fecha_esperada'], _fecha)
+    reales = _convertir_columna(columnas['fecha_real'], _fecha)
+    ids = columnas.get('solicitud_id') or [''] * n
+
+    salida: Dict[str, List] = {c: [] for c in COLUMNAS_SALIDA}
+    for i in range(n):
+        capital, tasa, meses_mora, capital_final, error = capitales[i], tasas[i], '', '', ''
+
+        # Mismo orden que run_cli: capital, tasa, reglas y luego las fechas
+        falla = next((v for v in (capital, tasa) if isinstance(v, Exception)), None)
+        if falla is None:
+            try:
+                validar_capital_y_tasa(capital, tasa)
+            except Exception as e:
+                falla = e
+        if falla is None:
+            falla = next((v for v in (esperadas[i], reales[i]) if isinstance(v, Exception)), None)
+
+        if falla is not None:
+            error = f"Entrada inválida: {falla}"
+        else:
+            meses_mora = calcular_meses_de_mora(esperadas[i], reales[i])
+            try:
+                capital_final = calcular_capital_final(capital, tasa, meses_mora)
+                capital_final = str(capital_final.quantize(Decimal('0.01'), rounding=ROUND_HALF_UP))
+            except InvalidOperation:
+                capital_final, error = '', "El capital final excede la precisión soportada."
+
+        salida['solicitud_id'].append(ids[i])
+        salida['capital'].append(capital if not isinstance(capital, Exception) else columnas['capital'][i])
+        salida['tasa'].append(tasa if not isinstance(tasa, Exception) else columnas['tasa'][i])
+        salida['meses_mora'].append(meses_mora)
+        salida['capital_final'].append(capital_final)
+        salida['error'].append(error)
+    return salida
+
+
+# ==================== ESCRITURA EN STREAMING ====================
+
+class EscritorCSV:
+    def __init__(self, destino):
+        self._escritor = csv.writer(destino)
+        self._escritor.writerow(COLUMNAS_SALIDA)
+
+    def escribir(self, bloque: Dict[str, List]) -> None:
+        self._escritor.writerows(zip(*(bloque[c] for c in COLUMNAS_SALIDA)))
+
+    def cerrar(self) -> None:
+        pass
+
+
+class EscritorParquet:
+    """Escribe cada bloque como un row group; los montos van como texto para no perder centavos."""
+
+    def __init__(self, ruta: str):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        self._pa = pa
+        self._esquema = pa.schema([(c, pa.int64() if c == 'meses_mora' else pa.string()) for c in COLUMNAS_SALIDA])
+        self._escritor = pq.ParquetWriter(ruta, self._esquema)
+
+    def escribir(self, bloque: Dict[str, List]) -> None:
+        datos = {c: [None if v == '' else (v if c == 'meses_mora' else str(v)) for v in bloque[c]]
+                 for c in COLUMNAS_SALIDA}
+        self._escritor.write_table(self._pa.Table.from_pydict(datos, schema=self._esquema))
+
+    def cerrar(self) -> None:
+        self._escritor.close()
+
+
+def ingerir(bloques: Iterator[Dict[str, List]], escritor,
+            al_avanzar: Optional[Callable[[Dict[str, float]], None]] = None) -> Dict[str, float]:
+    """Procesa los bloques uno a uno y los escribe apenas están listos.
+
+    La memoria depende del tamaño de bloque, no del archivo. Devuelve filas,
+    válidas, inválidas, segundos y filas por segundo; `al_avanzar` recibe esas
+    mismas métricas después de cada bloque.
+    """
+    inicio = time.perf_counter()
+    metricas = {'filas': 0, 'validas': 0, 'invalidas': 0, 'segundos': 0.0, 'filas_por_segundo': 0.0}
+    for bloque in bloques:
+        resultado = procesar_bloque(bloque)
+        escritor.escribir(resultado)
+
+        invalidas = sum(1 for e in resultado['error'] if e)
+        metricas['filas'] += len(resultado['error'])
+        metricas['invalidas'] += invalidas
+        metricas['validas'] += len(resultado['error']) - invalidas
+        metricas['segundos'] = time.perf_counter() - inicio
+        metricas['filas_por_segundo'] = metricas['filas'] / metricas['segundos'] if metricas['segundos'] else 0.0
+        if al_avanzar is not None:
+            al_avanzar(dict(metricas))
+    escritor.cerrar()
+    return metricas
+
+
+def ingerir_archivo(entrada: str, salida: str, tamano_bloque: int = TAMANO_BLOQUE,
+                    al_avanzar: Optional[Callable[[Dict[str, float]], None]] = None) -> Dict[str, float]:
+    """Elige lector y escritor por extensión (.csv o .parquet); `salida` '-' es stdout."""
+    if entrada.endswith('.parquet'):
+        bloques = leer_parquet_por_bloques(entrada, tamano_bloque)
+    else:
+        bloques = leer_csv_por_bloques(entrada, tamano_bloque)
+
+    if salida.endswith('.parquet'):
+        return ingerir(bloques, EscritorParquet(salida), al_avanzar)
+    if salida == '-':
+        return ingerir(bloques, EscritorCSV(sys.stdout), al_avanzar)
+    with open(salida, 'w', newline='', encoding='utf-8') as destino:
+        return ingerir(bloques, EscritorCSV(destino), al_avanzar)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Valida y tarifica solicitudes en lote (CSV o Parquet).")
+    parser.add_argument("entrada", help="CSV o Parquet con capital, tasa, fecha_esperada, fecha_real")
+    parser.add_argument("salida", help="CSV o Parquet de resultados ('-' = stdout)")
+    parser.add_argument("--tamano-bloque", type=int, default=TAMANO_BLOQUE)
+    args = parser.parse_args()
+
+    def informar(m):
+        print(f"{m['filas']:,} filas ({m['invalidas']:,} inválidas) - {m['filas_por_segundo']:,.0f} filas/s",
+              file=sys.stderr)
+
+    ingerir_archivo(args.entrada, args.salida, args.tamano_bloque, informar)
@@ -1,6 +1,10 @@
 from datetime import datetime, date
 from decimal import Decimal, getcontext, ROUND_HALF_UP
-from typing import Tuple, List, Dict
+from typing import Tuple, Dict, Iterator
+
+from dinero import Dinero, capitalizar_centavos, redondear_mitad_arriba, tasa_como_fraccion
+from fechas_mora import calcular_meses_de_mora
+from historial import Historial
 
 # =========================================
 #   CALCULADORA DE CRÉDITO CON MORA (MEJORADA)
@@ -18,53 +22,150 @@ def _to_decimal(value: float | str | Decimal) -> Decimal:
     return Decimal(s)
 
 
-def calcular_interes(capital: Decimal, tasa_porcentaje: Decimal) -> Decimal:
+def calcular_interes(capital: Decimal | Dinero, tasa_porcentaje: Decimal) -> Decimal | Dinero:
     """Retorna el interés (en la misma unidad que `capital`).
 
     `tasa_porcentaje` se interpreta como porcentaje por periodo (ej. por mes).
     """
+    if isinstance(capital, Dinero):
+        return capital.interes(tasa_porcentaje)
     return (capital * tasa_porcentaje / Decimal(100)).quantize(Decimal('0.01'), rounding=ROUND_HALF_UP)
 
 
-def actualizar_capital_por_meses(capital: Decimal, tasa_porcentaje: Decimal, meses_mora: int) -> Tuple[Decimal, List[Dict]]:
-    """Aplica interés compuesto por cada mes de mora y devuelve (capital_final, historial)."""
-    historial: List[Dict] = []
+def _pasos_de_mora(capital: Decimal | Dinero, tasa_porcentaje: Decimal, meses_mora: int) -> Iterator[Dict]:
+    """Genera, mes a mes, el registro de la capitalización por mora."""
+    if isinstance(capital, Dinero):
+        yield from _pasos_de_mora_dinero(capital, tasa_porcentaje, meses_mora)
+        return
 
     for mes in range(1, max(0, meses_mora) + 1):
         interes = calcular_interes(capital, tasa_porcentaje)
         nuevo_capital = (capital + interes).quantize(Decimal('0.01'), rounding=ROUND_HALF_UP)
 
-        historial.append({
+        yield {
             'mes': mes,
             'capital_antes': capital.quantize(Decimal('0.01'), rounding=ROUND_HALF_UP),
             'interes': interes,
             'capital_despues': nuevo_capital,
-        })
+        }
 
         capital = nuevo_capital
 
-    return capital, historial
 
+def _pasos_de_mora_dinero(capital: Dinero, tasa_porcentaje: Decimal, meses_mora: int) -> Iterator[Dict]:
+    """Igual que `_pasos_de_mora`, pero en centavos enteros."""
+    num_tasa, den_tasa = tasa_como_fraccion(tasa_porcentaje)
+    for mes in range(1, max(0, meses_mora) + 1):
+        interes = redondear_mitad_arriba(capital.centavos * num_tasa, den_tasa)
+        nuevo_capital = Dinero(capital.centavos + interes)
+
+        yield {
+            'mes': mes,
+            'capital_antes': capital,
+            'interes': Dinero(interes),
+            'capital_despues': nuevo_capital,
+        }
+
+        capital = nuevo_capital
+
+
+class HistorialMora:
+    """Historial mensual perezoso: las filas se calculan solo al recorrerlo."""
+
+    def __init__(self, capital: Decimal | Dinero, tasa_porcentaje: Decimal, meses_mora: int):
+        self.capital = capital
+        self.tasa_porcentaje = tasa_porcentaje
+        self.meses_mora = max(0, meses_mora)
+
+    def __iter__(self) -> Iterator[Dict]:
+        return _pasos_de_mora(self.capital, self.tasa_porcentaje, self.meses_mora)
+
+    def __len__(self) -> int:
+        return self.meses_mora
+
+
+def _digitos_coeficiente(valor: Decimal) -> int:
+    """Coeficiente entero de `valor` (sus dígitos sin el exponente), en valor absoluto."""
+    return int(''.join(map(str, valor.as_tuple().digits)) or 0)
 
-def calcular_meses_de_mora(fecha_pago_esperado: date, fecha_pago_real: date) -> int:
-    """Calcula meses completos de mora entre dos fechas.
 
-    Si `fecha_pago_real` <= `fecha_pago_esperado` retorna 0.
+def calcular_capital_final(capital: Decimal | Dinero, tasa_porcentaje: Decimal, meses_mora: int) -> Decimal | Dinero:
+    """Capital tras `meses_mora` meses de mora, sin construir el historial.
+
+    Reproduce exactamente el redondeo a centavos de cada mes, pero trabaja con
+    enteros (centavos) en lugar de Decimal. No existe una forma cerrada ni una
+    potenciación por cuadrados que respete ese redondeo mensual, así que se
+    recorre la recurrencia entera: O(meses) operaciones sobre un solo entero,
+    con memoria constante y sin crear Decimal ni filas de historial.
+
+    El resultado es idéntico al bucle Decimal: mientras `centavos * tasa` y el
+    nuevo capital tengan a lo sumo `getcontext().prec` dígitos, Decimal no
+    redondea y ambos caminos coinciden; a partir del primer mes que lo supera,
+    el resto de los meses se calcula con el bucle Decimal.
     """
-    if fecha_pago_real <= fecha_pago_esperado:
-        return 0
+    if meses_mora <= 0:
+        return capital
+    if isinstance(capital, Dinero):
+        return Dinero(capitalizar_centavos(capital.centavos, tasa_porcentaje, meses_mora))
 
-    years_diff = fecha_pago_real.year - fecha_pago_esperado.year
-    months_diff = fecha_pago_real.month - fecha_pago_esperado.month
-    meses = years_diff * 12 + months_diff
+    pasos = _pasos_de_mora(capital, tasa_porcentaje, meses_mora)
+    try:
+        if capital != capital.quantize(Decimal('0.01'), rounding=ROUND_HALF_UP):
+            # El primer mes parte de un capital con fracciones de centavo: se hace en Decimal.
+            capital = next(pasos)['capital_despues']
+            meses_mora -= 1
+        num, den = tasa_como_fraccion(tasa_porcentaje)
+    except (ValueError, OverflowError):
+        # Valores no finitos: se conserva el comportamiento de Decimal.
+        for paso in pasos:
+            capital = paso['capital_despues']
+        return capital
+
+    # Coeficiente de `capital * tasa` en Decimal <= centavos * coeficiente de la tasa
+    limite = 10 ** getcontext().prec
+    coeficiente_tasa = max(_digitos_coeficiente(Decimal(tasa_porcentaje)), 1)
+    centavos = int(capital * 100)
+    while meses_mora > 0 and abs(centavos) * coeficiente_tasa < limite:
+        nuevos = centavos + redondear_mitad_arriba(centavos * num, den)
+        if abs(nuevos) >= limite:
+            break
+        centavos = nuevos
+        meses_mora -= 1
+
+    # `quantize` falla igual que en el bucle Decimal si el resultado excede la precisión.
+    capital = Decimal(centavos).scaleb(-2).quantize(Decimal('0.01'), rounding=ROUND_HALF_UP)
+    for paso in _pasos_de_mora(capital, tasa_porcentaje, meses_mora):
+        capital = paso['capital_despues']
+    return capital
+
+
+def actualizar_capital_por_meses(capital: Decimal | Dinero, tasa_porcentaje: Decimal, meses_mora: int,
+                                 perezoso: bool = False) -> Tuple[Decimal | Dinero, Historial | HistorialMora]:
+    """Aplica interés compuesto por cada mes de mora y devuelve (capital_final, historial).
+
+    `capital` puede ser `Decimal` o `Dinero`; con `Dinero` todo el cálculo se
+    hace en centavos enteros y el historial contiene montos `Dinero`.
+
+    El historial es un `Historial` compacto (columnas en arrays) que se recorre
+    como la lista de dicts de siempre. Con `perezoso=True` el capital final se
+    obtiene con `calcular_capital_final` y el historial es un `HistorialMora`
+    que solo se calcula si se recorre.
+    """
+    if perezoso:
+        return (calcular_capital_final(capital, tasa_porcentaje, meses_mora),
+                HistorialMora(capital, tasa_porcentaje, meses_mora))
 
-    if fecha_pago_real.day < fecha_pago_esperado.day:
-        meses -= 1
+    historial = Historial('dinero' if isinstance(capital, Dinero) else 'decimal')
+    historial.extender(_pasos_de_mora(capital, tasa_porcentaje, meses_mora))
+    if historial:
+        capital = historial[-1]['capital_despues']
 
-    return max(0, meses)
+    return capital, historial
 
 
-def formato_moneda(valor: Decimal) -> str:
+def formato_moneda(valor: Decimal | Dinero) -> str:
+    if isinstance(valor, Dinero):
+        return f"${valor:,.2f}"
     v = valor.quantize(Decimal('0.01'), rounding=ROUND_HALF_UP)
     return f"${v:,.2f}"
 
@@ -74,22 +175,34 @@ def parse_fecha(texto: str) -> date:
     return datetime.strptime(texto.strip(), "%Y-%m-%d").date()
 
 
-def run_cli() -> None:
-    """Interfaz por consola separada de la lógica, preparada para pruebas."""
-    print("=== CALCULADORA DE CRÉDITO CON DETECCIÓN AUTOMÁTICA DE MORA ===\n")
+def parse_capital(texto: str) -> Decimal:
+    """Capital como se escribe por consola: admite espacios de miles y coma decimal."""
+    return _to_decimal(texto.strip().replace(' ', ''))
 
-    try:
-        raw_capital = input("Valor del crédito: ").strip()
-        raw_capital = raw_capital.replace(' ', '')
-        capital = _to_decimal(raw_capital)
 
-        raw_tasa = input("Interés (% por mes): ").strip()
-        tasa = _to_decimal(raw_tasa)
+def parse_tasa(texto: str) -> Decimal:
+    return _to_decimal(texto.strip())
+
 
-        if capital <= 0:
-            raise ValueError("El capital debe ser mayor que cero.")
-        if tasa < 0:
-            raise ValueError("La tasa no puede ser negativa.")
+def validar_capital_y_tasa(capital: Decimal, tasa: Decimal) -> None:
+    """Reglas de `run_cli` para capital y tasa. Lanza ValueError si no se cumplen."""
+    if capital <= 0:
+        raise ValueError("El capital debe ser mayor que cero.")
+    if tasa < 0:
+        raise ValueError("La tasa no puede ser negativa.")
+
+
+def run_cli(cache=None) -> None:
+    """Interfaz por consola separada de la lógica, preparada para pruebas.
+
+    Con `cache` (un `CacheResultados`) las consultas repetidas no se recalculan.
+    """
+    print("=== CALCULADORA DE CRÉDITO CON DETECCIÓN AUTOMÁTICA DE MORA ===\n")
+
+    try:
+        capital = parse_capital(input("Valor del crédito: "))
+        tasa = parse_tasa(input("Interés (% por mes): "))
+        validar_capital_y_tasa(capital, tasa)
 
         fecha_esperada = parse_fecha(input("Fecha límite de pago (YYYY-MM-DD): "))
         fecha_real = parse_fecha(input("Fecha real de pago (YYYY-MM-DD): "))
@@ -98,7 +211,10 @@ def run_cli() -> None:
         print(f"Entrada inválida: {e}")
         return
 
-    meses_mora = calcular_meses_de_mora(fecha_esperada, fecha_real)
+    if cache is not None:
+        meses_mora, capital_final, historial = cache.obtener(capital, tasa, fecha_esperada, fecha_real)
+    else:
+        meses_mora = calcular_meses_de_mora(fecha_esperada, fecha_real)
     print(f"\nMeses de mora detectados: {meses_mora}")
 
     if meses_mora == 0:
@@ -106,7 +222,8 @@ def run_cli() -> None:
         print(f"Capital final: {formato_moneda(capital)}")
         return
 
-    capital_final, historial = actualizar_capital_por_meses(capital, tasa, meses_mora)
+    if cache is None:
+        capital_final, historial = actualizar_capital_por_meses(capital, tasa, meses_mora)
 
     print("\n===== RESULTADOS =====")
     print(f"Capital inicial: {formato_moneda(capital)}")
@@ -0,0 +1,26 @@
+from historial import Historial
+
+# =========================================
+#   MORA EN FLOAT (VARIANTES TKINTER)
+# =========================================
+
+
+def calcular_interes(capital, tasa):
+    return capital * (tasa / 100)
+
+
+def actualizar_capital_por_meses(capital, tasa, meses_mora, progreso=None):
+    historial = Historial('float')
+
+    for mes in range(1, meses_mora + 1):
+        interes = calcular_interes(capital, tasa)
+        nuevo_capital = capital + interes
+
+        historial.agregar(mes, round(capital, 2), round(interes, 2), round(nuevo_capital, 2))
+        capital = nuevo_capital
+
+        # Permite informar el avance y cancelar desde la interfaz
+        if progreso is not None and mes % 1000 == 0:
+            progreso(mes, meses_mora, "Calculando")
+
+    return capital, historial
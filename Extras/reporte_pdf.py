@@ -0,0 +1,181 @@
+import argparse
+import csv
+import os
+import time
+from collections import deque
+from concurrent.futures import Executor, ProcessPoolExecutor
+from functools import partial
+from itertools import islice
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from reportlab.lib.pagesizes import letter
+from reportlab.pdfgen import canvas
+
+from main_mejorado import _to_decimal, actualizar_capital_por_meses
+
+# =========================================
+#   REPORTES PDF EN STREAMING
+# =========================================
+
+ENCABEZADOS = ("Mes", "Capital antes", "Interés", "Capital después")
+FORMATO_FILA = "{:>5} {:>15} {:>13} {:>15}"
+MARGEN = 50
+ALTO_FILA = 10
+TAMANO_FUENTE = 7
+TRABAJOS_POR_ENVIO = 16  # trabajos que viajan juntos a un proceso
+ENVIOS_POR_PROCESO = 4   # envíos en vuelo por proceso; acota la memoria del lote
+
+
+def _abrir_panel(c: canvas.Canvas, x: float, y: float):
+    """Dibuja los títulos de un panel y devuelve el objeto de texto para sus filas.
+
+    Las filas van en Courier y alineadas con `FORMATO_FILA`, así cada fila es una
+    sola línea de texto y no cuatro `drawString` con su cálculo de anchos.
+    """
+    c.setFont("Courier-Bold", TAMANO_FUENTE)
+    c.drawString(x, y, FORMATO_FILA.format(*ENCABEZADOS))
+    texto = c.beginText(x, y - ALTO_FILA - 2)
+    texto.setFont("Courier", TAMANO_FUENTE)
+    texto.setLeading(ALTO_FILA)
+    return texto
+
+
+def escribir_estado_pdf(destino, capital_inicial, capital_final, filas: Iterable,
+                        paneles: int = 2, max_paginas: Optional[int] = None,
+                        titulo: str = "Reporte del Crédito con Mora") -> int:
+    """Escribe un estado de cuenta con el historial en tablas de varias columnas.
+
+    `filas` se recorre una sola vez y cada fila se formatea al dibujarla, así que
+    acepta iteradores perezosos (por ejemplo un `HistorialMora`) de cualquier largo.
+    Con `max_paginas` el historial se corta al llegar al límite. Devuelve el
+    número de páginas escritas.
+    """
+    c = canvas.Canvas(destino, pagesize=letter)
+    ancho, alto = letter
+    ancho_panel = (ancho - 2 * MARGEN) / paneles
+
+    c.setFont("Helvetica-Bold", 16)
+    c.drawString(MARGEN, alto - 42, titulo)
+    c.setFont("Helvetica", 12)
+    c.drawString(MARGEN, alto - 72, f"Capital inicial: {capital_inicial:,.2f}")
+    c.drawString(MARGEN, alto - 92, f"Capital final: {capital_final:,.2f}")
+    c.drawString(MARGEN, alto - 112, "Historial por mes:")
+
+    paginas = 1
+    panel = 0
+    tope = alto - 132
+    capacidad = int((tope - ALTO_FILA - 2 - MARGEN) // ALTO_FILA) + 1
+    texto = _abrir_panel(c, MARGEN, tope)
+    en_panel = 0
+
+    for fila in filas:
+        if en_panel == capacidad:
+            c.drawText(texto)
+            panel += 1
+            if panel == paneles:
+                if max_paginas is not None and paginas >= max_paginas:
+                    texto = None
+                    c.setFont("Helvetica-Oblique", TAMANO_FUENTE)
+                    c.drawString(MARGEN, MARGEN - 20, f"Historial truncado: límite de {max_paginas} páginas.")
+                    break
+                c.showPage()
+                paginas += 1
+                panel = 0
+                tope = alto - MARGEN
+                capacidad = int((tope - ALTO_FILA - 2 - MARGEN) // ALTO_FILA) + 1
+            texto = _abrir_panel(c, MARGEN + panel * ancho_panel, tope)
+            en_panel = 0
+
+        texto.textLine(FORMATO_FILA.format(
+            fila["mes"], f"{fila['capital_antes']:,.2f}", f"{fila['interes']:,.2f}", f"{fila['capital_despues']:,.2f}"))
+        en_panel += 1
+
+    if texto is not None:
+        c.drawText(texto)
+    c.save()
+    return paginas
+
+# =========================================
+#   GENERACIÓN EN LOTE
+# =========================================
+
+
+def _generar_estado(trabajo: Tuple[str, str, str, int], paneles: int, max_paginas: Optional[int]) -> int:
+    ruta, capital, tasa, meses_mora = trabajo
+    capital, tasa = _to_decimal(capital), _to_decimal(tasa)
+    capital_final, historial = actualizar_capital_por_meses(capital, tasa, meses_mora, perezoso=True)
+    return escribir_estado_pdf(ruta, capital, capital_final, historial, paneles, max_paginas)
+
+
+def _generar_envio(envio: List[Tuple[str, str, str, int]], paneles: int, max_paginas: Optional[int]) -> List[int]:
+    return [_generar_estado(trabajo, paneles, max_paginas) for trabajo in envio]
+
+
+def _mapear_acotado(ejecutor: Executor, funcion: Callable[[list], list], trabajos: Iterable,
+                    max_en_vuelo: int) -> Iterator:
+    """Como `ejecutor.map`, pero lee `trabajos` a medida que avanza.
+
+    `Executor.map` consume todo el iterable antes de devolver el primer
+    resultado; aquí hay a lo sumo `max_en_vuelo` envíos pendientes y los
+    resultados salen en el orden de los trabajos.
+    """
+    trabajos = iter(trabajos)
+    pendientes = deque()
+    for envio in iter(lambda: list(islice(trabajos, TRABAJOS_POR_ENVIO)), []):
+        if len(pendientes) >= max_en_vuelo:
+            yield from pendientes.popleft().result()
+        pendientes.append(ejecutor.submit(funcion, envio))
+    while pendientes:
+        yield from pendientes.popleft().result()
+
+
+def generar_estados_lote(trabajos: Iterable[Tuple[str, str, str, int]], procesos: Optional[int] = None,
+                         paneles: int = 2, max_paginas: Optional[int] = None) -> Dict[str, float]:
+    """Genera un PDF por crédito en un pool de procesos.
+
+    Cada trabajo es (ruta_pdf, capital, tasa, meses_mora); el historial se
+    calcula de forma perezosa dentro del proceso que escribe el PDF. Los
+    trabajos se leen a medida que hay procesos libres, así que pueden venir de
+    un iterador de cualquier largo. Devuelve estados, páginas, segundos y
+    páginas por segundo.
+    """
+    inicio = time.perf_counter()
+    estados = paginas = 0
+    procesos = procesos or os.cpu_count() or 1
+    generar = partial(_generar_envio, paneles=paneles, max_paginas=max_paginas)
+    with ProcessPoolExecutor(max_workers=procesos) as ejecutor:
+        for paginas_estado in _mapear_acotado(ejecutor, generar, trabajos, ENVIOS_POR_PROCESO * procesos):
+            estados += 1
+            paginas += paginas_estado
+    segundos = time.perf_counter() - inicio
+
+    return {
+        'estados': estados,
+        'paginas': paginas,
+        'segundos': segundos,
+        'paginas_por_segundo': paginas / segundos if segundos else 0.0,
+    }
+
+
+def _leer_trabajos(ruta_csv: str, carpeta: str) -> Iterator[Tuple[str, str, str, int]]:
+    """Lee prestamo_id, capital, tasa, meses_mora de un CSV, fila por fila."""
+    with open(ruta_csv, newline='', encoding='utf-8') as archivo:
+        for fila in csv.DictReader(archivo):
+            ruta = os.path.join(carpeta, f"estado_{fila['prestamo_id']}.pdf")
+            yield ruta, fila['capital'], fila['tasa'], int(fila['meses_mora'])
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Genera un estado de cuenta PDF por crédito.")
+    parser.add_argument("cartera", help="CSV con prestamo_id, capital, tasa, meses_mora")
+    parser.add_argument("carpeta", help="carpeta de salida")
+    parser.add_argument("--procesos", type=int, default=None)
+    parser.add_argument("--paneles", type=int, default=2)
+    parser.add_argument("--max-paginas", type=int, default=None)
+    args = parser.parse_args()
+
+    os.makedirs(args.carpeta, exist_ok=True)
+    resumen = generar_estados_lote(_leer_trabajos(args.cartera, args.carpeta), args.procesos,
+                                   args.paneles, args.max_paginas)
+    print(f"{resumen['estados']} estados, {resumen['paginas']} páginas en {resumen['segundos']:.2f} s "
+          f"({resumen['paginas_por_segundo']:.1f} páginas/s)")
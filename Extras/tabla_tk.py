@@ -0,0 +1,61 @@
+from typing import Callable, Optional, Sequence
+
+# =========================================
+#   TABLA TREEVIEW CON CARGA PEREZOSA
+# =========================================
+
+
+def _valores_historial(h):
+    return h["mes"], h["capital_antes"], h["interes"], h["capital_despues"]
+
+
+class TablaPerezosa:
+    """Llena un `ttk.Treeview` por bloques a medida que el usuario se desplaza.
+
+    En lugar de insertar las miles de filas de un historial largo en cada
+    cálculo, solo se insertan las que el usuario llega a ver (más un bloque de
+    margen). `filas` debe admitir `len()` e índices, como un `Historial`.
+    """
+
+    def __init__(self, tabla, barra=None, bloque: int = 200,
+                 valores: Callable = _valores_historial):
+        self._tabla = tabla
+        self._barra = barra
+        self._bloque = bloque
+        self._valores = valores
+        self._filas: Optional[Sequence] = None
+        self._cargadas = 0
+        self._pendiente = False
+        tabla.configure(yscrollcommand=self._al_desplazar)
+        if barra is not None:
+            barra.configure(command=tabla.yview)
+
+    def mostrar(self, filas: Sequence) -> None:
+        self.limpiar()
+        self._filas = filas
+        self._cargar_bloque()
+
+    def limpiar(self) -> None:
+        hijos = self._tabla.get_children()
+        if hijos:
+            self._tabla.delete(*hijos)
+        self._filas = None
+        self._cargadas = 0
+
+    def _cargar_bloque(self) -> None:
+        self._pendiente = False
+        if self._filas is None:
+            return
+        fin = min(self._cargadas + self._bloque, len(self._filas))
+        for i in range(self._cargadas, fin):
+            self._tabla.insert("", "end", values=self._valores(self._filas[i]))
+        self._cargadas = fin
+
+    def _al_desplazar(self, primero, ultimo) -> None:
+        if self._barra is not None:
+            self._barra.set(primero, ultimo)
+        # Cerca del final de lo cargado: se agrega el siguiente bloque
+        if (self._filas is not None and not self._pendiente and float(ultimo) > 0.9
+                and self._cargadas < len(self._filas)):
+            self._pendiente = True
+            self._tabla.after_idle(self._cargar_bloque)
@@ -0,0 +1,114 @@
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Iterable, Iterator, Optional
+
+# =========================================
+#   TAREAS EN SEGUNDO PLANO PARA TKINTER
+# =========================================
+
+
+class TareaCancelada(Exception):
+    """Se lanza dentro de la tarea cuando alguien pidió cancelarla."""
+
+
+class Tarea:
+    """Estado compartido entre la tarea en segundo plano y la interfaz.
+
+    La tarea nunca toca widgets: informa su avance con `progreso()` (que también
+    es el punto donde se atiende la cancelación) y la interfaz lo lee desde una cola.
+    """
+
+    def __init__(self):
+        self._cancelada = threading.Event()
+        self._avances: "queue.Queue[tuple]" = queue.Queue()
+
+    def cancelar(self) -> None:
+        self._cancelada.set()
+
+    @property
+    def cancelada(self) -> bool:
+        return self._cancelada.is_set()
+
+    def progreso(self, hecho: int, total: int, texto: str = "") -> None:
+        if self._cancelada.is_set():
+            raise TareaCancelada()
+        self._avances.put((hecho, total, texto))
+
+    def recorrer(self, filas: Iterable, total: int, texto: str = "", cada: int = 500) -> Iterator:
+        """Recorre `filas` informando el avance cada `cada` elementos."""
+        for i, fila in enumerate(filas, start=1):
+            if i % cada == 0:
+                self.progreso(i, total, texto)
+            yield fila
+
+
+class EjecutorTk:
+    """Ejecuta una tarea a la vez en un hilo y entrega los resultados con `after()`.
+
+    Iniciar una tarea nueva cancela la anterior; los resultados de tareas
+    canceladas o reemplazadas se descartan.
+    """
+
+    def __init__(self, ventana, intervalo_ms: int = 50):
+        self._ventana = ventana
+        self._intervalo_ms = intervalo_ms
+        self._ejecutor = ThreadPoolExecutor(max_workers=1)
+        self._tarea: Optional[Tarea] = None
+
+    @property
+    def ocupado(self) -> bool:
+        return self._tarea is not None
+
+    def iniciar(self, funcion: Callable, *args, al_terminar: Callable, al_error: Optional[Callable] = None,
+                al_progreso: Optional[Callable] = None, al_cancelar: Optional[Callable] = None) -> Tarea:
+        """Ejecuta `funcion(tarea, *args)` en segundo plano.
+
+        Los callbacks se llaman siempre en el hilo de Tk.
+        """
+        self.cancelar()
+        tarea = Tarea()
+        self._tarea = tarea
+        futuro = self._ejecutor.submit(funcion, tarea, *args)
+        self._ventana.after(self._intervalo_ms, self._vigilar, tarea, futuro,
+                            al_terminar, al_error, al_progreso, al_cancelar)
+        return tarea
+
+    def cancelar(self) -> None:
+        if self._tarea is not None:
+            self._tarea.cancelar()
+
+    def cerrar(self) -> None:
+        self.cancelar()
+        self._ejecutor.shutdown(wait=False, cancel_futures=True)
+
+    def _vigilar(self, tarea, futuro, al_terminar, al_error, al_progreso, al_cancelar) -> None:
+        while al_progreso is not None and not tarea.cancelada:
+            try:
+                avance = tarea._avances.get_nowait()
+            except queue.Empty:
+                break
+            al_progreso(*avance)
+
+        if not futuro.done():
+            self._ventana.after(self._intervalo_ms, self._vigilar, tarea, futuro,
+                                al_terminar, al_error, al_progreso, al_cancelar)
+            return
+
+        if self._tarea is tarea:
+            self._tarea = None
+        if tarea.cancelada:
+            if al_cancelar is not None and self._tarea is None:
+                al_cancelar()
+            return
+
+        try:
+            resultado = futuro.result()
+        except TareaCancelada:
+            return
+        except Exception as e:
+            if al_error is None:
+                raise
+            al_error(e)
+            return
+        al_terminar(resultado)
@@ -0,0 +1,11 @@
+import sys
+from pathlib import Path
+
+# =================================================================
+# Archivo: conftest.py
+# Propósito: Los módulos viven como scripts en Backend/ y Extras/, sin paquete
+# =================================================================
+
+RAIZ = Path(__file__).resolve().parent.parent
+for carpeta in ("Backend", "Extras"):
+    sys.path.insert(0, str(RAIZ / carpeta))
@@ -0,0 +1,87 @@
+from datetime import date, timedelta
+
+import numpy as np
+import pytest
+
+from calendario import CalendarioVencimientos, fecha_limite, fechas_limite_lote
+from main import sumar_un_mes
+
+# =================================================================
+# Archivo: test_calendario.py
+# Propósito: El índice de fechas límite contra `sumar_un_mes` encadenado
+# =================================================================
+
+
+def encadenado(fecha: date, n: int) -> date:
+    """La forma original: aplicar `sumar_un_mes` n veces."""
+    for _ in range(n):
+        fecha = sumar_un_mes(fecha)
+    return fecha
+
+
+CASOS = [
+    # (fecha de aprobación, n, fecha límite)
+    (date(2024, 3, 10), 0, date(2024, 3, 10)),
+    (date(2024, 3, 10), 1, date(2024, 4, 10)),
+    # Fin de mes: el recorte se conserva en los meses siguientes
+    (date(2024, 1, 31), 1, date(2024, 2, 29)),
+    (date(2024, 1, 31), 2, date(2024, 3, 29)),
+    (date(2023, 1, 31), 1, date(2023, 2, 28)),
+    (date(2023, 1, 31), 3, date(2023, 4, 28)),
+    (date(2024, 3, 31), 1, date(2024, 4, 30)),
+    (date(2024, 3, 31), 2, date(2024, 5, 30)),
+    # 29 de febrero
+    (date(2024, 2, 29), 12, date(2025, 2, 28)),
+    (date(2024, 2, 29), 48, date(2028, 2, 28)),
+    (date(2024, 2, 29), 1, date(2024, 3, 29)),
+    # Cambio de año
+    (date(2023, 12, 15), 1, date(2024, 1, 15)),
+    (date(2023, 11, 30), 3, date(2024, 2, 29)),
+    (date(2023, 12, 31), 2, date(2024, 2, 29)),
+    (date(2020, 1, 15), 120, date(2030, 1, 15)),
+]
+
+
+@pytest.mark.parametrize("aprobacion, n, esperada", CASOS)
+def test_casos_de_calendario(aprobacion, n, esperada):
+    assert encadenado(aprobacion, n) == esperada
+    assert fecha_limite(aprobacion, n) == esperada
+    assert fechas_limite_lote([aprobacion], [n]).tolist() == [esperada]
+
+
+def test_igual_a_encadenado_en_todas_las_fechas_de_tres_años():
+    aprobaciones = [date(2023, 1, 1) + timedelta(days=i) for i in range(3 * 365 + 1)]
+    meses = range(0, 61)
+    esperadas = []
+    for aprobacion in aprobaciones:
+        fecha = aprobacion
+        for n in meses:
+            esperadas.append(fecha)
+            fecha = sumar_un_mes(fecha)
+
+    columna_fechas = [a for a in aprobaciones for _ in meses]
+    columna_meses = [n for _ in aprobaciones for n in meses]
+    assert [fecha_limite(a, n) for a, n in zip(columna_fechas, columna_meses)] == esperadas
+    assert fechas_limite_lote(columna_fechas, columna_meses).tolist() == esperadas
+
+
+def test_meses_mas_alla_del_horizonte_de_recorte():
+    aprobaciones = [date(2019, 1, 31), date(2019, 5, 31), date(2020, 2, 29), date(2021, 8, 30)]
+    for aprobacion in aprobaciones:
+        for n in (23, 24, 25, 100, 600):
+            assert fecha_limite(aprobacion, n) == encadenado(aprobacion, n)
+            assert fechas_limite_lote([aprobacion], [n]).tolist() == [encadenado(aprobacion, n)]
+
+
+def test_el_indice_crece_hacia_ambos_lados():
+    calendario = CalendarioVencimientos()
+    for aprobacion in (date(2000, 1, 31), date(1980, 5, 31), date(2060, 12, 31), date(2000, 3, 31)):
+        obtenidas = calendario.fechas_limite(np.array([aprobacion] * 3, dtype='datetime64[D]'), [1, 13, 30])
+        assert obtenidas.tolist() == [encadenado(aprobacion, n) for n in (1, 13, 30)]
+
+
+def test_n_negativo():
+    with pytest.raises(ValueError):
+        fecha_limite(date(2024, 1, 1), -1)
+    with pytest.raises(ValueError):
+        fechas_limite_lote([date(2024, 1, 1)], [-1])
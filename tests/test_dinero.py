@@ -0,0 +1,131 @@
+import random
+from decimal import Decimal, ROUND_HALF_UP, getcontext
+
+import numpy as np
+import pytest
+
+from dinero import Dinero, capitalizar_centavos, capitalizar_centavos_lote, redondear_mitad_arriba, tasa_como_fraccion
+from main_mejorado import actualizar_capital_por_meses, calcular_capital_final, calcular_interes
+
+# =================================================================
+# Archivo: test_dinero.py
+# Propósito: Propiedades de Dinero (centavos enteros) contra Decimal con ROUND_HALF_UP
+# =================================================================
+
+SEMILLA = 12345
+CASOS = 2_000
+CENTAVO = Decimal('0.01')
+
+
+def caso_aleatorio(rng: random.Random):
+    capital = Decimal(rng.randint(-10**7, 10**9)).scaleb(-2)
+    tasa = Decimal(rng.randint(-300, 2_500)).scaleb(-rng.choice([0, 1, 2, 3]))
+    return capital, tasa, rng.randint(0, 240)
+
+
+def dentro_de_la_precision(centavos: int, tasa: Decimal, meses: int) -> bool:
+    """Cota en la que Decimal no redondea nada y debe coincidir con Dinero.
+
+    Decimal calcula `capital * tasa` con `getcontext().prec` (28) dígitos. Mientras
+    el coeficiente del producto (a lo sumo centavos * coeficiente de la tasa) y el
+    nuevo capital quepan en esos dígitos, el producto es exacto y ambos caminos
+    dan los mismos centavos. Pasada la cota Decimal redondea el producto (o falla
+    al cuantizar) y deja de ser una referencia exacta.
+    """
+    limite = 10 ** getcontext().prec
+    coeficiente = max(int(''.join(map(str, tasa.as_tuple().digits))), 1)
+    num, den = tasa_como_fraccion(tasa)
+    for _ in range(meses):
+        nuevos = centavos + redondear_mitad_arriba(centavos * num, den)
+        if abs(centavos) * coeficiente >= limite or abs(nuevos) >= limite:
+            return False
+        centavos = nuevos
+    return True
+
+
+def cabe_en_int64(centavos: int, tasa: Decimal, meses: int) -> bool:
+    """Misma condición que usa `capitalizar_centavos_lote` para rechazar una cuenta."""
+    num, den = tasa_como_fraccion(tasa)
+    limite = (np.iinfo(np.int64).max - den) // (2 * max(abs(num), 1))
+    for _ in range(meses):
+        if abs(centavos) > limite:
+            return False
+        centavos += redondear_mitad_arriba(centavos * num, den)
+    return True
+
+
+def _casos():
+    rng = random.Random(SEMILLA)
+    casos = [caso_aleatorio(rng) for _ in range(CASOS)]
+    return [c for c in casos if dentro_de_la_precision(int(c[0] * 100), c[1], c[2])]
+
+
+CASOS_DENTRO = _casos()
+
+
+def test_la_cota_deja_casos_suficientes():
+    assert len(CASOS_DENTRO) > CASOS // 2
+
+
+def test_redondear_mitad_arriba_igual_a_decimal():
+    rng = random.Random(SEMILLA)
+    pares = [(rng.randint(-10**12, 10**12), rng.randint(1, 10**6)) for _ in range(20_000)]
+    pares += [(n, 2) for n in range(-7, 8)] + [(n, 200) for n in (-300, -100, -50, 50, 100, 300)]  # mitades exactas
+    for numerador, denominador in pares:
+        esperado = (Decimal(numerador) / Decimal(denominador)).quantize(Decimal(1), rounding=ROUND_HALF_UP)
+        assert redondear_mitad_arriba(numerador, denominador) == int(esperado), (numerador, denominador)
+
+
+def test_desde_decimal_redondea_mitad_arriba():
+    rng = random.Random(SEMILLA)
+    for _ in range(5_000):
+        valor = Decimal(rng.randint(-10**9, 10**9)).scaleb(-rng.randint(0, 5))
+        assert Dinero.desde_decimal(valor).a_decimal() == valor.quantize(CENTAVO, rounding=ROUND_HALF_UP)
+    assert Dinero.desde_decimal(Decimal('0.005')).centavos == 1
+    assert Dinero.desde_decimal(Decimal('-0.005')).centavos == -1
+
+
+def test_interes_igual_a_decimal():
+    for capital, tasa, _ in CASOS_DENTRO:
+        assert Dinero.desde_decimal(capital).interes(tasa).a_decimal() == calcular_interes(capital, tasa), (capital, tasa)
+
+
+def test_historial_y_final_iguales_a_decimal():
+    for capital, tasa, meses in CASOS_DENTRO:
+        final_dec, hist_dec = actualizar_capital_por_meses(capital, tasa, meses)
+        final_din, hist_din = actualizar_capital_por_meses(Dinero.desde_decimal(capital), tasa, meses)
+
+        filas_din = [{k: (v.a_decimal() if isinstance(v, Dinero) else v) for k, v in h.items()} for h in hist_din]
+        assert final_din.a_decimal() == final_dec, (capital, tasa, meses)
+        assert filas_din == [h.a_dict() for h in hist_dec], (capital, tasa, meses)
+        assert calcular_capital_final(Dinero.desde_decimal(capital), tasa, meses) == final_din
+        assert calcular_capital_final(capital, tasa, meses) == final_dec
+
+
+@pytest.mark.parametrize("tamano", [1, 64])
+def test_lote_int64_igual_a_dinero_o_lo_rechaza(tamano):
+    for inicio in range(0, len(CASOS_DENTRO), tamano):
+        bloque = CASOS_DENTRO[inicio:inicio + tamano]
+        centavos = [Dinero.desde_decimal(c).centavos for c, _, _ in bloque]
+        tasas = [t for _, t, _ in bloque]
+        meses = [m for _, _, m in bloque]
+        if tamano == 1 and not cabe_en_int64(centavos[0], tasas[0], meses[0]):
+            # Fuera de int64 el lote se niega en lugar de desbordarse
+            with pytest.raises(OverflowError):
+                capitalizar_centavos_lote(centavos, tasas, meses)
+            continue
+        try:
+            lote = capitalizar_centavos_lote(centavos, tasas, meses)
+        except OverflowError:
+            assert tamano > 1  # un bloque puede rechazarse por la cuenta más grande con la tasa más alta
+            continue
+        assert lote.tolist() == [capitalizar_centavos(c, t, m) for c, t, m in zip(centavos, tasas, meses)]
+
+
+def test_fuera_de_la_precision_decimal_redondea():
+    # Pasada la cota documentada, Decimal redondea el producto y Dinero sigue exacto
+    capital, tasa, meses = Decimal('509847258'), Decimal('98.4'), 56
+    assert not dentro_de_la_precision(int(capital * 100), tasa, meses)
+    _, historial = actualizar_capital_por_meses(capital, tasa, meses)
+    exacto = capitalizar_centavos(int(capital * 100), tasa, meses)
+    assert Dinero(exacto).a_decimal() != historial[-1]['capital_despues']
@@ -0,0 +1,71 @@
+import random
+from datetime import date, datetime, timedelta
+
+import numpy as np
+import pytest
+
+from fechas_mora import calcular_meses_de_mora, calcular_meses_de_mora_lote
+
+# =================================================================
+# Archivo: test_fechas_mora.py
+# Propósito: Meses de mora: casos de calendario y versión escalar == vectorizada
+# =================================================================
+
+CASOS = [
+    # (fecha esperada, fecha real, meses de mora)
+    (date(2024, 3, 10), date(2024, 3, 10), 0),
+    (date(2024, 3, 10), date(2024, 2, 1), 0),        # pago adelantado
+    (date(2024, 3, 10), date(2024, 4, 9), 0),        # falta un día para el mes completo
+    (date(2024, 3, 10), date(2024, 4, 10), 1),
+    # Fin de mes: el 31 no existe en febrero, así que el mes no se completa
+    (date(2024, 1, 31), date(2024, 2, 29), 0),
+    (date(2024, 1, 31), date(2024, 3, 1), 1),
+    (date(2024, 1, 31), date(2024, 3, 31), 2),
+    (date(2023, 1, 30), date(2023, 2, 28), 0),
+    # 29 de febrero
+    (date(2024, 2, 29), date(2025, 2, 28), 11),
+    (date(2024, 2, 29), date(2025, 3, 1), 12),
+    (date(2024, 2, 29), date(2028, 2, 29), 48),
+    (date(2023, 2, 28), date(2024, 2, 29), 12),
+    # Cambio de año
+    (date(2023, 12, 15), date(2024, 1, 14), 0),
+    (date(2023, 12, 15), date(2024, 1, 15), 1),
+    (date(2023, 11, 30), date(2025, 1, 29), 13),
+    (date(1999, 12, 31), date(2000, 12, 31), 12),
+]
+
+
+@pytest.mark.parametrize("esperada, real, meses", CASOS)
+def test_casos_de_calendario(esperada, real, meses):
+    assert calcular_meses_de_mora(esperada, real) == meses
+    assert calcular_meses_de_mora_lote([esperada], [real]).tolist() == [meses]
+
+
+def test_lote_igual_a_escalar_en_todos_los_pares_de_un_rango():
+    # Más de dos años seguidos: incluye febrero de 2024 y dos cambios de año
+    fechas = [date(2023, 12, 1) + timedelta(days=i) for i in range(800)]
+    esperadas = [e for e in fechas for _ in fechas]
+    reales = [r for _ in fechas for r in fechas]
+
+    esperado = [calcular_meses_de_mora(e, r) for e, r in zip(esperadas, reales)]
+    assert calcular_meses_de_mora_lote(esperadas, reales).tolist() == esperado
+
+
+def test_lote_igual_a_escalar_con_fechas_aleatorias():
+    rng = random.Random(20240229)
+    esperadas = [date(1900, 1, 1) + timedelta(days=rng.randrange(200 * 365)) for _ in range(50_000)]
+    reales = [e + timedelta(days=rng.randrange(-400, 4_000)) for e in esperadas]
+
+    esperado = [calcular_meses_de_mora(e, r) for e, r in zip(esperadas, reales)]
+    assert calcular_meses_de_mora_lote(np.array(esperadas, dtype='datetime64[D]'),
+                                       np.array(reales, dtype='datetime64[D]')).tolist() == esperado
+
+
+def test_lote_descarta_la_hora():
+    esperada = np.array([datetime(2024, 1, 31, 23, 59)], dtype='datetime64[s]')
+    real = np.array([datetime(2024, 3, 1, 0, 1)], dtype='datetime64[s]')
+    assert calcular_meses_de_mora_lote(esperada, real).tolist() == [1]
+
+
+def test_lote_vacio():
+    assert calcular_meses_de_mora_lote([], []).tolist() == []
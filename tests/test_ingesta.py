@@ -0,0 +1,17 @@
+from ingesta import leer_csv_por_bloques
+
+# =================================================================
+# Archivo: test_ingesta.py
+# Propósito: Lectura por bloques del CSV de solicitudes
+# =================================================================
+
+
+def test_lineas_en_blanco_no_cuentan_como_filas(tmp_path):
+    ruta = tmp_path / "solicitudes.csv"
+    ruta.write_text("\ncapital,tasa,fecha_esperada,fecha_real\n"
+                    "100,1,2024-01-01,2024-03-01\n\n\n"
+                    "200,2,2024-01-01\n\n", encoding='utf-8')
+    bloques = list(leer_csv_por_bloques(str(ruta), tamano_bloque=1))
+    assert [b['capital'] for b in bloques] == [['100'], ['200']]
+    # Una fila corta sí se conserva, con vacíos que luego se rechazan
+    assert bloques[1]['fecha_real'] == ['']
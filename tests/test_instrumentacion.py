@@ -0,0 +1,86 @@
+import builtins
+import contextlib
+import io
+import time
+import types
+from datetime import date
+from itertools import islice
+
+import main
+from instrumentacion import Instrumentacion
+
+# =================================================================
+# Archivo: test_instrumentacion.py
+# Propósito: Atribución por etapa, tiempo propio y restauración de las funciones
+# =================================================================
+
+ESPERA = 0.02
+
+
+def test_la_espera_de_input_va_a_entrada(monkeypatch):
+    respuestas = iter(["1000", "2", "3"] + ["s", "400"] * 10)
+
+    def input_lento(_=""):
+        time.sleep(ESPERA)
+        return next(respuestas)
+
+    monkeypatch.setattr(builtins, 'input', input_lento)
+    originales = {nombre: getattr(main, nombre) for nombre in
+                  ('sumar_un_mes', 'fecha_limite', 'generar_tabla_amortizacion', '_pedir_pago', 'calcular_cuota_fija')}
+    salida = io.StringIO()
+    with Instrumentacion([main]) as inst, contextlib.redirect_stdout(salida):
+        main.main()
+    resumen = inst.resumen()
+
+    for nombre, original in originales.items():
+        assert getattr(main, nombre) is original
+    meses = salida.getvalue().count("--- MES ")
+    etapas, funciones = resumen['etapas'], resumen['funciones']
+    assert {'entrada', 'simulacion', 'fechas', 'cuota', 'pago'} <= set(etapas)
+
+    # Un paso por fila producida, sin contar el next() final que termina el generador
+    assert funciones['main.generar_tabla_amortizacion']['llamadas'] == meses
+    assert funciones['main.generar_fechas_limite']['llamadas'] == 3
+    assert etapas['entrada']['llamadas'] == meses
+
+    # Dos input() por mes dentro del paso de la simulación: el tiempo propio no los incluye
+    assert etapas['entrada']['propio_s'] >= 2 * meses * ESPERA
+    assert etapas['simulacion']['propio_s'] < ESPERA
+    tabla = funciones['main.generar_tabla_amortizacion']
+    assert tabla['total_s'] >= etapas['entrada']['propio_s'] > tabla['propio_s']
+
+
+def test_el_generador_envuelto_reenvia_send_throw_y_close():
+    eventos = []
+
+    def generar_tabla_amortizacion():
+        try:
+            recibido = yield 1
+            eventos.append(('send', recibido))
+            try:
+                yield 2
+            except KeyError:
+                eventos.append('throw')
+            for n in range(3, 100):
+                yield n
+        finally:
+            eventos.append('cerrado')
+
+    modulo = types.ModuleType('main')
+    modulo.generar_tabla_amortizacion = generar_tabla_amortizacion
+    with Instrumentacion([modulo]) as inst:
+        generador = modulo.generar_tabla_amortizacion()
+        assert next(generador) == 1
+        assert generador.send('hola') == 2
+        assert generador.throw(KeyError('x')) == 3
+        assert list(islice(generador, 2)) == [4, 5]
+        generador.close()
+    assert modulo.generar_tabla_amortizacion is generar_tabla_amortizacion
+    assert eventos == [('send', 'hola'), 'throw', 'cerrado']
+    assert inst.resumen()['funciones']['main.generar_tabla_amortizacion']['llamadas'] == 5
+
+
+def test_el_generador_agotado_no_cuenta_un_paso_de_mas():
+    with Instrumentacion([main]) as inst:
+        filas = list(main.generar_tabla_amortizacion(1000.0, 2.0, 6, date(2024, 1, 31)))
+    assert inst.resumen()['funciones']['main.generar_tabla_amortizacion']['llamadas'] == len(filas)
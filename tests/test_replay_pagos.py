@@ -0,0 +1,102 @@
+from datetime import date
+
+import numpy as np
+import pytest
+
+from main import calcular_cuota_fija, generar_tabla_amortizacion
+from portafolio_paralelo import simular_cartera_paralelo
+from replay_pagos import posiciones_en_cartera, replay_libro_pagos, replay_posiciones
+
+# =================================================================
+# Archivo: test_replay_pagos.py
+# Propósito: Replay vectorizado y cartera en paralelo contra `generar_tabla_amortizacion`
+# =================================================================
+
+CREDITOS = 300
+MESES = 30
+COLUMNAS = ('prestamo_id', 'saldo', 'meses', 'liquidado', 'cuota_siguiente')
+
+
+def generar_libro(n: int, meses: int, semilla: int = 21):
+    """Cartera y libro sintéticos: pagos completos, parciales, extras, faltantes y NaN."""
+    rng = np.random.default_rng(semilla)
+    prestamo_id = rng.permutation(np.arange(1, n + 1) * 3)  # ids no consecutivos y desordenados
+    capital = rng.uniform(1_000, 80_000, n).round(2)
+    tasa = rng.choice([0.0, 0.8, 1.5, 2.5, 4.0], n)
+    plazo = rng.choice([6, 12, 24, 36], n)
+
+    cuota = np.array([calcular_cuota_fija(c, t, int(p)) for c, t, p in zip(capital, tasa, plazo)])
+    pos = np.repeat(np.arange(n), meses)
+    mes = np.tile(np.arange(1, meses + 1), n)
+    monto = (cuota[pos] * rng.choice([1.0, 1.0, 1.0, 0.3, 1.6, 0.0], pos.size)).round(2)
+    monto[rng.random(pos.size) < 0.04] = np.nan          # registrado sin pago
+    conservar = rng.random(pos.size) >= 0.05              # meses sin registro
+    return (prestamo_id, capital, tasa, plazo), (prestamo_id[pos][conservar], mes[conservar], monto[conservar])
+
+
+def replay_escalar(cartera, libro, hasta_mes: int):
+    """Referencia: `generar_tabla_amortizacion` por crédito, con los pagos del libro."""
+    prestamo_id, capital, tasa, plazo = cartera
+    pagos = {}
+    for pid, mes, monto in zip(*(c.tolist() for c in libro)):
+        if monto == monto:
+            pagos[pid, mes] = pagos.get((pid, mes), 0.0) + monto
+        else:
+            pagos.setdefault((pid, mes), None)
+
+    saldos, meses, cuotas = [], [], []
+    for pid, c, t, p in zip(prestamo_id.tolist(), capital.tolist(), tasa.tolist(), plazo.tolist()):
+        saldo, ultimo = c, 0
+        for fila in generar_tabla_amortizacion(c, t, p, date(2024, 1, 31), lambda mes, *_: pagos.get((pid, mes))):
+            saldo, ultimo = fila['saldo'], fila['mes']
+            if ultimo >= hasta_mes:
+                break
+        saldos.append(saldo)
+        meses.append(ultimo)
+        cuotas.append(calcular_cuota_fija(saldo, t, max(p - ultimo, 1)) if saldo > 0 else 0.0)
+    return np.array(saldos), np.array(meses), np.array(cuotas)
+
+
+CARTERA, LIBRO = generar_libro(CREDITOS, MESES)
+SALDO, MESES_SIMULADOS, CUOTA = replay_escalar(CARTERA, LIBRO, MESES)
+
+
+def verificar_contra_escalar(resultado):
+    # Mismas operaciones en el mismo orden: saldo y meses bit a bit
+    assert np.array_equal(resultado['saldo'], SALDO)
+    assert np.array_equal(resultado['meses'], MESES_SIMULADOS)
+    assert np.array_equal(resultado['liquidado'], SALDO <= 0)
+    # La cuota siguiente sale de la versión vectorizada de la cuota: igual hasta ~1e-15 relativo
+    assert np.allclose(resultado['cuota_siguiente'], CUOTA, rtol=1e-12, atol=0)
+
+
+@pytest.mark.parametrize("tamano_bloque", [1, 37, CREDITOS])
+def test_replay_libro_pagos_igual_a_generar_tabla_amortizacion(tamano_bloque):
+    resultado = replay_libro_pagos(*CARTERA, *LIBRO, hasta_mes=MESES, tamano_bloque=tamano_bloque)
+    assert np.array_equal(resultado['prestamo_id'], CARTERA[0])
+    verificar_contra_escalar(resultado)
+
+
+def test_replay_posiciones_igual_a_generar_tabla_amortizacion():
+    prestamo_id, capital, tasa, plazo = CARTERA
+    pos = posiciones_en_cartera(prestamo_id, LIBRO[0])
+    orden = np.argsort(pos, kind='stable')
+    resultado = replay_posiciones(capital, tasa, plazo, np.full(CREDITOS, MESES), pos[orden],
+                                  LIBRO[1][orden], LIBRO[2][orden], tamano_bloque=50)
+    verificar_contra_escalar(resultado)
+
+
+@pytest.mark.parametrize("num_fragmentos", [1, 4, 7])
+def test_cartera_paralela_identica_a_la_serial(num_fragmentos):
+    serial = replay_libro_pagos(*CARTERA, *LIBRO, hasta_mes=MESES)
+    paralelo = simular_cartera_paralelo(*CARTERA, *LIBRO, hasta_mes=MESES, procesos=2,
+                                        num_fragmentos=num_fragmentos, tamano_bloque=64)
+    for columna in COLUMNAS:
+        assert paralelo[columna].dtype == serial[columna].dtype
+        assert paralelo[columna].tobytes() == serial[columna].tobytes(), columna
+    verificar_contra_escalar(paralelo)
+
+
+def test_pagos_de_creditos_ajenos():
+    with pytest.raises(ValueError):
+        replay_libro_pagos(*CARTERA, np.array([1]), np.array([1]), np.array([100.0]), hasta_mes=MESES)
@@ -0,0 +1,143 @@
+import asyncio
+import json
+from datetime import date
+
+import pytest
+
+import servicio_http
+from main import calcular_cuota_fija, generar_tabla_amortizacion
+from main_mejorado import actualizar_capital_por_meses
+from decimal import Decimal
+from servicio_http import ErrorHTTP, _leer_peticion, atender, cotizar, cotizar_lote, mora, tabla
+
+# =================================================================
+# Archivo: test_servicio_http.py
+# Propósito: Endpoints, errores 400/413 y keep-alive del servicio HTTP
+# =================================================================
+
+
+def leer(datos: bytes):
+    """`_leer_peticion` sobre un flujo que ya trae `datos` y luego se cierra."""
+    async def correr():
+        lector = asyncio.StreamReader(limit=servicio_http.MAX_CABECERA)
+        lector.feed_data(datos)
+        lector.feed_eof()
+        return await _leer_peticion(lector)
+    return asyncio.run(correr())
+
+
+# ==================== ENDPOINTS ====================
+
+def test_cotizar():
+    assert cotizar({'capital': '1000,5', 'tasa': '2', 'meses': '12'}) == {'cuota': calcular_cuota_fija(1000.5, 2.0, 12)}
+
+
+def test_cotizar_lote():
+    cotizaciones = [{'capital': 1000, 'tasa': 2, 'meses': 12}, {'capital': 5000, 'tasa': 0, 'meses': 10}]
+    assert cotizar_lote({'cotizaciones': cotizaciones}) == {
+        'cuotas': [calcular_cuota_fija(1000.0, 2.0, 12), calcular_cuota_fija(5000.0, 0.0, 10)]}
+
+
+def test_tabla_igual_a_generar_tabla_amortizacion():
+    respuesta = tabla({'capital': 1200, 'tasa': 1.5, 'meses': 6, 'fecha_aprobacion': '2024-01-31'})
+    esperadas = list(generar_tabla_amortizacion(1200.0, 1.5, 6, date(2024, 1, 31)))
+    assert respuesta['cuota'] == esperadas[0]['cuota_esperada']
+    assert [f['fecha_limite'] for f in respuesta['filas']] == [f['fecha_limite'].isoformat() for f in esperadas]
+    assert [f['saldo'] for f in respuesta['filas']] == [f['saldo'] for f in esperadas]
+    json.dumps(respuesta, allow_nan=False)
+
+
+def test_mora():
+    respuesta = mora({'capital': '1500.55', 'tasa': '2.5', 'meses_mora': 3, 'historial': 'true'})
+    capital_final, historial = actualizar_capital_por_meses(Decimal('1500.55'), Decimal('2.5'), 3)
+    assert respuesta['meses_mora'] == 3
+    assert respuesta['capital_final'] == str(capital_final)
+    assert len(respuesta['historial']) == len(historial) == 3
+    assert mora({'capital': '100', 'tasa': '1', 'fecha_esperada': '2024-01-31',
+                 'fecha_real': '2024-03-30'})['meses_mora'] == 1
+
+
+# ==================== ERRORES ====================
+
+@pytest.mark.parametrize("manejador, parametros", [
+    (cotizar, {'capital': 'nan', 'tasa': 1, 'meses': 12}),
+    (cotizar, {'capital': 1000, 'tasa': 'inf', 'meses': 12}),
+    (cotizar, {'capital': -5, 'tasa': 1, 'meses': 12}),
+    (cotizar, {'capital': 1000, 'tasa': 1, 'meses': 0}),
+    (cotizar, {'tasa': 1, 'meses': 12}),
+    (cotizar_lote, {'cotizaciones': 'no'}),
+    (tabla, {'capital': 1000, 'tasa': 1, 'meses': 12, 'fecha_aprobacion': '2024-13-01'}),
+    # La fecha es válida, pero las fechas límite del plazo pasan del año 9999
+    (tabla, {'capital': 1000, 'tasa': 1, 'meses': 12, 'fecha_aprobacion': '9999-06-15'}),
+    (tabla, {'capital': 1e308, 'tasa': 500, 'meses': 1200}),
+    (mora, {'capital': '100', 'tasa': '-1', 'meses_mora': 3}),
+    (mora, {'capital': '100', 'tasa': '1', 'fecha_esperada': 'ayer', 'fecha_real': '2024-01-01'}),
+])
+def test_entradas_invalidas_dan_400(manejador, parametros):
+    with pytest.raises(ErrorHTTP) as error:
+        manejador(parametros)
+    assert error.value.estado == 400
+
+
+def test_lote_demasiado_grande_da_413():
+    with pytest.raises(ErrorHTTP) as error:
+        cotizar_lote({'cotizaciones': [{}] * (servicio_http.MAX_LOTE + 1)})
+    assert error.value.estado == 413
+
+
+def test_atender():
+    assert atender('GET', '/cotizar?capital=1000&tasa=2&meses=12', b'')[0] == 200
+    assert atender('POST', '/cotizar', b'{no es json')[0] == 400
+    assert atender('POST', '/cotizar', b'[1, 2]')[0] == 400
+    assert atender('DELETE', '/cotizar', b'')[0] == 405
+    assert atender('GET', '/no-existe', b'')[0] == 404
+
+
+@pytest.mark.parametrize("largo, estado", [("-5", 400), ("cinco", 400), (str(servicio_http.MAX_CUERPO + 1), 413)])
+def test_content_length_invalido(largo, estado):
+    with pytest.raises(ErrorHTTP) as error:
+        leer(f"POST /cotizar HTTP/1.1\r\nContent-Length: {largo}\r\n\r\n".encode())
+    assert error.value.estado == estado
+
+
+def test_cuerpo_incompleto_no_retiene_la_conexion(monkeypatch):
+    monkeypatch.setattr(servicio_http, 'TIEMPO_INACTIVO', 0.05)
+
+    async def correr():
+        lector = asyncio.StreamReader()
+        lector.feed_data(b"POST /cotizar HTTP/1.1\r\nContent-Length: 10\r\n\r\n{}")  # sin EOF
+        return await _leer_peticion(lector)
+    assert asyncio.run(correr()) is None
+
+
+# ==================== KEEP-ALIVE ====================
+
+def test_ida_y_vuelta_con_keep_alive():
+    async def correr():
+        servidor = await asyncio.start_server(servicio_http._conexion, '127.0.0.1', 0, limit=servicio_http.MAX_CABECERA)
+        puerto = servidor.sockets[0].getsockname()[1]
+        async with servidor:
+            lector, escritor = await asyncio.open_connection('127.0.0.1', puerto)
+            cuerpo = json.dumps({'cotizaciones': [{'capital': 1000, 'tasa': 2, 'meses': 12}]}).encode()
+            escritor.write(b"GET /cotizar?capital=1000&tasa=2&meses=12 HTTP/1.1\r\nHost: x\r\n\r\n")
+            escritor.write(b"POST /cotizar/lote HTTP/1.1\r\nHost: x\r\nContent-Length: %d\r\n\r\n" % len(cuerpo) + cuerpo)
+            escritor.write(b"GET /cotizar HTTP/1.1\r\nHost: x\r\nConnection: close\r\n\r\n")
+            await escritor.drain()
+
+            respuestas = []
+            for _ in range(3):
+                cabecera = await lector.readuntil(b"\r\n\r\n")
+                lineas = cabecera.decode('latin-1').split("\r\n")
+                largo = next(int(l.split(":")[1]) for l in lineas if l.lower().startswith("content-length:"))
+                conexion = next(l.split(":")[1].strip() for l in lineas if l.lower().startswith("connection:"))
+                respuestas.append((int(lineas[0].split(" ")[1]), conexion, json.loads(await lector.readexactly(largo))))
+            fin = await lector.read()
+            escritor.close()
+            return respuestas, fin
+
+    respuestas, fin = asyncio.run(correr())
+    cuota = calcular_cuota_fija(1000.0, 2.0, 12)
+    assert respuestas[0] == (200, 'keep-alive', {'cuota': cuota})
+    assert respuestas[1] == (200, 'keep-alive', {'cuotas': [cuota]})
+    assert respuestas[2][:2] == (400, 'close')
+    assert fin == b''  # el servidor cerró tras `Connection: close`